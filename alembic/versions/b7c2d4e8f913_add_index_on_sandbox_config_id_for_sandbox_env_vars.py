@@ -0,0 +1,30 @@
+"""Add index on sandbox_config_id for sandbox env vars
+
+Revision ID: b7c2d4e8f913
+Revises: e3f1a9c47b21
+Create Date: 2025-06-25 09:31:07.184263
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7c2d4e8f913"
+down_revision: Union[str, None] = "e3f1a9c47b21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_sandbox_env_vars_sandbox_config_id_created_at",
+        "sandbox_environment_variables",
+        ["sandbox_config_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_sandbox_env_vars_sandbox_config_id_created_at", table_name="sandbox_environment_variables")
@@ -0,0 +1,30 @@
+"""Add index on organization_id and created_at for steps
+
+Revision ID: c4d8e2f1a937
+Revises: b7c2d4e8f913
+Create Date: 2025-06-25 14:12:43.519204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d8e2f1a937"
+down_revision: Union[str, None] = "b7c2d4e8f913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_steps_organization_id_created_at",
+        "steps",
+        ["organization_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_steps_organization_id_created_at", table_name="steps")
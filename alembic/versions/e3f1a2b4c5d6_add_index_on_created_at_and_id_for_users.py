@@ -0,0 +1,25 @@
+"""Add index on created_at and id for users
+
+Revision ID: e3f1a2b4c5d6
+Revises: c4d8e2f1a937
+Create Date: 2025-06-26 10:03:27.184562
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3f1a2b4c5d6"
+down_revision: Union[str, None] = "c4d8e2f1a937"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_created_at", "users", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_created_at", table_name="users")
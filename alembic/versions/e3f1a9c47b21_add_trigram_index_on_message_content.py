@@ -0,0 +1,27 @@
+"""add trigram index on message content
+
+Revision ID: e3f1a9c47b21
+Revises: 51999513bcf1
+Create Date: 2025-06-24 10:12:41.517406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3f1a9c47b21"
+down_revision: Union[str, None] = "51999513bcf1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backs the ILIKE prefilter used when searching an agent's messages by text
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_messages_content_trgm ON messages USING gin ((content::text) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_messages_content_trgm")
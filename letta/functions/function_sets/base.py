@@ -1,8 +1,12 @@
+import re
 from typing import Optional
 
 from letta.agent import Agent
 from letta.constants import CORE_MEMORY_LINE_NUMBER_WARNING
 
+# Line number prefixes that the memory editing tools reject, compiled once at import
+_LINE_PREFIX_RE = re.compile(r"\nLine \d+: ")
+
 
 def send_message(self: "Agent", message: str) -> Optional[str]:
     """
@@ -204,9 +208,7 @@ def memory_replace(agent_state: "AgentState", label: str, old_str: str, new_str:
     Returns:
         str: The success message
     """
-    import re
-
-    if bool(re.search(r"\nLine \d+: ", old_str)):
+    if _LINE_PREFIX_RE.search(old_str) is not None:
         raise ValueError(
             "old_str contains a line number prefix, which is not allowed. Do not include line numbers when calling memory tools (line numbers are for display purposes only)."
         )
@@ -214,7 +216,7 @@ def memory_replace(agent_state: "AgentState", label: str, old_str: str, new_str:
         raise ValueError(
             "old_str contains a line number warning, which is not allowed. Do not include line number information when calling memory tools (line numbers are for display purposes only)."
         )
-    if bool(re.search(r"\nLine \d+: ", new_str)):
+    if _LINE_PREFIX_RE.search(new_str) is not None:
         raise ValueError(
             "new_str contains a line number prefix, which is not allowed. Do not include line numbers when calling memory tools (line numbers are for display purposes only)."
         )
@@ -271,9 +273,7 @@ def memory_insert(agent_state: "AgentState", label: str, new_str: str, insert_li
     Returns:
         Optional[str]: None is always returned as this function does not produce a response.
     """
-    import re
-
-    if bool(re.search(r"\nLine \d+: ", new_str)):
+    if _LINE_PREFIX_RE.search(new_str) is not None:
         raise ValueError(
             "new_str contains a line number prefix, which is not allowed. Do not include line numbers when calling memory tools (line numbers are for display purposes only)."
         )
@@ -335,9 +335,7 @@ def memory_rethink(agent_state: "AgentState", label: str, new_memory: str) -> No
     Returns:
         None: None is always returned as this function does not produce a response.
     """
-    import re
-
-    if bool(re.search(r"\nLine \d+: ", new_memory)):
+    if _LINE_PREFIX_RE.search(new_memory) is not None:
         raise ValueError(
             "new_memory contains a line number prefix, which is not allowed. Do not include line numbers when calling memory tools (line numbers are for display purposes only)."
         )
@@ -1,5 +1,7 @@
 import json
 from datetime import datetime
+from json.encoder import encode_basestring
+from typing import List, Optional
 
 
 def json_loads(data):
@@ -13,3 +15,11 @@ def json_dumps(data, indent=2):
         raise TypeError(f"Type {type(obj)} not serializable")
 
     return json.dumps(data, indent=indent, default=safe_serializer, ensure_ascii=False)
+
+
+def json_dumps_str_list(items: List[Optional[str]]) -> str:
+    # Same output as json_dumps(items), but each string goes through the C string encoder directly
+    # instead of the pure-Python encoder that json.dumps falls back to whenever indent is set
+    if not items:
+        return "[]"
+    return "[\n  " + ",\n  ".join("null" if item is None else encode_basestring(item) for item in items) + "\n]"
@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, List, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe, size-bounded LRU cache whose entries expire `ttl` seconds after being set.
+
+    If `on_evict` is given it is called with every value the cache drops on its own, through expiry, the size bound or
+    being overwritten by `set` (not for values removed with `pop` or `clear`), after the cache lock has been released.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, on_evict: Optional[Callable[[V], None]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        evicted = []
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                evicted.append(value)
+                value = None
+            else:
+                self._data.move_to_end(key)
+        self._notify_evicted(evicted)
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        evicted = []
+        with self._lock:
+            now = time.monotonic()
+            previous = self._data.get(key)
+            if previous is not None and previous[1] is not value:
+                evicted.append(previous[1])
+            self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            # Drop expired entries from the least recently used end, then anything over the size bound
+            while self._data:
+                oldest_key, (expires_at, oldest_value) = next(iter(self._data.items()))
+                if expires_at > now and len(self._data) <= self.maxsize:
+                    break
+                del self._data[oldest_key]
+                evicted.append(oldest_value)
+        self._notify_evicted(evicted)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def _notify_evicted(self, evicted: List[V]) -> None:
+        if self.on_evict is not None:
+            for value in evicted:
+                self.on_evict(value)
+
+    def __len__(self) -> int:
+        return len(self._data)
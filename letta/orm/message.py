@@ -7,6 +7,7 @@ from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 from letta.orm.custom_columns import MessageContentColumn, ToolCallColumn, ToolReturnColumn
 from letta.orm.mixins import AgentMixin, OrganizationMixin
 from letta.orm.sqlalchemy_base import SqlalchemyBase
+from letta.schemas.enums import MessageRole
 from letta.schemas.letta_message_content import MessageContent
 from letta.schemas.letta_message_content import TextContent as PydanticTextContent
 from letta.schemas.message import Message as PydanticMessage
@@ -23,6 +24,7 @@ class Message(SqlalchemyBase, OrganizationMixin, AgentMixin):
         Index("ix_messages_created_at", "created_at", "id"),
         Index("ix_messages_agent_sequence", "agent_id", "sequence_id"),
         Index("ix_messages_org_agent", "organization_id", "agent_id"),
+        # NOTE: the Postgres-only trigram index ix_messages_content_trgm on (content::text) is managed by migration
     )
     __pydantic_model__ = PydanticMessage
 
@@ -78,10 +80,40 @@ class Message(SqlalchemyBase, OrganizationMixin, AgentMixin):
         if self.text and not model.content:
             model.content = [PydanticTextContent(text=self.text)]
         # If there are no tool calls, set tool_calls to None
-        if len(self.tool_calls) == 0:
+        if not self.tool_calls:
             model.tool_calls = None
         return model
 
+    def to_pydantic_fast(self) -> PydanticMessage:
+        """Same as to_pydantic, but builds the model with model_construct instead of validating every field.
+
+        Only use this for rows read back from the database, whose columns were validated on the way in.
+        """
+        content = self.content
+        if self.text and not content:
+            content = [PydanticTextContent(text=self.text)]
+        return self.__pydantic_model__.model_construct(
+            id=self.id,
+            organization_id=self.organization_id,
+            agent_id=self.agent_id,
+            model=self.model,
+            role=MessageRole(self.role),
+            content=content,
+            name=self.name,
+            tool_calls=self.tool_calls or None,
+            tool_call_id=self.tool_call_id,
+            step_id=self.step_id,
+            otid=self.otid,
+            tool_returns=self.tool_returns,
+            group_id=self.group_id,
+            sender_id=self.sender_id,
+            batch_item_id=self.batch_item_id,
+            created_at=self.created_at,
+            created_by_id=self.created_by_id,
+            last_updated_by_id=self.last_updated_by_id,
+            updated_at=self.updated_at,
+        )
+
 
 # listener
 
@@ -44,7 +44,11 @@ class SandboxEnvironmentVariable(SqlalchemyBase, OrganizationMixin, SandboxConfi
     __pydantic_model__ = PydanticSandboxEnvironmentVariable
 
     # We cannot have duplicate key names in the same sandbox, the env var would get overwritten
-    __table_args__ = (UniqueConstraint("key", "sandbox_config_id", name="uix_key_sandbox_config"),)
+    # uix_key_sandbox_config also serves lookups by key; the second index serves per-config listing in (created_at, id) order
+    __table_args__ = (
+        UniqueConstraint("key", "sandbox_config_id", name="uix_key_sandbox_config"),
+        Index("idx_sandbox_env_vars_sandbox_config_id_created_at", "sandbox_config_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, nullable=False)
     key: Mapped[str] = mapped_column(String, nullable=False, doc="The name of the environment variable.")
@@ -5,7 +5,7 @@ from functools import wraps
 from pprint import pformat
 from typing import TYPE_CHECKING, List, Literal, Optional, Tuple, Union
 
-from sqlalchemy import Sequence, String, and_, delete, func, or_, select, text
+from sqlalchemy import Select, Sequence, String, and_, delete, func, select, text, tuple_
 from sqlalchemy.exc import DBAPIError, IntegrityError, TimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, Session, mapped_column
@@ -204,6 +204,69 @@ class SqlalchemyBase(CommonSqlalchemyMetaMixins, Base):
             ascending: Sort direction
             **kwargs: Additional filters to apply
         """
+        query = await cls.list_query_async(
+            db_session=db_session,
+            before=before,
+            after=after,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            query_text=query_text,
+            query_embedding=query_embedding,
+            ascending=ascending,
+            actor=actor,
+            access=access,
+            access_type=access_type,
+            join_model=join_model,
+            join_conditions=join_conditions,
+            identifier_keys=identifier_keys,
+            identity_id=identity_id,
+            query_options=query_options,
+            has_feedback=has_feedback,
+            **kwargs,
+        )
+
+        # Execute the query
+        results = await db_session.execute(query)
+
+        results = list(results.scalars())
+        results = cls._list_postprocess(
+            before=before,
+            after=after,
+            limit=limit,
+            results=results,
+        )
+
+        return results
+
+    @classmethod
+    async def list_query_async(
+        cls,
+        *,
+        db_session: "AsyncSession",
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = 50,
+        query_text: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None,
+        ascending: bool = True,
+        actor: Optional["User"] = None,
+        access: Optional[List[Literal["read", "write", "admin"]]] = ["read"],
+        access_type: AccessType = AccessType.ORGANIZATION,
+        join_model: Optional[Base] = None,
+        join_conditions: Optional[Union[Tuple, List]] = None,
+        identifier_keys: Optional[List[str]] = None,
+        identity_id: Optional[str] = None,
+        query_options: Sequence[ORMOption] | None = None,
+        has_feedback: Optional[bool] = None,
+        **kwargs,
+    ) -> "Select":
+        """
+        Build the select statement used by `list_async` without executing it, resolving the before/after cursors.
+        Callers that want to stream rows (e.g. with `yield_per`) can execute it themselves and apply `_list_postprocess`.
+        """
         if start_date and end_date and start_date > end_date:
             raise ValueError("start_date must be earlier than or equal to end_date")
 
@@ -243,24 +306,14 @@ class SqlalchemyBase(CommonSqlalchemyMetaMixins, Base):
             join_conditions=join_conditions,
             identifier_keys=identifier_keys,
             identity_id=identity_id,
+            has_feedback=has_feedback,
             **kwargs,
         )
         if query_options:
             for opt in query_options:
                 query = query.options(opt)
 
-        # Execute the query
-        results = await db_session.execute(query)
-
-        results = list(results.scalars())
-        results = cls._list_postprocess(
-            before=before,
-            after=after,
-            limit=limit,
-            results=results,
-        )
-
-        return results
+        return query
 
     @classmethod
     def _list_preprocess(
@@ -347,34 +400,13 @@ class SqlalchemyBase(CommonSqlalchemyMetaMixins, Base):
                 query = query.filter(cls.feedback.is_(None))
 
         # Handle pagination based on before/after
-        if before_obj or after_obj:
-            conditions = []
-
-            if before_obj and after_obj:
-                # Window-based query - get records between before and after
-                conditions = [
-                    or_(cls.created_at < before_obj.created_at, and_(cls.created_at == before_obj.created_at, cls.id < before_obj.id)),
-                    or_(cls.created_at > after_obj.created_at, and_(cls.created_at == after_obj.created_at, cls.id > after_obj.id)),
-                ]
-            else:
-                # Pure pagination query
-                if before_obj:
-                    conditions.append(
-                        or_(
-                            cls.created_at < before_obj.created_at,
-                            and_(cls.created_at == before_obj.created_at, cls.id < before_obj.id),
-                        )
-                    )
-                if after_obj:
-                    conditions.append(
-                        or_(
-                            cls.created_at > after_obj.created_at,
-                            and_(cls.created_at == after_obj.created_at, cls.id > after_obj.id),
-                        )
-                    )
-
-            if conditions:
-                query = query.where(and_(*conditions))
+        # Row-value comparisons on (created_at, id) map onto a single composite index range scan,
+        # where the equivalent OR/AND tiebreaker often degrades into a filter + sort.
+        # SQLite (>= 3.15) plans row values the same way, so no dialect-specific rewrite is needed.
+        if before_obj:
+            query = query.where(tuple_(cls.created_at, cls.id) < tuple_(before_obj.created_at, before_obj.id))
+        if after_obj:
+            query = query.where(tuple_(cls.created_at, cls.id) > tuple_(after_obj.created_at, after_obj.id))
 
         # Text search
         if query_text:
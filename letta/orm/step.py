@@ -1,7 +1,7 @@
 import uuid
 from typing import TYPE_CHECKING, Dict, List, Optional
 
-from sqlalchemy import JSON, ForeignKey, String
+from sqlalchemy import JSON, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from letta.orm.sqlalchemy_base import SqlalchemyBase
@@ -17,6 +17,7 @@ class Step(SqlalchemyBase):
 
     __tablename__ = "steps"
     __pydantic_model__ = PydanticStep
+    __table_args__ = (Index("ix_steps_organization_id_created_at", "organization_id", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: f"step-{uuid.uuid4()}")
     origin: Mapped[Optional[str]] = mapped_column(nullable=True, doc="The surface that this agent step was initiated from.")
@@ -59,3 +60,31 @@ class Step(SqlalchemyBase):
 
     # Relationships (backrefs)
     messages: Mapped[List["Message"]] = relationship("Message", back_populates="step", cascade="save-update", lazy="noload")
+
+    def to_pydantic_fast(self) -> PydanticStep:
+        """Same as to_pydantic, but builds the model with model_construct instead of validating every field.
+
+        Only use this for rows read back from the database, whose columns were validated on the way in.
+        """
+        return self.__pydantic_model__.model_construct(
+            id=self.id,
+            origin=self.origin,
+            organization_id=self.organization_id,
+            provider_id=self.provider_id,
+            job_id=self.job_id,
+            agent_id=self.agent_id,
+            provider_name=self.provider_name,
+            provider_category=self.provider_category,
+            model=self.model,
+            model_endpoint=self.model_endpoint,
+            context_window_limit=self.context_window_limit,
+            completion_tokens=self.completion_tokens,
+            prompt_tokens=self.prompt_tokens,
+            total_tokens=self.total_tokens,
+            completion_tokens_details=self.completion_tokens_details,
+            tags=self.tags or [],
+            tid=self.tid,
+            trace_id=self.trace_id,
+            messages=[],
+            feedback=self.feedback,
+        )
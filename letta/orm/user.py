@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING, List
 
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from letta.orm.mixins import OrganizationMixin
@@ -15,6 +16,7 @@ class User(SqlalchemyBase, OrganizationMixin):
 
     __tablename__ = "users"
     __pydantic_model__ = PydanticUser
+    __table_args__ = (Index("ix_users_created_at", "created_at", "id"),)
 
     name: Mapped[str] = mapped_column(nullable=False, doc="The display name of the user.")
 
@@ -26,3 +28,17 @@ class User(SqlalchemyBase, OrganizationMixin):
 
     # TODO: Add this back later potentially
     # tokens: Mapped[List["Token"]] = relationship("Token", back_populates="user", doc="the tokens associated with this user.")
+
+    def to_pydantic_fast(self) -> PydanticUser:
+        """Same as to_pydantic, but builds the model with model_construct instead of validating every field.
+
+        Only use this for rows read back from the database, whose columns were validated on the way in.
+        """
+        return self.__pydantic_model__.model_construct(
+            id=self.id,
+            organization_id=self.organization_id,
+            name=self.name,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            is_deleted=self.is_deleted,
+        )
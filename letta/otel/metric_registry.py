@@ -158,3 +158,29 @@ class MetricRegistry:
                 unit="1",
             ),
         )
+
+    # (includes engine: sync | async)
+    @property
+    def db_connections_opened_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "count_db_connections_opened",
+            partial(
+                self._meter.create_counter,
+                name="count_db_connections_opened",
+                description="Counts new physical database connections opened by the connection pool",
+                unit="1",
+            ),
+        )
+
+    # (includes engine: sync | async)
+    @property
+    def db_pool_checked_out_histogram(self) -> Histogram:
+        return self._get_or_create_metric(
+            "hist_db_pool_checked_out",
+            partial(
+                self._meter.create_histogram,
+                name="hist_db_pool_checked_out",
+                description="Histogram for the number of pooled database connections checked out, sampled at each checkout",
+                unit="1",
+            ),
+        )
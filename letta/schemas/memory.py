@@ -1,7 +1,7 @@
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from jinja2 import Template, TemplateSyntaxError
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 # Forward referencing to avoid circular import with Agent -> Memory -> Agent
 if TYPE_CHECKING:
@@ -85,6 +85,9 @@ class Memory(BaseModel, validate_assignment=True):
         description="Jinja2 template for compiling memory blocks into a prompt string",
     )
 
+    # label -> position in `blocks`, built lazily by get_block and checked on every hit, since `blocks` can be mutated freely
+    _block_positions: Dict[str, int] = PrivateAttr(default_factory=dict)
+
     def get_prompt_template(self) -> str:
         """Return the current Jinja2 template string."""
         return str(self.prompt_template)
@@ -121,12 +124,24 @@ class Memory(BaseModel, validate_assignment=True):
     # TODO: these should actually be label, not name
     def get_block(self, label: str) -> Block:
         """Correct way to index into the memory.memory field, returns a Block"""
-        keys = []
-        for block in self.blocks:
-            if block.label == label:
-                return block
-            keys.append(block.label)
-        raise KeyError(f"Block field {label} does not exist (available sections = {', '.join(keys)})")
+        block = self._find_block(label)
+        if block is None:
+            raise KeyError(f"Block field {label} does not exist (available sections = {', '.join(self.list_block_labels())})")
+        return block
+
+    def _find_block(self, label: str) -> Optional[Block]:
+        position = self._block_positions.get(label)
+        if position is None or position >= len(self.blocks) or self.blocks[position].label != label:
+            # Stale or missing entry: reindex, keeping the first block for each label like a linear scan would.
+            # A fresh dict is assigned rather than updated in place because model_copy shares private attributes.
+            positions = {}
+            for i, block in enumerate(self.blocks):
+                positions.setdefault(block.label, i)
+            self._block_positions = positions
+            position = positions.get(label)
+            if position is None:
+                return None
+        return self.blocks[position]
 
     def get_blocks(self) -> List[Block]:
         """Return a list of the blocks held inside the memory object"""
@@ -146,11 +161,10 @@ class Memory(BaseModel, validate_assignment=True):
         if not isinstance(value, str):
             raise ValueError(f"Provided value must be a string")
 
-        for block in self.blocks:
-            if block.label == label:
-                block.value = value
-                return
-        raise ValueError(f"Block with label {label} does not exist")
+        block = self._find_block(label)
+        if block is None:
+            raise ValueError(f"Block with label {label} does not exist")
+        block.value = value
 
 
 # TODO: ideally this is refactored into ChatMemory and the subclasses are given more specific names.
@@ -896,132 +896,30 @@ class Message(BaseMessage):
         # type Content: https://ai.google.dev/api/rest/v1/Content / https://ai.google.dev/api/rest/v1beta/Content
         #     parts[]: Part
         #     role: str ('user' or 'model')
-        if self.content and len(self.content) == 1 and isinstance(self.content[0], TextContent):
-            text_content = self.content[0].text
-        elif self.content and len(self.content) == 1 and isinstance(self.content[0], ToolReturnContent):
-            text_content = self.content[0].content
+        role = self.role
+        message_content = self.content
+        if message_content and len(message_content) == 1 and isinstance(message_content[0], TextContent):
+            text_content = message_content[0].text
+        elif message_content and len(message_content) == 1 and isinstance(message_content[0], ToolReturnContent):
+            text_content = message_content[0].content
         else:
             text_content = None
 
-        if self.role != "tool" and self.name is not None:
-            warnings.warn(f"Using Google AI with non-null 'name' field (name={self.name} role={self.role}), not yet supported.")
-
-        if self.role == "system":
-            # NOTE: Gemini API doesn't have a 'system' role, use 'user' instead
-            # https://www.reddit.com/r/Bard/comments/1b90i8o/does_gemini_have_a_system_prompt_option_while/
-            google_ai_message = {
-                "role": "user",  # NOTE: no 'system'
-                "parts": [{"text": text_content}],
-            }
-
-        elif self.role == "user":
-            assert self.content, vars(self)
-
-            content_parts = []
-            for content in self.content:
-                if isinstance(content, TextContent):
-                    content_parts.append({"text": content.text})
-                elif isinstance(content, ImageContent):
-                    content_parts.append(
-                        {
-                            "inline_data": {
-                                "data": content.source.data,
-                                "mime_type": content.source.media_type,
-                            }
-                        }
-                    )
-                else:
-                    raise ValueError(f"Unsupported content type: {content.type}")
-
-            google_ai_message = {
-                "role": "user",
-                "parts": content_parts,
-            }
-
-        elif self.role == "assistant":
-            assert self.tool_calls is not None or text_content is not None
-            google_ai_message = {
-                "role": "model",  # NOTE: different
-            }
-
-            # NOTE: Google AI API doesn't allow non-null content + function call
-            # To get around this, just two a two part message, inner thoughts first then
-            parts = []
-            if not put_inner_thoughts_in_kwargs and text_content is not None:
-                # NOTE: ideally we do multi-part for CoT / inner thoughts + function call, but Google AI API doesn't allow it
-                raise NotImplementedError
-                parts.append({"text": text_content})
-
-            if self.tool_calls is not None:
-                # NOTE: implied support for multiple calls
-                for tool_call in self.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = tool_call.function.arguments
-                    try:
-                        # NOTE: Google AI wants actual JSON objects, not strings
-                        function_args = parse_json(function_args)
-                    except:
-                        raise UserWarning(f"Failed to parse JSON function args: {function_args}")
-                        function_args = {"args": function_args}
-
-                    if put_inner_thoughts_in_kwargs and text_content is not None:
-                        assert INNER_THOUGHTS_KWARG not in function_args, function_args
-                        assert len(self.tool_calls) == 1
-                        function_args[INNER_THOUGHTS_KWARG_VERTEX] = text_content
-
-                    parts.append(
-                        {
-                            "functionCall": {
-                                "name": function_name,
-                                "args": function_args,
-                            }
-                        }
-                    )
-            else:
-                assert text_content is not None
-                parts.append({"text": text_content})
-            google_ai_message["parts"] = parts
-
-        elif self.role == "tool":
-            # NOTE: Significantly different tool calling format, more similar to function calling format
-            assert all([v is not None for v in [self.role, self.tool_call_id]]), vars(self)
-
-            if self.name is None:
-                warnings.warn(f"Couldn't find function name on tool call, defaulting to tool ID instead.")
-                function_name = self.tool_call_id
-            else:
-                function_name = self.name
-
-            # NOTE: Google AI API wants the function response as JSON only, no string
-            try:
-                function_response = parse_json(text_content)
-            except:
-                function_response = {"function_response": text_content}
-
-            google_ai_message = {
-                "role": "function",
-                "parts": [
-                    {
-                        "functionResponse": {
-                            "name": function_name,
-                            "response": {
-                                "name": function_name,  # NOTE: name twice... why?
-                                "content": function_response,
-                            },
-                        }
-                    }
-                ],
-            }
+        if role != "tool" and self.name is not None:
+            warnings.warn(f"Using Google AI with non-null 'name' field (name={self.name} role={role}), not yet supported.")
 
-        else:
-            raise ValueError(self.role)
+        # NOTE: dispatch on role with a single dict lookup, this is called for every message in the context window
+        to_google_ai = _GOOGLE_AI_DICT_BY_ROLE.get(role)
+        if to_google_ai is None:
+            raise ValueError(role)
+        google_ai_message = to_google_ai(self, text_content, put_inner_thoughts_in_kwargs)
 
         # Validate that parts is never empty before returning
         if "parts" not in google_ai_message or not google_ai_message["parts"]:
             # If parts is empty, add a default text part
             google_ai_message["parts"] = [{"text": "empty message"}]
             warnings.warn(
-                f"Empty 'parts' detected in message with role '{self.role}'. Added default empty text part. Full message:\n{vars(self)}"
+                f"Empty 'parts' detected in message with role '{role}'. Added default empty text part. Full message:\n{vars(self)}"
             )
 
         return google_ai_message
@@ -1049,90 +947,29 @@ class Message(BaseMessage):
 
         # TODO: update this prompt style once guidance from Cohere on
         # embedded function calls in multi-turn conversation become more clear
-        if self.content and len(self.content) == 1 and isinstance(self.content[0], TextContent):
-            text_content = self.content[0].text
-        elif self.content and len(self.content) == 1 and isinstance(self.content[0], ToolReturnContent):
-            text_content = self.content[0].content
-        elif self.content and len(self.content) == 1 and isinstance(self.content[0], ImageContent):
+        role = self.role
+        message_content = self.content
+        if message_content and len(message_content) == 1 and isinstance(message_content[0], TextContent):
+            text_content = message_content[0].text
+        elif message_content and len(message_content) == 1 and isinstance(message_content[0], ToolReturnContent):
+            text_content = message_content[0].content
+        elif message_content and len(message_content) == 1 and isinstance(message_content[0], ImageContent):
             text_content = "[Image Here]"
         else:
             text_content = None
-        if self.role == "system":
-            """
-            The chat_history parameter should not be used for SYSTEM messages in most cases.
-            Instead, to add a SYSTEM role message at the beginning of a conversation, the preamble parameter should be used.
-            """
-            raise UserWarning(f"role 'system' messages should go in 'preamble' field for Cohere API")
 
-        elif self.role == "user":
-            assert all([v is not None for v in [text_content, self.role]]), vars(self)
-            cohere_message = [
-                {
-                    "role": "USER",
-                    "message": text_content,
-                }
-            ]
-
-        elif self.role == "assistant":
-            # NOTE: we may break this into two message - an inner thought and a function call
-            # Optionally, we could just make this a function call with the inner thought inside
-            assert self.tool_calls is not None or text_content is not None
-
-            if text_content and self.tool_calls:
-                if inner_thoughts_as_kwarg:
-                    raise NotImplementedError
-                cohere_message = [
-                    {
-                        "role": "CHATBOT",
-                        "message": text_content,
-                    },
-                ]
-                for tc in self.tool_calls:
-                    function_name = tc.function["name"]
-                    function_args = parse_json(tc.function["arguments"])
-                    function_args_str = ",".join([f"{k}={v}" for k, v in function_args.items()])
-                    function_call_text = f"{function_name}({function_args_str})"
-                    cohere_message.append(
-                        {
-                            "role": function_call_role,
-                            "message": f"{function_call_prefix} {function_call_text}",
-                        }
-                    )
-            elif not text_content and self.tool_calls:
-                cohere_message = []
-                for tc in self.tool_calls:
-                    # TODO better way to pack?
-                    function_call_text = json_dumps(tc.to_dict())
-                    cohere_message.append(
-                        {
-                            "role": function_call_role,
-                            "message": f"{function_call_prefix} {function_call_text}",
-                        }
-                    )
-            elif text_content and not self.tool_calls:
-                cohere_message = [
-                    {
-                        "role": "CHATBOT",
-                        "message": text_content,
-                    }
-                ]
-            else:
-                raise ValueError("Message does not have content nor tool_calls")
-
-        elif self.role == "tool":
-            assert all([v is not None for v in [self.role, self.tool_call_id]]), vars(self)
-            function_response_text = text_content
-            cohere_message = [
-                {
-                    "role": function_response_role,
-                    "message": f"{function_response_prefix} {function_response_text}",
-                }
-            ]
-
-        else:
-            raise ValueError(self.role)
-
-        return cohere_message
+        to_cohere = _COHERE_DICT_BY_ROLE.get(role)
+        if to_cohere is None:
+            raise ValueError(role)
+        return to_cohere(
+            self,
+            text_content,
+            function_call_role=function_call_role,
+            function_call_prefix=function_call_prefix,
+            function_response_role=function_response_role,
+            function_response_prefix=function_response_prefix,
+            inner_thoughts_as_kwarg=inner_thoughts_as_kwarg,
+        )
 
     @staticmethod
     def generate_otid_from_id(message_id: str, index: int) -> str:
@@ -1152,6 +989,241 @@ class Message(BaseMessage):
         return f"{hex_str[:8]}-{hex_str[8:12]}-{hex_str[12:16]}-{hex_str[16:20]}-{hex_str[20:]}"
 
 
+# Per-role converters used by Message.to_google_ai_dict
+
+
+def _google_ai_system(message: Message, text_content: Optional[str], put_inner_thoughts_in_kwargs: bool) -> dict:
+    # NOTE: Gemini API doesn't have a 'system' role, use 'user' instead
+    # https://www.reddit.com/r/Bard/comments/1b90i8o/does_gemini_have_a_system_prompt_option_while/
+    return {
+        "role": "user",  # NOTE: no 'system'
+        "parts": [{"text": text_content}],
+    }
+
+
+def _google_ai_user(message: Message, text_content: Optional[str], put_inner_thoughts_in_kwargs: bool) -> dict:
+    message_content = message.content
+    assert message_content, vars(message)
+
+    content_parts = []
+    for content in message_content:
+        if isinstance(content, TextContent):
+            content_parts.append({"text": content.text})
+        elif isinstance(content, ImageContent):
+            content_parts.append(
+                {
+                    "inline_data": {
+                        "data": content.source.data,
+                        "mime_type": content.source.media_type,
+                    }
+                }
+            )
+        else:
+            raise ValueError(f"Unsupported content type: {content.type}")
+
+    return {
+        "role": "user",
+        "parts": content_parts,
+    }
+
+
+def _google_ai_function_call_part(tool_call: OpenAIToolCall, inner_thoughts: Optional[str]) -> dict:
+    function_name = tool_call.function.name
+    function_args = tool_call.function.arguments
+    try:
+        # NOTE: Google AI wants actual JSON objects, not strings
+        function_args = parse_json(function_args)
+    except:
+        raise UserWarning(f"Failed to parse JSON function args: {function_args}")
+
+    if inner_thoughts is not None:
+        assert INNER_THOUGHTS_KWARG not in function_args, function_args
+        function_args[INNER_THOUGHTS_KWARG_VERTEX] = inner_thoughts
+
+    return {
+        "functionCall": {
+            "name": function_name,
+            "args": function_args,
+        }
+    }
+
+
+def _google_ai_assistant(message: Message, text_content: Optional[str], put_inner_thoughts_in_kwargs: bool) -> dict:
+    tool_calls = message.tool_calls
+    assert tool_calls is not None or text_content is not None
+
+    # NOTE: Google AI API doesn't allow non-null content + function call
+    # To get around this, just two a two part message, inner thoughts first then
+    if not put_inner_thoughts_in_kwargs and text_content is not None:
+        # NOTE: ideally we do multi-part for CoT / inner thoughts + function call, but Google AI API doesn't allow it
+        raise NotImplementedError
+
+    if tool_calls is not None:
+        # NOTE: implied support for multiple calls
+        if text_content is not None:
+            # inner thoughts are folded into the kwargs of the (single) function call
+            assert len(tool_calls) == 1
+        # build the parts list in one pass rather than growing it call by call
+        parts = [_google_ai_function_call_part(tool_call, inner_thoughts=text_content) for tool_call in tool_calls]
+    else:
+        assert text_content is not None
+        parts = [{"text": text_content}]
+
+    return {
+        "role": "model",  # NOTE: different
+        "parts": parts,
+    }
+
+
+def _google_ai_tool(message: Message, text_content: Optional[str], put_inner_thoughts_in_kwargs: bool) -> dict:
+    # NOTE: Significantly different tool calling format, more similar to function calling format
+    if message.tool_call_id is None:
+        raise ValueError(f"Invalid tool message: role={message.role!r} tool_call_id={message.tool_call_id!r}")
+
+    if message.name is None:
+        warnings.warn(f"Couldn't find function name on tool call, defaulting to tool ID instead.")
+        function_name = message.tool_call_id
+    else:
+        function_name = message.name
+
+    # NOTE: Google AI API wants the function response as JSON only, no string
+    try:
+        function_response = parse_json(text_content)
+    except:
+        function_response = {"function_response": text_content}
+
+    return {
+        "role": "function",
+        "parts": [
+            {
+                "functionResponse": {
+                    "name": function_name,
+                    "response": {
+                        "name": function_name,  # NOTE: name twice... why?
+                        "content": function_response,
+                    },
+                }
+            }
+        ],
+    }
+
+
+_GOOGLE_AI_DICT_BY_ROLE = {
+    MessageRole.system: _google_ai_system,
+    MessageRole.user: _google_ai_user,
+    MessageRole.assistant: _google_ai_assistant,
+    MessageRole.tool: _google_ai_tool,
+}
+
+
+# Per-role converters used by Message.to_cohere_dict
+
+_format_kwarg = "{}={}".format
+
+
+def _cohere_system(message: Message, text_content: Optional[str], **kwargs) -> List[dict]:
+    """
+    The chat_history parameter should not be used for SYSTEM messages in most cases.
+    Instead, to add a SYSTEM role message at the beginning of a conversation, the preamble parameter should be used.
+    """
+    raise UserWarning(f"role 'system' messages should go in 'preamble' field for Cohere API")
+
+
+def _cohere_user(message: Message, text_content: Optional[str], **kwargs) -> List[dict]:
+    if text_content is None:
+        raise ValueError(f"Invalid user message: role={message.role!r} has no text content")
+    return [
+        {
+            "role": "USER",
+            "message": text_content,
+        }
+    ]
+
+
+def _cohere_assistant(
+    message: Message,
+    text_content: Optional[str],
+    function_call_role: Optional[str],
+    function_call_prefix: Optional[str],
+    inner_thoughts_as_kwarg: Optional[bool],
+    **kwargs,
+) -> List[dict]:
+    # NOTE: we may break this into two message - an inner thought and a function call
+    # Optionally, we could just make this a function call with the inner thought inside
+    tool_calls = message.tool_calls
+    assert tool_calls is not None or text_content is not None
+
+    if text_content and tool_calls:
+        if inner_thoughts_as_kwarg:
+            raise NotImplementedError
+        cohere_message = [
+            {
+                "role": "CHATBOT",
+                "message": text_content,
+            },
+        ]
+        for tc in tool_calls:
+            function_name = tc.function["name"]
+            function_args = parse_json(tc.function["arguments"])
+            function_args_str = ",".join(map(_format_kwarg, function_args.keys(), function_args.values()))
+            function_call_text = f"{function_name}({function_args_str})"
+            cohere_message.append(
+                {
+                    "role": function_call_role,
+                    "message": f"{function_call_prefix} {function_call_text}",
+                }
+            )
+    elif not text_content and tool_calls:
+        cohere_message = []
+        for tc in tool_calls:
+            # TODO better way to pack?
+            # NOTE: serialize straight to JSON in pydantic-core (same fields as tc.to_dict()) instead of dict -> json.dumps
+            function_call_text = tc.model_dump_json(by_alias=True, exclude_unset=True)
+            cohere_message.append(
+                {
+                    "role": function_call_role,
+                    "message": f"{function_call_prefix} {function_call_text}",
+                }
+            )
+    elif text_content and not tool_calls:
+        cohere_message = [
+            {
+                "role": "CHATBOT",
+                "message": text_content,
+            }
+        ]
+    else:
+        raise ValueError("Message does not have content nor tool_calls")
+
+    return cohere_message
+
+
+def _cohere_tool(
+    message: Message,
+    text_content: Optional[str],
+    function_response_role: Optional[str],
+    function_response_prefix: Optional[str],
+    **kwargs,
+) -> List[dict]:
+    if message.tool_call_id is None:
+        raise ValueError(f"Invalid tool message: role={message.role!r} tool_call_id={message.tool_call_id!r}")
+    function_response_text = text_content
+    return [
+        {
+            "role": function_response_role,
+            "message": f"{function_response_prefix} {function_response_text}",
+        }
+    ]
+
+
+_COHERE_DICT_BY_ROLE = {
+    MessageRole.system: _cohere_system,
+    MessageRole.user: _cohere_user,
+    MessageRole.assistant: _cohere_assistant,
+    MessageRole.tool: _cohere_tool,
+}
+
+
 class ToolReturn(BaseModel):
     status: Literal["success", "error"] = Field(..., description="The status of the tool call")
     stdout: Optional[List[str]] = Field(None, description="Captured stdout (e.g. prints, logs) from the tool invocation")
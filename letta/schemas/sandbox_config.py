@@ -38,6 +38,11 @@ class LocalSandboxConfig(BaseModel):
         default_factory=list,
         description="List of pip packages to install with mandatory name and optional version following semantic versioning. This only is considered when use_venv is True.",
     )
+    parallel_installs: int = Field(
+        1,
+        ge=1,
+        description="Maximum number of concurrent pip processes used to download the pip requirements before installing them. Only set this above 1 if the requirements don't depend on each other. Requirements that only ship as source distributions need their build dependencies from the package index, so installing them falls back to a second, online pip install.",
+    )
 
     @property
     def type(self) -> "SandboxType":
@@ -149,6 +149,21 @@ class ToolCreate(LettaBase):
     return_char_limit: int = Field(FUNCTION_RETURN_CHAR_LIMIT, description="The maximum number of characters in the response.")
     pip_requirements: Optional[List[PipRequirement]] = Field(None, description="Optional list of pip packages required by this tool.")
 
+    def to_tool(self, **kwargs) -> Tool:
+        """
+        Build a Tool from this request without re-validating every field.
+
+        The request has already been validated, so the fields are copied over with `model_construct` and only the
+        schema-derivation step of Tool validation is run. Keyword arguments (e.g. `tool_type`, `name`) override or extend
+        the request fields. List and dict fields are shallow-copied, so the tool doesn't share them with the request.
+        """
+        fields = {**dict(self), **kwargs}
+        for key, value in fields.items():
+            if isinstance(value, (list, dict)):
+                fields[key] = value.copy()
+        tool = Tool.model_construct(**fields)
+        return tool.refresh_source_code_and_json_schema()
+
     # TODO should we put the HTTP / API fetch inside from_mcp?
     # async def from_mcp(cls, mcp_server: str, mcp_tool_name: str) -> "ToolCreate":
 
@@ -7,12 +7,13 @@ from typing import Any, AsyncGenerator, Generator
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
-from sqlalchemy import Engine, NullPool, QueuePool, create_engine
+from sqlalchemy import Engine, NullPool, QueuePool, create_engine, event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from letta.config import LettaConfig
 from letta.log import get_logger
+from letta.otel.metric_registry import MetricRegistry
 from letta.otel.tracing import trace_method
 from letta.settings import settings
 
@@ -68,6 +69,10 @@ class DatabaseRegistry:
 
     def initialize_sync(self, force: bool = False) -> None:
         """Initialize the synchronous database engine if not already initialized."""
+        # Lock-free fast path: this runs on every session checkout, but only the first call does any work
+        if self._initialized.get("sync") and not force:
+            return
+
         with self._lock:
             if self._initialized.get("sync") and not force:
                 return
@@ -81,6 +86,7 @@ class DatabaseRegistry:
                 self.config.archival_storage_uri = settings.letta_pg_uri_no_default
 
                 engine = create_engine(settings.letta_pg_uri, **self._build_sqlalchemy_engine_args(is_async=False))
+                self._instrument_pool(engine, is_async=False)
 
                 self._engines["default"] = engine
             # SQLite engine
@@ -105,6 +111,10 @@ class DatabaseRegistry:
 
     def initialize_async(self, force: bool = False) -> None:
         """Initialize the asynchronous database engine if not already initialized."""
+        # Lock-free fast path: this runs on every session checkout, but only the first call does any work
+        if self._initialized.get("async") and not force:
+            return
+
         with self._lock:
             if self._initialized.get("async") and not force:
                 return
@@ -120,6 +130,7 @@ class DatabaseRegistry:
                     async_pg_uri = f"postgresql+asyncpg://{pg_uri.split('://', 1)[1]}" if "://" in pg_uri else pg_uri
                 async_pg_uri = async_pg_uri.replace("sslmode=", "ssl=")
                 async_engine = create_async_engine(async_pg_uri, **self._build_sqlalchemy_engine_args(is_async=True))
+                self._instrument_pool(async_engine.sync_engine, is_async=True)
             else:
                 # create sqlite async engine
                 self._initialized["async"] = False
@@ -189,6 +200,21 @@ class DatabaseRegistry:
             )
         return base_args
 
+    def _instrument_pool(self, engine: Engine, *, is_async: bool) -> None:
+        """Record pool metrics, so a pool that opens a connection per request (or runs dry) is visible."""
+        attributes = {"engine": "async" if is_async else "sync"}
+        checkedout = getattr(engine.pool, "checkedout", None)  # NullPool keeps no count
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            MetricRegistry().db_connections_opened_counter.add(1, attributes)
+
+        if checkedout is not None:
+
+            @event.listens_for(engine, "checkout")
+            def on_checkout(dbapi_connection, connection_record, connection_proxy):
+                MetricRegistry().db_pool_checked_out_histogram.record(checkedout(), attributes)
+
     def _wrap_sqlite_engine(self, engine: Engine) -> None:
         """Wrap SQLite engine with error handling."""
         original_connect = engine.connect
@@ -12,6 +12,7 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from letta.__init__ import __version__ as letta_version
 from letta.agents.exceptions import IncompatibleAgentType
@@ -40,6 +41,7 @@ from letta.server.rest_api.routers.v1.organizations import router as organizatio
 from letta.server.rest_api.routers.v1.users import router as users_router  # TODO: decide on admin
 from letta.server.rest_api.static_files import mount_static_files
 from letta.server.server import SyncServer
+from letta.services.step_manager import job_access_cache_scope
 from letta.settings import settings
 
 # TODO(ethan)
@@ -114,6 +116,75 @@ class CheckPasswordMiddleware(BaseHTTPMiddleware):
         )
 
 
+# middleware that rejects oversized batch submissions before any dependency resolution runs.
+# Written as plain ASGI (not BaseHTTPMiddleware) so other routes, including streaming ones, pass straight through.
+class MaxBodySizeMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].rstrip("/").endswith("/messages/batches"):
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = settings.max_batch_bytes
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            await self._reject(int(content_length), max_bytes, scope, receive, send)
+            return
+
+        # Content-Length can be missing (chunked uploads) or wrong, so buffer the body and count what actually arrives.
+        # The route reads the whole body before it runs anyway.
+        chunks = []
+        received = 0
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                # Client disconnected before finishing the upload
+                return
+            chunk = message.get("body", b"")
+            received += len(chunk)
+            if received > max_bytes:
+                await self._reject(received, max_bytes, scope, receive, send)
+                return
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+
+        body_sent = False
+
+        async def replay_body() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": b"".join(chunks), "more_body": False}
+
+        await self.app(scope, replay_body, send)
+
+    @staticmethod
+    async def _reject(length: int, max_bytes: int, scope: Scope, receive: Receive, send: Send):
+        response = JSONResponse(
+            content={"detail": f"Request too large ({length} bytes). Max is {max_bytes} bytes."},
+            status_code=413,
+        )
+        await response(scope, receive, send)
+
+
+# middleware that lets step logging skip job access checks already made earlier in the same request.
+# Plain ASGI, so the scope wraps the route in the same task without BaseHTTPMiddleware's per-request task and body stream.
+class JobAccessCacheMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with job_access_cache_scope():
+            await self.app(scope, receive, send)
+
+
 @asynccontextmanager
 async def lifespan(app_: FastAPI):
     """
@@ -146,6 +217,11 @@ async def lifespan(app_: FastAPI):
         logger.info(f"[Worker {worker_id}] Scheduler shutdown completed")
     except Exception as e:
         logger.error(f"[Worker {worker_id}] Scheduler shutdown failed: {e}", exc_info=True)
+    try:
+        await server.step_manager.flush_async()
+        logger.info(f"[Worker {worker_id}] Queued steps flushed")
+    except Exception as e:
+        logger.error(f"[Worker {worker_id}] Flushing queued steps failed: {e}", exc_info=True)
     logger.info(f"[Worker {worker_id}] Lifespan shutdown completed")
 
 
@@ -279,6 +355,9 @@ def create_application() -> "FastAPI":
         print(f"▶ Using secure mode with password: {random_password}")
         app.add_middleware(CheckPasswordMiddleware)
 
+    app.add_middleware(MaxBodySizeMiddleware)
+    app.add_middleware(JobAccessCacheMiddleware)
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins,
@@ -2,7 +2,7 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Body, Depends, Header, Query, status
 from fastapi.exceptions import HTTPException
-from starlette.requests import Request
+from fastapi.responses import ORJSONResponse
 
 from letta.agents.letta_agent_batch import LettaAgentBatch
 from letta.log import get_logger
@@ -14,7 +14,7 @@ from letta.server.rest_api.utils import get_letta_server
 from letta.server.server import SyncServer
 from letta.settings import settings
 
-router = APIRouter(prefix="/messages", tags=["messages"])
+router = APIRouter(prefix="/messages", tags=["messages"], default_response_class=ORJSONResponse)
 
 logger = get_logger(__name__)
 
@@ -28,7 +28,6 @@ logger = get_logger(__name__)
     operation_id="create_messages_batch",
 )
 async def create_messages_batch(
-    request: Request,
     payload: CreateBatch = Body(..., description="Messages and config for all agents"),
     server: SyncServer = Depends(get_letta_server),
     actor_id: Optional[str] = Header(None, alias="user_id"),
@@ -37,14 +36,6 @@ async def create_messages_batch(
     Submit a batch of agent messages for asynchronous processing.
     Creates a job that will fan out messages to all listed agents and process them in parallel.
     """
-    # Reject requests greater than 256Mbs
-    max_bytes = 256 * 1024 * 1024
-    content_length = request.headers.get("content-length")
-    if content_length:
-        length = int(content_length)
-        if length > max_bytes:
-            raise HTTPException(status_code=413, detail=f"Request too large ({length} bytes). Max is {max_bytes} bytes.")
-
     # Reject request if env var is not set
     if not settings.enable_batch_job_polling:
         raise HTTPException(
@@ -80,10 +71,7 @@ async def create_messages_batch(
 
         # TODO: update run metadata
     except Exception as e:
-        import traceback
-
-        print("Error creating batch job", e)
-        traceback.print_exc()
+        logger.exception(f"Error creating batch job: {e}")
 
         # mark job as failed
         await server.job_manager.update_job_by_id_async(job_id=batch_job.id, job_update=JobUpdate(status=JobStatus.failed), actor=actor)
@@ -9,7 +9,8 @@ from composio.exceptions import (
     EnumMetadataNotFound,
     EnumStringNotFound,
 )
-from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 
 from letta.errors import LettaToolCreateError
 from letta.functions.mcp_client.exceptions import MCPTimeoutError
@@ -20,16 +21,28 @@ from letta.orm.errors import UniqueConstraintViolationError
 from letta.schemas.letta_message import ToolReturnMessage
 from letta.schemas.mcp import UpdateSSEMCPServer, UpdateStreamableHTTPMCPServer
 from letta.schemas.tool import Tool, ToolCreate, ToolRunFromSource, ToolUpdate
-from letta.server.rest_api.utils import get_letta_server
+from letta.server.rest_api.utils import etag_matches, get_letta_server, make_etag
 from letta.server.server import SyncServer
 from letta.services.mcp.sse_client import AsyncSSEMCPClient
 from letta.services.mcp.streamable_http_client import AsyncStreamableHTTPMCPClient
 from letta.settings import tool_settings
 
-router = APIRouter(prefix="/tools", tags=["tools"])
+router = APIRouter(prefix="/tools", tags=["tools"], default_response_class=ORJSONResponse)
 
 logger = get_logger(__name__)
 
+# Composio errors surfaced to the client as a 400 with the exception class name as the error code
+_COMPOSIO_CLIENT_ERRORS = (
+    ConnectedAccountNotFoundError,
+    EnumStringNotFound,
+    EnumMetadataNotFound,
+    HTTPError,
+    NoItemsFound,
+    ApiKeyNotProvidedError,
+    ComposioClientError,
+    ComposioSDKError,
+)
+
 
 @router.delete("/{tool_id}", operation_id="delete_tool")
 async def delete_tool(
@@ -57,13 +70,15 @@ async def count_tools(
         actor = await server.user_manager.get_actor_or_default_async(actor_id=actor_id)
         return await server.tool_manager.size_async(actor=actor, include_base_tools=include_base_tools)
     except Exception as e:
-        print(f"Error occurred: {e}")
+        logger.exception(f"Error occurred while counting tools: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{tool_id}", response_model=Tool, operation_id="retrieve_tool")
 async def retrieve_tool(
     tool_id: str,
+    request: Request,
+    response: Response,
     server: SyncServer = Depends(get_letta_server),
     actor_id: Optional[str] = Header(None, alias="user_id"),  # Extract user_id from header, default to None if not present
 ):
@@ -71,10 +86,21 @@ async def retrieve_tool(
     Get a tool by ID
     """
     actor = await server.user_manager.get_actor_or_default_async(actor_id=actor_id)
-    tool = await server.tool_manager.get_tool_by_id_async(tool_id=tool_id, actor=actor)
+
+    # Answer conditional GETs from the last-modified timestamp alone, without loading or serializing the tool
+    if request.headers.get("if-none-match"):
+        updated_at = await server.tool_manager.get_tool_updated_at_async(tool_id=tool_id, actor=actor)
+        if updated_at is not None:
+            etag = make_etag(tool_id, updated_at)
+            if etag_matches(request, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+
+    tool, updated_at = await server.tool_manager.get_tool_by_id_with_updated_at_async(tool_id=tool_id, actor=actor)
     if tool is None:
         # return 404 error
         raise HTTPException(status_code=404, detail=f"Tool with id {tool_id} not found.")
+    if updated_at is not None:
+        response.headers["ETag"] = make_etag(tool_id, updated_at)
     return tool
 
 
@@ -98,8 +124,7 @@ async def list_tools(
         # Get the list of tools
         return await server.tool_manager.list_tools_async(actor=actor, after=after, limit=limit)
     except Exception as e:
-        # Log or print the full exception here for debugging
-        print(f"Error occurred: {e}")
+        logger.exception(f"Error occurred while listing tools: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -114,7 +139,7 @@ def count_tools(
     try:
         return server.tool_manager.size(actor=server.user_manager.get_user_or_default(user_id=actor_id))
     except Exception as e:
-        print(f"Error occurred: {e}")
+        logger.exception(f"Error occurred while counting tools: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -129,24 +154,19 @@ async def create_tool(
     """
     try:
         actor = await server.user_manager.get_actor_or_default_async(actor_id=actor_id)
-        tool = Tool(**request.model_dump())
+        tool = request.to_tool()
         return await server.tool_manager.create_tool_async(pydantic_tool=tool, actor=actor)
     except UniqueConstraintViolationError as e:
-        # Log or print the full exception here for debugging
-        print(f"Error occurred: {e}")
+        logger.warning(f"Tool creation conflict: {e}")
         clean_error_message = f"Tool with this name already exists."
         raise HTTPException(status_code=409, detail=clean_error_message)
     except LettaToolCreateError as e:
         # HTTP 400 == Bad Request
-        print(f"Error occurred during tool creation: {e}")
-        # print the full stack trace
-        import traceback
-
-        print(traceback.format_exc())
+        logger.exception(f"Error occurred during tool creation: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Catch other unexpected errors and raise an internal server error
-        print(f"Unexpected error occurred: {e}")
+        logger.exception(f"Unexpected error occurred: {e}")
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
 
 
@@ -161,19 +181,18 @@ async def upsert_tool(
     """
     try:
         actor = await server.user_manager.get_actor_or_default_async(actor_id=actor_id)
-        tool = await server.tool_manager.create_or_update_tool_async(pydantic_tool=Tool(**request.model_dump()), actor=actor)
+        tool = await server.tool_manager.create_or_update_tool_async(pydantic_tool=request.to_tool(), actor=actor)
         return tool
     except UniqueConstraintViolationError as e:
-        # Log the error and raise a conflict exception
-        print(f"Unique constraint violation occurred: {e}")
+        logger.warning(f"Unique constraint violation occurred: {e}")
         raise HTTPException(status_code=409, detail=str(e))
     except LettaToolCreateError as e:
         # HTTP 400 == Bad Request
-        print(f"Error occurred during tool upsert: {e}")
+        logger.warning(f"Error occurred during tool upsert: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Catch other unexpected errors and raise an internal server error
-        print(f"Unexpected error occurred: {e}")
+        logger.exception(f"Unexpected error occurred: {e}")
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
 
 
@@ -192,11 +211,11 @@ async def modify_tool(
         return await server.tool_manager.update_tool_by_id_async(tool_id=tool_id, tool_update=request, actor=actor)
     except LettaToolCreateError as e:
         # HTTP 400 == Bad Request
-        print(f"Error occurred during tool update: {e}")
+        logger.warning(f"Error occurred during tool update: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Catch other unexpected errors and raise an internal server error
-        print(f"Unexpected error occurred: {e}")
+        logger.exception(f"Unexpected error occurred: {e}")
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
 
 
@@ -236,16 +255,12 @@ async def run_tool_from_source(
         )
     except LettaToolCreateError as e:
         # HTTP 400 == Bad Request
-        print(f"Error occurred during tool creation: {e}")
-        # print the full stack trace
-        import traceback
-
-        print(traceback.format_exc())
+        logger.exception(f"Error occurred during tool creation: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
     except Exception as e:
         # Catch other unexpected errors and raise an internal server error
-        print(f"Unexpected error occurred: {e}")
+        logger.exception(f"Unexpected error occurred: {e}")
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
 
 
@@ -298,74 +313,11 @@ async def add_composio_tool(
     try:
         tool_create = ToolCreate.from_composio(action_name=composio_action_name)
         return await server.tool_manager.create_or_update_composio_tool_async(tool_create=tool_create, actor=actor)
-    except ConnectedAccountNotFoundError as e:
-        raise HTTPException(
-            status_code=400,  # Bad Request
-            detail={
-                "code": "ConnectedAccountNotFoundError",
-                "message": str(e),
-                "composio_action_name": composio_action_name,
-            },
-        )
-    except EnumStringNotFound as e:
-        raise HTTPException(
-            status_code=400,  # Bad Request
-            detail={
-                "code": "EnumStringNotFound",
-                "message": str(e),
-                "composio_action_name": composio_action_name,
-            },
-        )
-    except EnumMetadataNotFound as e:
-        raise HTTPException(
-            status_code=400,  # Bad Request
-            detail={
-                "code": "EnumMetadataNotFound",
-                "message": str(e),
-                "composio_action_name": composio_action_name,
-            },
-        )
-    except HTTPError as e:
-        raise HTTPException(
-            status_code=400,  # Bad Request
-            detail={
-                "code": "HTTPError",
-                "message": str(e),
-                "composio_action_name": composio_action_name,
-            },
-        )
-    except NoItemsFound as e:
-        raise HTTPException(
-            status_code=400,  # Bad Request
-            detail={
-                "code": "NoItemsFound",
-                "message": str(e),
-                "composio_action_name": composio_action_name,
-            },
-        )
-    except ApiKeyNotProvidedError as e:
-        raise HTTPException(
-            status_code=400,  # Bad Request
-            detail={
-                "code": "ApiKeyNotProvidedError",
-                "message": str(e),
-                "composio_action_name": composio_action_name,
-            },
-        )
-    except ComposioClientError as e:
-        raise HTTPException(
-            status_code=400,  # Bad Request
-            detail={
-                "code": "ComposioClientError",
-                "message": str(e),
-                "composio_action_name": composio_action_name,
-            },
-        )
-    except ComposioSDKError as e:
+    except _COMPOSIO_CLIENT_ERRORS as e:
         raise HTTPException(
             status_code=400,  # Bad Request
             detail={
-                "code": "ComposioSDKError",
+                "code": type(e).__name__,
                 "message": str(e),
                 "composio_action_name": composio_action_name,
             },
@@ -544,7 +496,7 @@ async def add_mcp_server_to_config(
             },
         )
     except Exception as e:
-        print(f"Unexpected error occurred while adding MCP server: {e}")
+        logger.exception(f"Unexpected error occurred while adding MCP server: {e}")
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
 
 
@@ -576,7 +528,7 @@ async def update_mcp_server(
         # Re-raise HTTP exceptions (like 404)
         raise
     except Exception as e:
-        print(f"Unexpected error occurred while updating MCP server: {e}")
+        logger.exception(f"Unexpected error occurred while updating MCP server: {e}")
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
 
 
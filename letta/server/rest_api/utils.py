@@ -3,10 +3,11 @@ import json
 import os
 import uuid
 import warnings
+from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, AsyncGenerator, Dict, Iterable, List, Optional, Union, cast
 
-from fastapi import Header, HTTPException
+from fastapi import Header, HTTPException, Request
 from openai.types.chat import ChatCompletionMessageParam
 from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall as OpenAIToolCall
 from openai.types.chat.chat_completion_message_tool_call import Function as OpenAIFunction
@@ -161,6 +162,29 @@ def get_current_interface() -> StreamingServerInterface:
     return StreamingServerInterface
 
 
+def make_etag(*parts: Union[str, int, datetime, None]) -> str:
+    """Build a weak ETag from identifying parts (ids, counts, last-modified timestamps)."""
+    tokens = []
+    for part in parts:
+        if isinstance(part, datetime):
+            # microsecond precision so that back-to-back updates produce different tags
+            part = int(part.timestamp() * 1_000_000)
+        tokens.append(str(part))
+    return f'W/"{"-".join(tokens)}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches the given ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison: ignore the W/ prefix on either side
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
 def log_error_to_sentry(e):
     import traceback
 
@@ -1,7 +1,8 @@
 import asyncio
 import os
+import weakref
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import sqlalchemy as sa
 from sqlalchemy import delete, func, insert, literal, or_, select
@@ -82,11 +83,12 @@ from letta.services.helpers.agent_manager_helper import (
     check_supports_structured_output,
     compile_system_message,
     derive_system_message,
+    embed_passage_query,
     initialize_message_sequence,
     package_initial_message_sequence,
 )
 from letta.services.identity_manager import IdentityManager
-from letta.services.message_manager import MessageManager
+from letta.services.message_manager import MessageManager, invalidate_message_cache
 from letta.services.passage_manager import PassageManager
 from letta.services.source_manager import SourceManager
 from letta.services.tool_manager import ToolManager
@@ -94,6 +96,36 @@ from letta.utils import enforce_types, united_diff
 
 logger = get_logger(__name__)
 
+PASSAGE_SEARCH_MAX_BATCH = 32
+
+# Vector searches waiting to be run together, and the task draining them, per event loop. Managers are created
+# per call, so the queues live at module level for concurrent searches from different agents to land in the same batch.
+_pending_passage_searches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, List[Tuple[Dict[str, Any], asyncio.Future]]]" = (
+    weakref.WeakKeyDictionary()
+)
+_passage_search_drain_tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Task]" = weakref.WeakKeyDictionary()
+
+
+def _embedding_fingerprint(embedding_config: EmbeddingConfig) -> tuple:
+    # Hashable stand-in for the config fields that decide which embedding a query gets
+    return (
+        embedding_config.embedding_endpoint_type,
+        embedding_config.embedding_endpoint,
+        embedding_config.embedding_model,
+        embedding_config.embedding_dim,
+    )
+
+
+def _fail_passage_searches(batch: List[Tuple[Dict[str, Any], asyncio.Future]], error: BaseException) -> None:
+    # Resolve every caller that is still waiting, so no search is left hanging when a batch fails or is cancelled
+    for _, future in batch:
+        if future.done():
+            continue
+        if isinstance(error, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(error)
+
 
 class AgentManager:
     """Manager class to handle business logic related to Agents."""
@@ -1186,6 +1218,8 @@ class AgentManager:
                 raise ValueError(f"Failed to hard delete Agent with ID {agent_id}: {e}")
             else:
                 logger.debug(f"Agent with ID {agent_id} successfully hard deleted")
+                # The agents' messages are removed by the database cascade, out of MessageManager's sight
+                invalidate_message_cache()
 
     @trace_method
     @enforce_types
@@ -1236,6 +1270,8 @@ class AgentManager:
                 raise ValueError(f"Failed to hard delete Agent with ID {agent_id}: {e}")
             else:
                 logger.debug(f"Agent with ID {agent_id} successfully hard deleted")
+                # The agents' messages are removed by the database cascade, out of MessageManager's sight
+                invalidate_message_cache()
 
     @trace_method
     @enforce_types
@@ -1675,7 +1711,9 @@ class AgentManager:
 
     @trace_method
     @enforce_types
-    async def update_memory_if_changed_async(self, agent_id: str, new_memory: Memory, actor: PydanticUser) -> PydanticAgentState:
+    async def update_memory_if_changed_async(
+        self, agent_id: str, new_memory: Memory, actor: PydanticUser, changed_labels: Optional[List[str]] = None
+    ) -> PydanticAgentState:
         """
         Update internal memory object and system prompt if there have been modifications.
 
@@ -1683,6 +1721,7 @@ class AgentManager:
             actor:
             agent_id:
             new_memory (Memory): the new memory object to compare to the current memory object
+            changed_labels (Optional[List[str]]): labels of the only blocks that may have been edited; all blocks are compared if omitted
 
         Returns:
             modified (bool): whether the memory was updated
@@ -1691,7 +1730,7 @@ class AgentManager:
         system_message = await self.message_manager.get_message_by_id_async(message_id=agent_state.message_ids[0], actor=actor)
         if new_memory.compile() not in system_message.content[0].text:
             # update the blocks (LRW) in the DB
-            for label in agent_state.memory.list_block_labels():
+            for label in changed_labels if changed_labels is not None else agent_state.memory.list_block_labels():
                 updated_value = new_memory.get_block(label).value
                 if updated_value != agent_state.memory.get_block(label).value:
                     # update the block if it's changed
@@ -2307,8 +2346,9 @@ class AgentManager:
         embed_query: bool = False,
         ascending: bool = True,
         embedding_config: Optional[EmbeddingConfig] = None,
+        offset: Optional[int] = None,
     ) -> List[PydanticPassage]:
-        """Lists all passages attached to an agent."""
+        """Lists all passages attached to an agent. `offset` skips that many matches in the query itself."""
         async with db_registry.async_session() as session:
             main_query = build_agent_passage_query(
                 actor=actor,
@@ -2326,6 +2366,8 @@ class AgentManager:
             # Add limit
             if limit:
                 main_query = main_query.limit(limit)
+            if offset:
+                main_query = main_query.offset(offset)
 
             # Execute query
             result = await session.execute(main_query)
@@ -2336,6 +2378,121 @@ class AgentManager:
             # Convert to Pydantic models
             return [p.to_pydantic() for p in passages]
 
+    @trace_method
+    async def search_agent_passages_batched_async(
+        self,
+        actor: PydanticUser,
+        agent_id: str,
+        query_text: str,
+        embedding_config: EmbeddingConfig,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> List[PydanticPassage]:
+        """Vector-search an agent's passages, coalescing concurrent searches.
+
+        A search issued while the event loop is otherwise idle runs right away. Searches that arrive together, or
+        while an earlier batch is still running, are batched (up to PASSAGE_SEARCH_MAX_BATCH at a time): their queries
+        are embedded concurrently and then run on a single database session. Results are the same as
+        list_agent_passages_async(..., embed_query=True).
+        """
+        search = dict(
+            actor=actor,
+            agent_id=agent_id,
+            query_text=query_text,
+            embedding_config=embedding_config,
+            limit=limit,
+            offset=offset,
+        )
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = _pending_passage_searches.setdefault(loop, [])
+        pending.append((search, future))
+        drain_task = _passage_search_drain_tasks.get(loop)
+        if drain_task is None or drain_task.done():
+            # The drain task starts on the next loop iteration, so searches started in the same tick join its first batch
+            _passage_search_drain_tasks[loop] = asyncio.create_task(self._drain_passage_searches(pending))
+        return await future
+
+    async def _drain_passage_searches(self, pending: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        try:
+            while pending:
+                batch = pending[:PASSAGE_SEARCH_MAX_BATCH]
+                del pending[:PASSAGE_SEARCH_MAX_BATCH]
+                try:
+                    await self._run_passage_search_batch(batch)
+                except Exception as e:
+                    logger.error(f"Passage search batch failed: {e}", exc_info=True)
+                    _fail_passage_searches(batch, e)
+                except BaseException as e:
+                    _fail_passage_searches(batch, e)
+                    raise
+                else:
+                    _fail_passage_searches(batch, RuntimeError("Passage search batch finished without a result"))
+        finally:
+            # Only non-empty if the drain itself was cancelled
+            _fail_passage_searches(pending, asyncio.CancelledError())
+            pending.clear()
+
+    async def _run_passage_search_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        # Identical searches in the batch run once and are fanned back out to every caller
+        searches: Dict[tuple, Dict[str, Any]] = {}
+        waiters: Dict[tuple, List[asyncio.Future]] = {}
+        for search, future in batch:
+            key = (
+                search["actor"].organization_id,
+                search["agent_id"],
+                search["query_text"],
+                _embedding_fingerprint(search["embedding_config"]),
+                search["limit"],
+                search["offset"],
+            )
+            searches.setdefault(key, search)
+            waiters.setdefault(key, []).append(future)
+
+        # Searches that differ only in agent or page still share one embedding. Embedding calls are
+        # blocking network requests, so run them side by side off the event loop.
+        embedding_inputs = {(key[2], key[3]): search["embedding_config"] for key, search in searches.items()}
+        embedding_results = await asyncio.gather(
+            *(asyncio.to_thread(embed_passage_query, query_text, config) for (query_text, _), config in embedding_inputs.items()),
+            return_exceptions=True,
+        )
+        embeddings = dict(zip(embedding_inputs, embedding_results))
+
+        async with db_registry.async_session() as session:
+            for key, search in searches.items():
+                # Skip callers that went away (e.g. were cancelled) while the batch was filling up
+                futures = [future for future in waiters[key] if not future.done()]
+                if not futures:
+                    continue
+                embedding = embeddings[(key[2], key[3])]
+                if isinstance(embedding, BaseException):
+                    for future in futures:
+                        future.set_exception(embedding)
+                    continue
+                try:
+                    query = build_agent_passage_query(
+                        actor=search["actor"],
+                        agent_id=search["agent_id"],
+                        query_text=search["query_text"],
+                        embed_query=True,
+                        embedding_config=search["embedding_config"],
+                        query_embedding=embedding,
+                    )
+                    if search["limit"]:
+                        query = query.limit(search["limit"])
+                    if search["offset"]:
+                        query = query.offset(search["offset"])
+                    result = await session.execute(query)
+                    passages = [p.to_pydantic() for p in result.scalars()]
+                except Exception as e:
+                    # Keep one failed search from aborting the rest of the batch
+                    await session.rollback()
+                    for future in futures:
+                        future.set_exception(e)
+                    continue
+                for future in futures:
+                    future.set_result(list(passages))
+
     @trace_method
     @enforce_types
     def passage_size(
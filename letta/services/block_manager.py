@@ -1,7 +1,7 @@
 import asyncio
 from typing import Dict, List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Text, func, select, update
 from sqlalchemy.orm import Session
 
 from letta.log import get_logger
@@ -133,6 +133,46 @@ class BlockManager:
             await block.update_async(db_session=session, actor=actor)
             return block.to_pydantic()
 
+    @trace_method
+    async def patch_block_value_async(
+        self, block_id: str, offset: int, old_text: str, new_text: str, expected_length: int, actor: PydanticUser
+    ) -> bool:
+        """
+        Replace `old_text` at `offset` in a block's value with `new_text`, in the database.
+
+        Only the edited span goes over the wire instead of the whole value. The patch is applied only if
+        the stored value still has `expected_length` characters and holds `old_text` at `offset`, and if
+        the result fits the block's limit, so a caller holding a stale value can't corrupt the block.
+
+        Returns:
+            whether the patch was applied
+        """
+        new_length = expected_length - len(old_text) + len(new_text)
+        value = BlockModel.value
+        stmt = (
+            update(BlockModel)
+            .where(
+                BlockModel.id == block_id,
+                BlockModel.organization_id == actor.organization_id,
+                func.length(value) == expected_length,
+                func.substr(value, offset + 1, len(old_text)) == old_text,
+                BlockModel.limit >= new_length,
+            )
+            .values(
+                value=func.substr(value, 1, offset, type_=Text)
+                .concat(new_text)
+                .concat(func.substr(value, offset + len(old_text) + 1, type_=Text)),
+                version=BlockModel.version + 1,
+                _last_updated_by_id=actor.id,
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        async with db_registry.async_session() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+            return result.rowcount == 1
+
     @trace_method
     @enforce_types
     def delete_block(self, block_id: str, actor: PydanticUser) -> PydanticBlock:
@@ -14,6 +14,7 @@ from letta.schemas.letta_message import LettaMessage
 from letta.schemas.message import Message as PydanticMessage
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.message_manager import invalidate_message_cache
 from letta.utils import enforce_types
 
 
@@ -271,6 +272,7 @@ class GroupManager:
             ).delete(synchronize_session=False)
 
             session.commit()
+        invalidate_message_cache()
 
     @trace_method
     @enforce_types
@@ -961,6 +961,12 @@ def build_source_passage_query(
     return query
 
 
+def embed_passage_query(query_text: str, embedding_config: EmbeddingConfig) -> List[float]:
+    """Embed a passage search query, padded to MAX_EMBEDDING_DIM to match the stored embeddings."""
+    embedded_text = np.array(embedding_model(embedding_config).get_text_embedding(query_text))
+    return np.pad(embedded_text, (0, MAX_EMBEDDING_DIM - embedded_text.shape[0]), mode="constant").tolist()
+
+
 def build_agent_passage_query(
     actor: User,
     agent_id: str,  # Required for agent passages
@@ -972,17 +978,19 @@ def build_agent_passage_query(
     embed_query: bool = False,
     ascending: bool = True,
     embedding_config: Optional[EmbeddingConfig] = None,
+    query_embedding: Optional[List[float]] = None,
 ) -> Select:
-    """Build query for agent passages with all filters applied."""
+    """Build query for agent passages with all filters applied.
+
+    Pass `query_embedding` (from embed_passage_query) to reuse an embedding computed up front.
+    """
 
     # Handle embedding for vector search
     embedded_text = None
     if embed_query:
         assert embedding_config is not None, "embedding_config must be specified for vector search"
         assert query_text is not None, "query_text must be specified for vector search"
-        embedded_text = embedding_model(embedding_config).get_text_embedding(query_text)
-        embedded_text = np.array(embedded_text)
-        embedded_text = np.pad(embedded_text, (0, MAX_EMBEDDING_DIM - embedded_text.shape[0]), mode="constant").tolist()
+        embedded_text = query_embedding if query_embedding is not None else embed_passage_query(query_text, embedding_config)
 
     # Base query for agent passages
     query = select(AgentPassage).where(AgentPassage.agent_id == agent_id, AgentPassage.organization_id == actor.organization_id)
@@ -1,8 +1,14 @@
+import glob
+import hashlib
 import os
 import platform
+import shutil
 import subprocess
+import tempfile
+import threading
 import venv
-from typing import TYPE_CHECKING, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Dict, Optional, Sequence
 
 from datamodel_code_generator import DataModelType, PythonVersion
 from datamodel_code_generator.model import get_data_model_types
@@ -16,6 +22,25 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+_IS_WINDOWS = platform.system().lower().startswith("win")
+_SYSTEM_PYTHON = "python.exe" if _IS_WINDOWS else "python3"
+
+# Marker written into a sandbox venv recording the sha256 of the requirements.txt it was set up from
+VENV_REQUIREMENTS_HASH_FILE = ".letta_reqs_hash"
+
+# Packages every sandbox venv needs before installing anything else
+VENV_SEED_PACKAGES = ("pip", "setuptools", "wheel")
+
+# Locks striped by environment (venv directory, or the system python), so concurrent tool runs never run pip
+# against the same environment at once. A fixed set of stripes keeps memory bounded however many environments
+# come and go; two environments that share a stripe just take turns.
+_PIP_INSTALL_LOCK_STRIPES = 64
+_pip_install_locks = tuple(threading.Lock() for _ in range(_PIP_INSTALL_LOCK_STRIPES))
+
+
+def _pip_install_lock(environment: str) -> threading.Lock:
+    return _pip_install_locks[hash(os.path.abspath(environment)) % _PIP_INSTALL_LOCK_STRIPES]
+
 
 def find_python_executable(local_configs: LocalSandboxConfig) -> str:
     """
@@ -25,17 +50,11 @@ def find_python_executable(local_configs: LocalSandboxConfig) -> str:
     Returns:
         str: Full path to the Python binary.
     """
-    sandbox_dir = os.path.expanduser(local_configs.sandbox_dir)  # Expand tilde
-
     if not local_configs.use_venv:
-        return "python.exe" if platform.system().lower().startswith("win") else "python3"
+        return _SYSTEM_PYTHON
 
-    venv_path = os.path.join(sandbox_dir, local_configs.venv_name)
-    python_exec = (
-        os.path.join(venv_path, "Scripts", "python.exe")
-        if platform.system().startswith("Win")
-        else os.path.join(venv_path, "bin", "python3")
-    )
+    venv_path = os.path.join(os.path.expanduser(local_configs.sandbox_dir), local_configs.venv_name)  # Expand tilde
+    python_exec = os.path.join(venv_path, "Scripts", "python.exe") if _IS_WINDOWS else os.path.join(venv_path, "bin", "python3")
 
     if not os.path.isfile(python_exec):
         raise FileNotFoundError(f"Python executable not found: {python_exec}. Ensure the virtual environment exists.")
@@ -76,6 +95,12 @@ def ensure_pip_is_up_to_date(python_exec: str, env: Optional[Dict[str, str]] = N
         python_exec (str): Path to the Python executable to use.
         env (dict, optional): Environment variables to pass to subprocess.
     """
+    # Spawning pip costs a few seconds of interpreter startup and resolution, so only do it if the
+    # venv is actually missing one of the packages (checked in-process against its site-packages)
+    if _venv_has_packages(python_exec, VENV_SEED_PACKAGES):
+        logger.debug(f"{', '.join(VENV_SEED_PACKAGES)} already installed for {python_exec}; skipping upgrade.")
+        return
+
     run_subprocess(
         [python_exec, "-m", "pip", "install", "--upgrade", "pip", "setuptools", "wheel"],
         env=env,
@@ -83,6 +108,16 @@ def ensure_pip_is_up_to_date(python_exec: str, env: Optional[Dict[str, str]] = N
     )
 
 
+def _venv_has_packages(python_exec: str, package_names: Sequence[str]) -> bool:
+    """Checks whether each package has a .dist-info in the site-packages of the venv owning python_exec."""
+    venv_path = os.path.dirname(os.path.dirname(python_exec))
+    if _IS_WINDOWS:
+        site_packages_pattern = os.path.join(venv_path, "Lib", "site-packages")
+    else:
+        site_packages_pattern = os.path.join(venv_path, "lib", "python*", "site-packages")
+    return all(glob.glob(os.path.join(site_packages_pattern, f"{name}-*.dist-info")) for name in package_names)
+
+
 def install_pip_requirements_for_sandbox(
     local_configs: LocalSandboxConfig,
     upgrade: bool = True,
@@ -98,7 +133,19 @@ def install_pip_requirements_for_sandbox(
     local_configs.sandbox_dir = sandbox_dir  # Update the object to store the absolute path
 
     python_exec = find_python_executable(local_configs)
+    environment = os.path.join(sandbox_dir, local_configs.venv_name) if local_configs.use_venv else python_exec
+    with _pip_install_lock(environment):
+        _install_pip_requirements(python_exec, local_configs, upgrade, user_install_if_no_venv, env, tool)
 
+
+def _install_pip_requirements(
+    python_exec: str,
+    local_configs: LocalSandboxConfig,
+    upgrade: bool,
+    user_install_if_no_venv: bool,
+    env: Optional[Dict[str, str]],
+    tool: Optional["Tool"],
+):
     # If using a virtual environment, upgrade pip before installing dependencies.
     if local_configs.use_venv:
         ensure_pip_is_up_to_date(python_exec, env=env)
@@ -126,7 +173,6 @@ def install_pip_requirements_for_sandbox(
     pip_cmd = [python_exec, "-m", "pip", "install"]
     if upgrade:
         pip_cmd.append("--upgrade")
-    pip_cmd += all_packages
 
     if user_install_if_no_venv and not local_configs.use_venv:
         pip_cmd.append("--user")
@@ -144,7 +190,31 @@ def install_pip_requirements_for_sandbox(
     context = f" ({'; '.join(error_details)})" if error_details else ""
     fail_msg = f"Failed to install pip packages{context}. This may be due to package version incompatibility. Consider updating package versions or removing version constraints."
 
-    run_subprocess(pip_cmd, env=env, fail_msg=fail_msg)
+    # pip downloads sequentially, so shard the downloads across concurrent pip processes if configured.
+    # Only the downloads run in parallel; the install itself is a single pip process reading from the local download dir.
+    num_shards = min(local_configs.parallel_installs, len(all_packages), os.cpu_count() or 1)
+    if num_shards <= 1:
+        run_subprocess(pip_cmd + all_packages, env=env, fail_msg=fail_msg)
+        return
+
+    logger.info(f"Downloading {len(all_packages)} pip packages across {num_shards} parallel pip processes")
+    with tempfile.TemporaryDirectory(prefix="letta-pip-") as wheel_dir:
+        download_cmd = [python_exec, "-m", "pip", "download", "--dest", wheel_dir]
+        with ThreadPoolExecutor(max_workers=num_shards) as executor:
+            futures = [
+                executor.submit(run_subprocess, download_cmd + all_packages[i::num_shards], env=env, fail_msg=fail_msg)
+                for i in range(num_shards)
+            ]
+            for future in as_completed(futures):
+                future.result()  # re-raise the first failure
+
+        try:
+            run_subprocess(pip_cmd + ["--no-index", "--find-links", wheel_dir] + all_packages, env=env, fail_msg=fail_msg)
+        except RuntimeError:
+            # Requirements that only ship as an sdist need their build dependencies (setuptools, wheel, ...), which
+            # were never downloaded, so let pip reach the index for whatever the download dir is missing
+            logger.warning("Offline install from downloaded packages failed, retrying with the package index enabled")
+            run_subprocess(pip_cmd + ["--find-links", wheel_dir] + all_packages, env=env, fail_msg=fail_msg)
 
 
 def create_venv_for_local_sandbox(sandbox_dir_path: str, venv_path: str, env: Dict[str, str], force_recreate: bool):
@@ -160,11 +230,14 @@ def create_venv_for_local_sandbox(sandbox_dir_path: str, venv_path: str, env: Di
     sandbox_dir_path = os.path.expanduser(sandbox_dir_path)
     venv_path = os.path.expanduser(venv_path)
 
+    with _pip_install_lock(venv_path):
+        _create_venv(sandbox_dir_path, venv_path, env, force_recreate)
+
+
+def _create_venv(sandbox_dir_path: str, venv_path: str, env: Dict[str, str], force_recreate: bool):
     # If venv exists and force_recreate is True, delete it
     if force_recreate and os.path.isdir(venv_path):
         logger.warning(f"Force recreating virtual environment at: {venv_path}")
-        import shutil
-
         shutil.rmtree(venv_path)
 
     # Create venv if it does not exist
@@ -172,6 +245,16 @@ def create_venv_for_local_sandbox(sandbox_dir_path: str, venv_path: str, env: Di
         logger.info(f"Creating new virtual environment at {venv_path}")
         venv.create(venv_path, with_pip=True)
 
+    # Skip the pip round-trips entirely if this venv was already set up from the same requirements.txt
+    requirements_txt_path = os.path.join(sandbox_dir_path, "requirements.txt")
+    requirements_hash = _hash_requirements_file(requirements_txt_path)
+    requirements_hash_path = os.path.join(venv_path, VENV_REQUIREMENTS_HASH_FILE)
+    if os.path.isfile(requirements_hash_path):
+        with open(requirements_hash_path, "r") as f:
+            if f.read().strip() == requirements_hash:
+                logger.info(f"Virtual environment at {venv_path} is up to date with {requirements_txt_path}, skipping setup.")
+                return
+
     pip_path = os.path.join(venv_path, "bin", "pip")
     try:
         # Step 2: Upgrade pip
@@ -179,7 +262,6 @@ def create_venv_for_local_sandbox(sandbox_dir_path: str, venv_path: str, env: Di
         subprocess.run([pip_path, "install", "--upgrade", "pip"], env=env, check=True)
 
         # Step 3: Install packages from requirements.txt if available
-        requirements_txt_path = os.path.join(sandbox_dir_path, "requirements.txt")
         if os.path.isfile(requirements_txt_path):
             logger.info(f"Installing packages from requirements file: {requirements_txt_path}")
             subprocess.run([pip_path, "install", "-r", requirements_txt_path], env=env, check=True)
@@ -191,6 +273,18 @@ def create_venv_for_local_sandbox(sandbox_dir_path: str, venv_path: str, env: Di
         logger.error(f"Error while setting up the virtual environment: {e}")
         raise RuntimeError(f"Failed to set up the virtual environment: {e}")
 
+    with open(requirements_hash_path, "w") as f:
+        f.write(requirements_hash)
+
+
+def _hash_requirements_file(requirements_txt_path: str) -> str:
+    """Returns the sha256 of the requirements file, or of the empty string if there isn't one."""
+    digest = hashlib.sha256()
+    if os.path.isfile(requirements_txt_path):
+        with open(requirements_txt_path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
 
 def add_imports_and_pydantic_schemas_for_args(args_json_schema: dict) -> str:
     data_model_types = get_data_model_types(DataModelType.PydanticV2BaseModel, target_python_version=PythonVersion.PY_311)
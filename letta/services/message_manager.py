@@ -1,9 +1,12 @@
 import json
 import uuid
-from typing import List, Optional, Sequence
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
 
-from sqlalchemy import delete, exists, func, select, text
+from sqlalchemy import Select, String, Text, Update, cast, delete, exists, func, literal_column, select, text, update
+from sqlalchemy.orm import lazyload
 
+from letta.helpers.ttl_cache import TTLCache
 from letta.log import get_logger
 from letta.orm.agent import Agent as AgentModel
 from letta.orm.errors import NoResultFound
@@ -11,16 +14,30 @@ from letta.orm.message import Message as MessageModel
 from letta.otel.tracing import trace_method
 from letta.schemas.enums import MessageRole
 from letta.schemas.letta_message import LettaMessageUpdateUnion
-from letta.schemas.letta_message_content import ImageSourceType, LettaImage, MessageContentType
+from letta.schemas.letta_message_content import ImageSourceType, LettaImage, MessageContentType, TextContent
 from letta.schemas.message import Message as PydanticMessage
 from letta.schemas.message import MessageUpdate
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
 from letta.services.file_manager import FileManager
+from letta.settings import settings
 from letta.utils import enforce_types
 
 logger = get_logger(__name__)
 
+# Upper bound on the number of ids bound into a single IN (...) clause
+MAX_IDS_PER_QUERY = 1000
+
+# Short-lived cache for get_message_by_id, keyed by (message_id, organization_id). Shared by all
+# MessageManager instances in the process and invalidated by this manager's update/delete paths;
+# the TTL bounds staleness from writes made elsewhere (e.g. other server processes).
+_message_cache: TTLCache[PydanticMessage] = TTLCache(maxsize=10_000, ttl=5.0)
+
+
+def invalidate_message_cache() -> None:
+    """Drop every cached message. For writes to messages made outside MessageManager, e.g. bulk or cascading deletes."""
+    _message_cache.clear()
+
 
 class MessageManager:
     """Manager class to handle business logic related to Messages."""
@@ -29,58 +46,78 @@ class MessageManager:
         """Initialize the MessageManager."""
         self.file_manager = FileManager()
 
-    @enforce_types
     @trace_method
     def get_message_by_id(self, message_id: str, actor: PydanticUser) -> Optional[PydanticMessage]:
         """Fetch a message by ID."""
+        cache_key = (message_id, actor.organization_id)
+        cached = _message_cache.get(cache_key)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
         with db_registry.session() as session:
             try:
                 message = MessageModel.read(db_session=session, identifier=message_id, actor=actor)
-                return message.to_pydantic()
             except NoResultFound:
                 return None
+            pydantic_message = message.to_pydantic()
+        _message_cache.set(cache_key, pydantic_message.model_copy(deep=True))
+        return pydantic_message
 
-    @enforce_types
     @trace_method
     async def get_message_by_id_async(self, message_id: str, actor: PydanticUser) -> Optional[PydanticMessage]:
         """Fetch a message by ID."""
+        cache_key = (message_id, actor.organization_id)
+        cached = _message_cache.get(cache_key)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
         async with db_registry.async_session() as session:
             try:
                 message = await MessageModel.read_async(db_session=session, identifier=message_id, actor=actor)
-                return message.to_pydantic()
             except NoResultFound:
                 return None
+            pydantic_message = message.to_pydantic()
+        _message_cache.set(cache_key, pydantic_message.model_copy(deep=True))
+        return pydantic_message
 
     @enforce_types
     @trace_method
     def get_messages_by_ids(self, message_ids: List[str], actor: PydanticUser) -> List[PydanticMessage]:
         """Fetch messages by ID and return them in the requested order."""
+        unique_ids = list(dict.fromkeys(message_ids))
+        messages_by_id = {}
         with db_registry.session() as session:
-            results = MessageModel.read_multiple(db_session=session, identifiers=message_ids, actor=actor)
-        return self._get_messages_by_id_postprocess(results, message_ids)
+            for i in range(0, len(unique_ids), MAX_IDS_PER_QUERY):
+                results = MessageModel.read_multiple(db_session=session, identifiers=unique_ids[i : i + MAX_IDS_PER_QUERY], actor=actor)
+                messages_by_id.update((msg.id, msg.to_pydantic_fast()) for msg in results)
+        return self._get_messages_by_id_postprocess(messages_by_id, message_ids, unique_ids)
 
     @enforce_types
     @trace_method
     async def get_messages_by_ids_async(self, message_ids: List[str], actor: PydanticUser) -> List[PydanticMessage]:
         """Fetch messages by ID and return them in the requested order. Async version of above function."""
+        unique_ids = list(dict.fromkeys(message_ids))
+        messages_by_id = {}
         async with db_registry.async_session() as session:
-            results = await MessageModel.read_multiple_async(db_session=session, identifiers=message_ids, actor=actor)
-            return self._get_messages_by_id_postprocess(results, message_ids)
+            for i in range(0, len(unique_ids), MAX_IDS_PER_QUERY):
+                results = await MessageModel.read_multiple_async(
+                    db_session=session, identifiers=unique_ids[i : i + MAX_IDS_PER_QUERY], actor=actor
+                )
+                messages_by_id.update((msg.id, msg.to_pydantic_fast()) for msg in results)
+        return self._get_messages_by_id_postprocess(messages_by_id, message_ids, unique_ids)
 
     def _get_messages_by_id_postprocess(
         self,
-        results: List[MessageModel],
+        messages_by_id: Dict[str, PydanticMessage],
         message_ids: List[str],
+        unique_ids: List[str],
     ) -> List[PydanticMessage]:
-        if len(results) != len(message_ids):
-            logger.warning(
-                f"Expected {len(message_ids)} messages, but found {len(results)}. Missing ids={set(message_ids) - set([r.id for r in results])}"
-            )
+        if len(messages_by_id) != len(unique_ids):
+            missing_ids = set(unique_ids) - messages_by_id.keys()
+            logger.warning(f"Expected {len(unique_ids)} messages, but found {len(messages_by_id)}. Missing ids={missing_ids}")
         # Sort results directly based on message_ids
-        result_dict = {msg.id: msg.to_pydantic() for msg in results}
-        return list(filter(lambda x: x is not None, [result_dict.get(msg_id, None) for msg_id in message_ids]))
+        return [messages_by_id[msg_id] for msg_id in message_ids if msg_id in messages_by_id]
 
-    @enforce_types
     @trace_method
     def create_message(self, pydantic_msg: PydanticMessage, actor: PydanticUser) -> PydanticMessage:
         """Create a new message."""
@@ -98,7 +135,12 @@ class MessageManager:
         for pydantic_msg in pydantic_msgs:
             # Set the organization id of the Pydantic message
             pydantic_msg.organization_id = actor.organization_id
-            msg_data = pydantic_msg.model_dump(to_orm=True)
+            # Read the fields directly instead of a full model_dump: the tool_calls/tool_returns columns
+            # serialize their pydantic models on bind, so dumping them to dicts here is wasted work on bulk inserts.
+            # Content is still dumped, since its column only accepts letta-sourced images as models.
+            msg_data = {field: getattr(pydantic_msg, field) for field in PydanticMessage.model_fields}
+            if msg_data["content"]:
+                msg_data["content"] = [content.model_dump() for content in msg_data["content"]]
             orm_messages.append(MessageModel(**msg_data))
         return orm_messages
 
@@ -177,45 +219,30 @@ class MessageManager:
         Updated the underlying messages table giving an update specified to the user-facing LettaMessage
         """
         message = self.get_message_by_id(message_id=message_id, actor=actor)
-        if letta_message_update.message_type == "assistant_message":
-            # modify the tool call for send_message
-            # TODO: fix this if we add parallel tool calls
-            # TODO: note this only works if the AssistantMessage is generated by the standard send_message
-            assert (
-                message.tool_calls[0].function.name == "send_message"
-            ), f"Expected the first tool call to be send_message, but got {message.tool_calls[0].function.name}"
-            original_args = json.loads(message.tool_calls[0].function.arguments)
-            original_args["message"] = letta_message_update.content  # override the assistant message
-            update_tool_call = message.tool_calls[0].__deepcopy__()
-            update_tool_call.function.arguments = json.dumps(original_args)
-
-            update_message = MessageUpdate(tool_calls=[update_tool_call])
-        elif letta_message_update.message_type == "reasoning_message":
-            update_message = MessageUpdate(content=letta_message_update.reasoning)
-        elif letta_message_update.message_type == "user_message" or letta_message_update.message_type == "system_message":
-            update_message = MessageUpdate(content=letta_message_update.content)
-        else:
-            raise ValueError(f"Unsupported message type for modification: {letta_message_update.message_type}")
-
+        update_message = self._letta_message_update_to_message_update(message, letta_message_update)
         message = self.update_message_by_id(message_id=message_id, message_update=update_message, actor=actor)
-
-        # convert back to LettaMessage
-        for letta_msg in message.to_letta_messages(use_assistant_message=True):
-            if letta_msg.message_type == letta_message_update.message_type:
-                return letta_msg
-
-        # raise error if message type got modified
-        raise ValueError(f"Message type got modified: {letta_message_update.message_type}")
+        return self._message_to_updated_letta_message(message, letta_message_update)
 
     @enforce_types
     @trace_method
-    def update_message_by_letta_message(
+    async def update_message_by_letta_message_async(
         self, message_id: str, letta_message_update: LettaMessageUpdateUnion, actor: PydanticUser
     ) -> PydanticMessage:
         """
         Updated the underlying messages table giving an update specified to the user-facing LettaMessage
+        Async version of the function above.
+        """
+        message = await self.get_message_by_id_async(message_id=message_id, actor=actor)
+        update_message = self._letta_message_update_to_message_update(message, letta_message_update)
+        message = await self.update_message_by_id_async(message_id=message_id, message_update=update_message, actor=actor)
+        return self._message_to_updated_letta_message(message, letta_message_update)
+
+    def _letta_message_update_to_message_update(
+        self, message: PydanticMessage, letta_message_update: LettaMessageUpdateUnion
+    ) -> MessageUpdate:
+        """
+        Translates an update to the user-facing LettaMessage into an update on the underlying message.
         """
-        message = self.get_message_by_id(message_id=message_id, actor=actor)
         if letta_message_update.message_type == "assistant_message":
             # modify the tool call for send_message
             # TODO: fix this if we add parallel tool calls
@@ -228,16 +255,15 @@ class MessageManager:
             update_tool_call = message.tool_calls[0].__deepcopy__()
             update_tool_call.function.arguments = json.dumps(original_args)
 
-            update_message = MessageUpdate(tool_calls=[update_tool_call])
+            return MessageUpdate(tool_calls=[update_tool_call])
         elif letta_message_update.message_type == "reasoning_message":
-            update_message = MessageUpdate(content=letta_message_update.reasoning)
+            return MessageUpdate(content=letta_message_update.reasoning)
         elif letta_message_update.message_type == "user_message" or letta_message_update.message_type == "system_message":
-            update_message = MessageUpdate(content=letta_message_update.content)
+            return MessageUpdate(content=letta_message_update.content)
         else:
             raise ValueError(f"Unsupported message type for modification: {letta_message_update.message_type}")
 
-        message = self.update_message_by_id(message_id=message_id, message_update=update_message, actor=actor)
-
+    def _message_to_updated_letta_message(self, message: PydanticMessage, letta_message_update: LettaMessageUpdateUnion):
         # convert back to LettaMessage
         for letta_msg in message.to_letta_messages(use_assistant_message=True):
             if letta_msg.message_type == letta_message_update.message_type:
@@ -246,25 +272,26 @@ class MessageManager:
         # raise error if message type got modified
         raise ValueError(f"Message type got modified: {letta_message_update.message_type}")
 
-    @enforce_types
     @trace_method
     def update_message_by_id(self, message_id: str, message_update: MessageUpdate, actor: PydanticUser) -> PydanticMessage:
         """
         Updates an existing record in the database with values from the provided record object.
         """
         with db_registry.session() as session:
-            # Fetch existing message from database
-            message = MessageModel.read(
-                db_session=session,
-                identifier=message_id,
-                actor=actor,
-            )
-
-            message = self._update_message_by_id_impl(message_id, message_update, actor, message)
-            message.update(db_session=session, actor=actor)
-            return message.to_pydantic()
+            # Only look up the role if the update needs it for validation
+            if message_update.tool_calls or message_update.tool_call_id:
+                role = session.execute(self._message_role_query(message_id, actor)).scalar_one_or_none()
+                self._check_message_update_role(message_id, message_update, role)
+
+            message = session.execute(self._update_message_by_id_stmt(message_id, message_update, actor)).scalar_one_or_none()
+            if message is None:
+                raise NoResultFound(f"Message with id {message_id} not found.")
+            # Convert before committing, which would otherwise expire the returned row
+            pydantic_message = message.to_pydantic()
+            session.commit()
+            _message_cache.pop((message_id, actor.organization_id))
+            return pydantic_message
 
-    @enforce_types
     @trace_method
     async def update_message_by_id_async(self, message_id: str, message_update: MessageUpdate, actor: PydanticUser) -> PydanticMessage:
         """
@@ -272,41 +299,71 @@ class MessageManager:
         Async version of the function above.
         """
         async with db_registry.async_session() as session:
-            # Fetch existing message from database
-            message = await MessageModel.read_async(
-                db_session=session,
-                identifier=message_id,
-                actor=actor,
-            )
+            # Only look up the role if the update needs it for validation
+            if message_update.tool_calls or message_update.tool_call_id:
+                role = (await session.execute(self._message_role_query(message_id, actor))).scalar_one_or_none()
+                self._check_message_update_role(message_id, message_update, role)
+
+            message = (await session.execute(self._update_message_by_id_stmt(message_id, message_update, actor))).scalar_one_or_none()
+            if message is None:
+                raise NoResultFound(f"Message with id {message_id} not found.")
+            # Convert before committing, which would otherwise expire the returned row
+            pydantic_message = message.to_pydantic()
+            await session.commit()
+            _message_cache.pop((message_id, actor.organization_id))
+            return pydantic_message
 
-            message = self._update_message_by_id_impl(message_id, message_update, actor, message)
-            await message.update_async(db_session=session, actor=actor)
-            return message.to_pydantic()
+    def _message_role_query(self, message_id: str, actor: PydanticUser) -> Select:
+        query = select(MessageModel.role).where(MessageModel.id == message_id)
+        return MessageModel.apply_access_predicate(query, actor, ["write"])
 
-    def _update_message_by_id_impl(
-        self, message_id: str, message_update: MessageUpdate, actor: PydanticUser, message: MessageModel
-    ) -> MessageModel:
+    def _check_message_update_role(self, message_id: str, message_update: MessageUpdate, role: Optional[str]) -> None:
         """
-        Modifies the existing message object to update the database in the sync/async functions.
+        Some safety checks specific to messages, validating the update against the role of the existing message.
         """
-        # Some safety checks specific to messages
-        if message_update.tool_calls and message.role != MessageRole.assistant:
+        if role is None:
+            raise NoResultFound(f"Message with id {message_id} not found.")
+        if message_update.tool_calls and role != MessageRole.assistant:
             raise ValueError(
-                f"Tool calls {message_update.tool_calls} can only be added to assistant messages. Message {message_id} has role {message.role}."
+                f"Tool calls {message_update.tool_calls} can only be added to assistant messages. Message {message_id} has role {role}."
             )
-        if message_update.tool_call_id and message.role != MessageRole.tool:
+        if message_update.tool_call_id and role != MessageRole.tool:
             raise ValueError(
-                f"Tool call IDs {message_update.tool_call_id} can only be added to tool messages. Message {message_id} has role {message.role}."
+                f"Tool call IDs {message_update.tool_call_id} can only be added to tool messages. Message {message_id} has role {role}."
             )
 
-        # get update dictionary
-        update_data = message_update.model_dump(to_orm=True, exclude_unset=True, exclude_none=True)
-        # Remove redundant update fields
-        update_data = {key: value for key, value in update_data.items() if getattr(message, key) != value}
-
-        for key, value in update_data.items():
-            setattr(message, key, value)
-        return message
+    def _update_message_by_id_stmt(self, message_id: str, message_update: MessageUpdate, actor: PydanticUser) -> Update:
+        """
+        Builds a single UPDATE ... RETURNING for the message, so the update and the read-back share one round-trip.
+        """
+        # Pull the explicitly set fields straight off the model rather than paying for a full model_dump;
+        # the tool_calls column serializes its models itself
+        update_data = {}
+        for key in message_update.model_fields_set:
+            value = getattr(message_update, key)
+            if value is not None:
+                update_data[key] = value
+        if isinstance(update_data.get("content"), str):
+            update_data["content"] = [TextContent(text=update_data["content"])]
+        if update_data.get("content"):
+            # Dumped like on the create path, since the content column only accepts letta-sourced images as models
+            update_data["content"] = [content.model_dump() for content in update_data["content"]]
+
+        stmt = (
+            update(MessageModel)
+            .where(MessageModel.id == message_id, MessageModel.organization_id == actor.organization_id)
+            .values(
+                **update_data,
+                _created_by_id=func.coalesce(MessageModel._created_by_id, actor.id),
+                _last_updated_by_id=actor.id,
+                updated_at=datetime.now(timezone.utc),
+            )
+            .returning(MessageModel)
+            # Relationships aren't needed to build the pydantic message
+            .options(lazyload("*"))
+            .execution_options(synchronize_session=False)
+        )
+        return stmt
 
     @enforce_types
     @trace_method
@@ -320,6 +377,23 @@ class MessageManager:
                     actor=actor,
                 )
                 msg.hard_delete(session, actor=actor)
+                _message_cache.pop((message_id, actor.organization_id))
+            except NoResultFound:
+                raise ValueError(f"Message with id {message_id} not found.")
+
+    @enforce_types
+    @trace_method
+    async def delete_message_by_id_async(self, message_id: str, actor: PydanticUser) -> bool:
+        """Delete a message."""
+        async with db_registry.async_session() as session:
+            try:
+                msg = await MessageModel.read_async(
+                    db_session=session,
+                    identifier=message_id,
+                    actor=actor,
+                )
+                await msg.hard_delete_async(session, actor=actor)
+                _message_cache.pop((message_id, actor.organization_id))
             except NoResultFound:
                 raise ValueError(f"Message with id {message_id} not found.")
 
@@ -390,6 +464,7 @@ class MessageManager:
         query_text: Optional[str] = None,
         limit: Optional[int] = 50,
         ascending: bool = True,
+        offset: Optional[int] = None,
     ) -> List[PydanticMessage]:
         return await self.list_messages_for_agent_async(
             agent_id=agent_id,
@@ -400,9 +475,54 @@ class MessageManager:
             roles=[MessageRole.user],
             limit=limit,
             ascending=ascending,
+            offset=offset,
         )
 
     @enforce_types
+    @trace_method
+    async def list_user_message_texts_for_agent_async(
+        self,
+        agent_id: str,
+        actor: PydanticUser,
+        query_text: Optional[str] = None,
+        limit: Optional[int] = 50,
+        offset: Optional[int] = None,
+    ) -> List[Optional[str]]:
+        """
+        Same filtering and order as list_user_messages_for_agent_async, but only returns the text of each
+        message's first content part, extracted in SQL so that no Message rows are loaded or hydrated.
+
+        Raises:
+            NoResultFound: If the agent doesn't exist or isn't accessible to the actor.
+        """
+        query = self._list_messages_for_agent_query(
+            agent_id=agent_id,
+            actor=actor,
+            after=None,
+            before=None,
+            query_text=query_text,
+            roles=[MessageRole.user],
+            limit=limit,
+            ascending=True,
+            group_id=None,
+            offset=offset,
+        )
+        if settings.letta_pg_uri_no_default:
+            first_part_text = MessageModel.content.op("->")(literal_column("0")).op("->>", return_type=String)(literal_column("'text'"))
+        else:
+            # SQLite only has the -> / ->> operators from 3.38 on, while json_extract is available on every version
+            first_part_text = func.json_extract(MessageModel.content, "$[0].text", type_=String)
+        # older rows only have the `text` column
+        query = query.with_only_columns(func.coalesce(first_part_text, MessageModel.text))
+        async with db_registry.async_session() as session:
+            result = await session.execute(query)
+            texts = list(result.scalars())
+            if not texts:
+                # Like list_messages_for_agent_async, only check the agent when the page is empty, so that
+                # an unknown or inaccessible agent raises NoResultFound instead of returning an empty page
+                await AgentModel.read_async(db_session=session, identifier=agent_id, actor=actor)
+            return texts
+
     @trace_method
     def list_messages_for_agent(
         self,
@@ -442,64 +562,30 @@ class MessageManager:
             NoResultFound: If the provided after/before message IDs do not exist.
         """
 
+        query = self._list_messages_for_agent_query(
+            agent_id=agent_id,
+            actor=actor,
+            after=after,
+            before=before,
+            query_text=query_text,
+            roles=roles,
+            limit=limit,
+            ascending=ascending,
+            group_id=group_id,
+        )
         with db_registry.session() as session:
-            # Permission check: raise if the agent doesn't exist or actor is not allowed.
-            AgentModel.read(db_session=session, identifier=agent_id, actor=actor)
-
-            # Build a query that directly filters the Message table by agent_id.
-            query = session.query(MessageModel).filter(MessageModel.agent_id == agent_id)
-
-            # If group_id is provided, filter messages by group_id.
-            if group_id:
-                query = query.filter(MessageModel.group_id == group_id)
-
-            # If query_text is provided, filter messages using subquery + json_array_elements.
-            if query_text:
-                content_element = func.json_array_elements(MessageModel.content).alias("content_element")
-                query = query.filter(
-                    exists(
-                        select(1)
-                        .select_from(content_element)
-                        .where(text("content_element->>'type' = 'text' AND content_element->>'text' ILIKE :query_text"))
-                        .params(query_text=f"%{query_text}%")
-                    )
-                )
+            # Convert rows as they are fetched instead of materializing the ORM result list first
+            messages = [msg.to_pydantic_fast() for msg in session.execute(query).scalars()]
+            if not messages:
+                # Only pay for the agent/cursor lookups when there is nothing to return, so that
+                # a missing agent or cursor still raises NoResultFound instead of an empty page.
+                AgentModel.read(db_session=session, identifier=agent_id, actor=actor)
+                cursor_ids = [message_id for message_id in (after, before) if message_id]
+                if cursor_ids:
+                    found_ids = set(session.execute(self._existing_message_ids_query(cursor_ids)).scalars())
+                    self._check_cursors_exist(agent_id, cursor_ids, found_ids)
+            return messages
 
-            # If role(s) are provided, filter messages by those roles.
-            if roles:
-                role_values = [r.value for r in roles]
-                query = query.filter(MessageModel.role.in_(role_values))
-
-            # Apply 'after' pagination if specified.
-            if after:
-                after_ref = session.query(MessageModel.sequence_id).filter(MessageModel.id == after).one_or_none()
-                if not after_ref:
-                    raise NoResultFound(f"No message found with id '{after}' for agent '{agent_id}'.")
-                # Filter out any messages with a sequence_id <= after_ref.sequence_id
-                query = query.filter(MessageModel.sequence_id > after_ref.sequence_id)
-
-            # Apply 'before' pagination if specified.
-            if before:
-                before_ref = session.query(MessageModel.sequence_id).filter(MessageModel.id == before).one_or_none()
-                if not before_ref:
-                    raise NoResultFound(f"No message found with id '{before}' for agent '{agent_id}'.")
-                # Filter out any messages with a sequence_id >= before_ref.sequence_id
-                query = query.filter(MessageModel.sequence_id < before_ref.sequence_id)
-
-            # Apply ordering based on the ascending flag.
-            if ascending:
-                query = query.order_by(MessageModel.sequence_id.asc())
-            else:
-                query = query.order_by(MessageModel.sequence_id.desc())
-
-            # Limit the number of results.
-            query = query.limit(limit)
-
-            # Execute and convert each Message to its Pydantic representation.
-            results = query.all()
-            return [msg.to_pydantic() for msg in results]
-
-    @enforce_types
     @trace_method
     async def list_messages_for_agent_async(
         self,
@@ -512,6 +598,7 @@ class MessageManager:
         limit: Optional[int] = 50,
         ascending: bool = True,
         group_id: Optional[str] = None,
+        offset: Optional[int] = None,
     ) -> List[PydanticMessage]:
         """
         Most performant query to list messages for an agent by directly querying the Message table.
@@ -531,6 +618,7 @@ class MessageManager:
             limit: Maximum number of messages to return.
             ascending: If True, sort by sequence_id ascending; if False, sort descending.
             group_id: Optional group ID to filter messages by group_id.
+            offset: Optional number of matching messages to skip before the page starts.
 
         Returns:
             List[PydanticMessage]: A list of messages (converted via .to_pydantic()).
@@ -539,67 +627,109 @@ class MessageManager:
             NoResultFound: If the provided after/before message IDs do not exist.
         """
 
+        query = self._list_messages_for_agent_query(
+            agent_id=agent_id,
+            actor=actor,
+            after=after,
+            before=before,
+            query_text=query_text,
+            roles=roles,
+            limit=limit,
+            ascending=ascending,
+            group_id=group_id,
+            offset=offset,
+        )
         async with db_registry.async_session() as session:
-            # Permission check: raise if the agent doesn't exist or actor is not allowed.
-            await AgentModel.read_async(db_session=session, identifier=agent_id, actor=actor)
-
-            # Build a query that directly filters the Message table by agent_id.
-            query = select(MessageModel).where(MessageModel.agent_id == agent_id)
-
-            # If group_id is provided, filter messages by group_id.
-            if group_id:
-                query = query.where(MessageModel.group_id == group_id)
-
-            # If query_text is provided, filter messages using subquery + json_array_elements.
-            if query_text:
-                content_element = func.json_array_elements(MessageModel.content).alias("content_element")
-                query = query.where(
-                    exists(
-                        select(1)
-                        .select_from(content_element)
-                        .where(text("content_element->>'type' = 'text' AND content_element->>'text' ILIKE :query_text"))
-                        .params(query_text=f"%{query_text}%")
-                    )
+            # Convert rows as they are fetched instead of materializing the ORM result list first
+            result = await session.execute(query)
+            messages = [msg.to_pydantic_fast() for msg in result.scalars()]
+            if not messages:
+                # Only pay for the agent/cursor lookups when there is nothing to return, so that
+                # a missing agent or cursor still raises NoResultFound instead of an empty page.
+                await AgentModel.read_async(db_session=session, identifier=agent_id, actor=actor)
+                cursor_ids = [message_id for message_id in (after, before) if message_id]
+                if cursor_ids:
+                    found_ids = set((await session.execute(self._existing_message_ids_query(cursor_ids))).scalars())
+                    self._check_cursors_exist(agent_id, cursor_ids, found_ids)
+            return messages
+
+    def _existing_message_ids_query(self, message_ids: List[str]) -> Select:
+        # Resolve all pagination cursors in one round-trip
+        return select(MessageModel.id).where(MessageModel.id.in_(message_ids))
+
+    def _check_cursors_exist(self, agent_id: str, cursor_ids: List[str], found_ids: set) -> None:
+        for message_id in cursor_ids:
+            if message_id not in found_ids:
+                raise NoResultFound(f"No message found with id '{message_id}' for agent '{agent_id}'.")
+
+    def _list_messages_for_agent_query(
+        self,
+        agent_id: str,
+        actor: PydanticUser,
+        after: Optional[str],
+        before: Optional[str],
+        query_text: Optional[str],
+        roles: Optional[Sequence[MessageRole]],
+        limit: Optional[int],
+        ascending: bool,
+        group_id: Optional[str],
+        offset: Optional[int] = None,
+    ) -> Select:
+        """Build the single SELECT backing list_messages_for_agent(_async).
+
+        The actor's organization scoping and the after/before cursors are inlined (the cursors as
+        scalar subqueries on sequence_id), so listing a page costs one round-trip.
+        """
+        # Directly filter the Message table by agent_id, scoped to the actor's organization.
+        query = select(MessageModel).where(MessageModel.agent_id == agent_id)
+        query = MessageModel.apply_access_predicate(query, actor, ["read"])
+
+        # If group_id is provided, filter messages by group_id.
+        if group_id:
+            query = query.where(MessageModel.group_id == group_id)
+
+        # If query_text is provided, filter messages using subquery + json_array_elements.
+        if query_text:
+            # On Postgres, first narrow down candidates with a plain ILIKE over the serialized content, which the
+            # ix_messages_content_trgm GIN index can answer. This is only exact when query_text survives JSON
+            # serialization unescaped (e.g. no quotes or non-ASCII characters); otherwise rely on the subquery alone.
+            if settings.letta_pg_uri_no_default and json.dumps(query_text)[1:-1] == query_text:
+                query = query.where(cast(MessageModel.content, Text).ilike(f"%{query_text}%"))
+            content_element = func.json_array_elements(MessageModel.content).alias("content_element")
+            query = query.where(
+                exists(
+                    select(1)
+                    .select_from(content_element)
+                    .where(text("content_element->>'type' = 'text' AND content_element->>'text' ILIKE :query_text"))
+                    .params(query_text=f"%{query_text}%")
                 )
+            )
 
-            # If role(s) are provided, filter messages by those roles.
-            if roles:
-                role_values = [r.value for r in roles]
-                query = query.where(MessageModel.role.in_(role_values))
-
-            # Apply 'after' pagination if specified.
-            if after:
-                after_query = select(MessageModel.sequence_id).where(MessageModel.id == after)
-                after_result = await session.execute(after_query)
-                after_ref = after_result.one_or_none()
-                if not after_ref:
-                    raise NoResultFound(f"No message found with id '{after}' for agent '{agent_id}'.")
-                # Filter out any messages with a sequence_id <= after_ref.sequence_id
-                query = query.where(MessageModel.sequence_id > after_ref.sequence_id)
-
-            # Apply 'before' pagination if specified.
-            if before:
-                before_query = select(MessageModel.sequence_id).where(MessageModel.id == before)
-                before_result = await session.execute(before_query)
-                before_ref = before_result.one_or_none()
-                if not before_ref:
-                    raise NoResultFound(f"No message found with id '{before}' for agent '{agent_id}'.")
-                # Filter out any messages with a sequence_id >= before_ref.sequence_id
-                query = query.where(MessageModel.sequence_id < before_ref.sequence_id)
-
-            # Apply ordering based on the ascending flag.
-            if ascending:
-                query = query.order_by(MessageModel.sequence_id.asc())
-            else:
-                query = query.order_by(MessageModel.sequence_id.desc())
-
-            # Limit the number of results.
-            query = query.limit(limit)
-
-            # Execute and convert each Message to its Pydantic representation.
-            result = await session.execute(query)
-            results = result.scalars().all()
-            return [msg.to_pydantic() for msg in results]
+        # If role(s) are provided, filter messages by those roles.
+        if roles:
+            role_values = [r.value for r in roles]
+            query = query.where(MessageModel.role.in_(role_values))
+
+        # Apply 'after' pagination if specified: only messages with a sequence_id > the cursor's.
+        if after:
+            after_seq = select(MessageModel.sequence_id).where(MessageModel.id == after).scalar_subquery()
+            query = query.where(MessageModel.sequence_id > after_seq)
+
+        # Apply 'before' pagination if specified: only messages with a sequence_id < the cursor's.
+        if before:
+            before_seq = select(MessageModel.sequence_id).where(MessageModel.id == before).scalar_subquery()
+            query = query.where(MessageModel.sequence_id < before_seq)
+
+        # Apply ordering based on the ascending flag.
+        if ascending:
+            query = query.order_by(MessageModel.sequence_id.asc())
+        else:
+            query = query.order_by(MessageModel.sequence_id.desc())
+
+        # Limit the number of results, skipping `offset` matches first when paging.
+        if offset:
+            query = query.offset(offset)
+        return query.limit(limit)
 
     @enforce_types
     @trace_method
@@ -626,6 +756,8 @@ class MessageManager:
 
             # 4) commit once
             await session.commit()
+            # the deleted ids aren't known here, so drop all cached messages
+            _message_cache.clear()
 
             # 5) return the number of rows deleted
             return result.rowcount
@@ -647,6 +779,8 @@ class MessageManager:
 
             # commit once
             await session.commit()
+            for message_id in message_ids:
+                _message_cache.pop((message_id, actor.organization_id))
 
             # return the number of rows deleted
             return result.rowcount
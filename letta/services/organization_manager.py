@@ -7,6 +7,8 @@ from letta.otel.tracing import trace_method
 from letta.schemas.organization import Organization as PydanticOrganization
 from letta.schemas.organization import OrganizationUpdate
 from letta.server.db import db_registry
+from letta.services.message_manager import invalidate_message_cache
+from letta.services.user_manager import invalidate_default_user_cache
 from letta.utils import enforce_types
 
 
@@ -110,6 +112,9 @@ class OrganizationManager:
         with db_registry.session() as session:
             organization = OrganizationModel.read(db_session=session, identifier=org_id)
             organization.hard_delete(session)
+        # The organization's users and messages go with it, which may include the cached default user
+        invalidate_default_user_cache()
+        invalidate_message_cache()
 
     @enforce_types
     @trace_method
@@ -118,6 +123,9 @@ class OrganizationManager:
         async with db_registry.async_session() as session:
             organization = await OrganizationModel.read_async(db_session=session, identifier=org_id)
             await organization.hard_delete_async(session)
+        # The organization's users and messages go with it, which may include the cached default user
+        invalidate_default_user_cache()
+        invalidate_message_cache()
 
     @enforce_types
     @trace_method
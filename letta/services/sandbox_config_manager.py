@@ -1,8 +1,17 @@
-from typing import Dict, List, Optional
+import asyncio
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Update, bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import Insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
 
 from letta.constants import LETTA_TOOL_EXECUTION_DIR
+from letta.helpers.ttl_cache import TTLCache
 from letta.log import get_logger
-from letta.orm.errors import NoResultFound
+from letta.orm.errors import NoResultFound, UniqueConstraintViolationError
 from letta.orm.sandbox_config import SandboxConfig as SandboxConfigModel
 from letta.orm.sandbox_config import SandboxEnvironmentVariable as SandboxEnvVarModel
 from letta.otel.tracing import trace_method
@@ -13,17 +22,101 @@ from letta.schemas.sandbox_config import SandboxConfig as PydanticSandboxConfig
 from letta.schemas.sandbox_config import SandboxConfigCreate, SandboxConfigUpdate, SandboxType
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.settings import settings
 from letta.utils import enforce_types, printd
 
 logger = get_logger(__name__)
 
+# Default sandbox config per (organization_id, sandbox_type). It is looked up on every tool execution but
+# rarely changes, so keep it briefly in-process; update/delete drop the entry and the TTL bounds staleness
+# from writes made by other server processes.
+_default_sandbox_config_cache: TTLCache[PydanticSandboxConfig] = TTLCache(maxsize=1_000, ttl=60.0)
+
+# (key, value) pairs of each sandbox config's env vars, keyed by (sandbox_config_id, organization_id) and in
+# list_sandbox_env_vars order. Read on every tool execution; dropped by this manager's env var mutations.
+_sandbox_env_vars_cache: TTLCache[tuple[tuple[str, str], ...]] = TTLCache(maxsize=1_000, ttl=60.0)
+
+# TODO: May want to move this to environment variables v.s. persisting in database
+_DEFAULT_LOCAL_SANDBOX_CONFIG = LocalSandboxConfig(sandbox_dir=LETTA_TOOL_EXECUTION_DIR).model_dump(exclude_none=True)
+
+# Hot-path lookups, built once at import and executed with bound parameters
+_SANDBOX_CONFIG_BY_TYPE_QUERY = (
+    select(SandboxConfigModel)
+    .where(SandboxConfigModel.type == bindparam("type"), SandboxConfigModel.organization_id == bindparam("organization_id"))
+    .limit(1)
+)
+_SANDBOX_ENV_VAR_BY_KEY_QUERY = (
+    select(SandboxEnvVarModel)
+    .where(
+        SandboxEnvVarModel.key == bindparam("key"),
+        SandboxEnvVarModel.sandbox_config_id == bindparam("sandbox_config_id"),
+        SandboxEnvVarModel.organization_id == bindparam("organization_id"),
+    )
+    .limit(1)
+)
+# Projects only (key, value) so building env dicts skips ORM and pydantic hydration; ordered like list_sandbox_env_vars
+_SANDBOX_ENV_VARS_QUERY = (
+    select(SandboxEnvVarModel.sandbox_config_id, SandboxEnvVarModel.key, SandboxEnvVarModel.value)
+    .where(
+        SandboxEnvVarModel.sandbox_config_id.in_(bindparam("sandbox_config_ids", expanding=True)),
+        SandboxEnvVarModel.organization_id == bindparam("organization_id"),
+    )
+    .order_by(SandboxEnvVarModel.created_at, SandboxEnvVarModel.id)
+)
+
+# Validate a whole page of rows in one pass instead of a model_validate call per row
+_SANDBOX_CONFIG_LIST_ADAPTER = TypeAdapter(List[PydanticSandboxConfig])
+_SANDBOX_ENV_VAR_LIST_ADAPTER = TypeAdapter(List[PydanticEnvVar])
+
+_SANDBOX_CONFIG_COLUMNS = frozenset(SandboxConfigModel.__table__.columns.keys())
+_SANDBOX_ENV_VAR_COLUMNS = frozenset(SandboxEnvVarModel.__table__.columns.keys())
+
+
+def _changed_fields(current: object, update: BaseModel, columns: frozenset) -> Dict[str, Any]:
+    """
+    Returns the explicitly set, non-None fields of `update` that map to a column and differ from `current`.
+    Equivalent to diffing `update.model_dump(exclude_unset=True, exclude_none=True)`, without dumping the whole model.
+    """
+    changed = {}
+    for field in update.model_fields_set & columns:
+        value = getattr(update, field)
+        if value is None:
+            continue
+        if isinstance(value, BaseModel):
+            value = value.model_dump(exclude_unset=True, exclude_none=True)
+        if getattr(current, field) != value:
+            changed[field] = value
+    return changed
+
+
+def _warn_if_blocking_event_loop(func):
+    """In debug mode, flag sync DB methods called on an event loop thread, where they stall every other request."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if settings.debug:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+            else:
+                logger.warning(f"SandboxConfigManager.{func.__name__} blocks the running event loop; use {func.__name__}_async instead.")
+        return func(*args, **kwargs)
+
+    return wrapper
+
 
 class SandboxConfigManager:
     """Manager class to handle business logic related to SandboxConfig and SandboxEnvironmentVariable."""
 
-    @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def get_or_create_default_sandbox_config(self, sandbox_type: SandboxType, actor: PydanticUser) -> PydanticSandboxConfig:
+        cache_key = (actor.organization_id, sandbox_type)
+        cached = _default_sandbox_config_cache.get(cache_key)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
         sandbox_config = self.get_sandbox_config_by_type(sandbox_type, actor=actor)
         if not sandbox_config:
             logger.debug(f"Creating new sandbox config of type {sandbox_type}, none found for organization {actor.organization_id}.")
@@ -32,15 +125,15 @@ class SandboxConfigManager:
             if sandbox_type == SandboxType.E2B:
                 default_config = {}  # Empty
             else:
-                # TODO: May want to move this to environment variables v.s. persisting in database
-                default_local_sandbox_path = LETTA_TOOL_EXECUTION_DIR
-                default_config = LocalSandboxConfig(sandbox_dir=default_local_sandbox_path).model_dump(exclude_none=True)
+                default_config = dict(_DEFAULT_LOCAL_SANDBOX_CONFIG)
 
             sandbox_config = self.create_or_update_sandbox_config(SandboxConfigCreate(config=default_config), actor=actor)
+        _default_sandbox_config_cache.set(cache_key, sandbox_config.model_copy(deep=True))
         return sandbox_config
 
     @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def create_or_update_sandbox_config(self, sandbox_config_create: SandboxConfigCreate, actor: PydanticUser) -> PydanticSandboxConfig:
         """Create or update a sandbox configuration based on the PydanticSandboxConfig schema."""
         config = sandbox_config_create.config
@@ -49,16 +142,28 @@ class SandboxConfigManager:
             type=sandbox_type, config=config.model_dump(exclude_none=True), organization_id=actor.organization_id
         )
 
+        if settings.letta_pg_uri_no_default:
+            with db_registry.session() as session:
+                result = session.execute(self._upsert_sandbox_config_stmt(sandbox_config, actor))
+                db_sandbox = result.scalar_one().to_pydantic()
+                session.commit()
+            _default_sandbox_config_cache.pop((actor.organization_id, db_sandbox.type))
+            return db_sandbox
+
         # Attempt to retrieve the existing sandbox configuration by type within the organization
         db_sandbox = self.get_sandbox_config_by_type(sandbox_config.type, actor=actor)
         if db_sandbox:
             # Prepare the update data, excluding fields that should not be reset
-            update_data = sandbox_config.model_dump(exclude_unset=True, exclude_none=True)
-            update_data = {key: value for key, value in update_data.items() if getattr(db_sandbox, key) != value}
+            update_data = _changed_fields(db_sandbox, sandbox_config, _SANDBOX_CONFIG_COLUMNS)
 
             # If there are changes, update the sandbox configuration
             if update_data:
-                db_sandbox = self.update_sandbox_config(db_sandbox.id, SandboxConfigUpdate(**update_data), actor)
+                # The row was just read by type, so update it in place instead of re-reading it in update_sandbox_config
+                with db_registry.session() as session:
+                    result = session.execute(self._update_sandbox_config_stmt(db_sandbox.id, update_data, actor))
+                    db_sandbox = result.scalar_one().to_pydantic()
+                    session.commit()
+                _default_sandbox_config_cache.pop((actor.organization_id, db_sandbox.type))
             else:
                 printd(
                     f"`create_or_update_sandbox_config` was called with user_id={actor.id}, organization_id={actor.organization_id}, "
@@ -71,11 +176,17 @@ class SandboxConfigManager:
             with db_registry.session() as session:
                 db_sandbox = SandboxConfigModel(**sandbox_config.model_dump(exclude_none=True))
                 db_sandbox.create(session, actor=actor)
-                return db_sandbox.to_pydantic()
+                db_sandbox = db_sandbox.to_pydantic()
+            _default_sandbox_config_cache.pop((actor.organization_id, db_sandbox.type))
+            return db_sandbox
 
-    @enforce_types
     @trace_method
     async def get_or_create_default_sandbox_config_async(self, sandbox_type: SandboxType, actor: PydanticUser) -> PydanticSandboxConfig:
+        cache_key = (actor.organization_id, sandbox_type)
+        cached = _default_sandbox_config_cache.get(cache_key)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
         sandbox_config = await self.get_sandbox_config_by_type_async(sandbox_type, actor=actor)
         if not sandbox_config:
             logger.debug(f"Creating new sandbox config of type {sandbox_type}, none found for organization {actor.organization_id}.")
@@ -84,11 +195,10 @@ class SandboxConfigManager:
             if sandbox_type == SandboxType.E2B:
                 default_config = {}  # Empty
             else:
-                # TODO: May want to move this to environment variables v.s. persisting in database
-                default_local_sandbox_path = LETTA_TOOL_EXECUTION_DIR
-                default_config = LocalSandboxConfig(sandbox_dir=default_local_sandbox_path).model_dump(exclude_none=True)
+                default_config = dict(_DEFAULT_LOCAL_SANDBOX_CONFIG)
 
             sandbox_config = await self.create_or_update_sandbox_config_async(SandboxConfigCreate(config=default_config), actor=actor)
+        _default_sandbox_config_cache.set(cache_key, sandbox_config.model_copy(deep=True))
         return sandbox_config
 
     @enforce_types
@@ -103,16 +213,28 @@ class SandboxConfigManager:
             type=sandbox_type, config=config.model_dump(exclude_none=True), organization_id=actor.organization_id
         )
 
+        if settings.letta_pg_uri_no_default:
+            async with db_registry.async_session() as session:
+                result = await session.execute(self._upsert_sandbox_config_stmt(sandbox_config, actor))
+                db_sandbox = result.scalar_one().to_pydantic()
+                await session.commit()
+            _default_sandbox_config_cache.pop((actor.organization_id, db_sandbox.type))
+            return db_sandbox
+
         # Attempt to retrieve the existing sandbox configuration by type within the organization
         db_sandbox = await self.get_sandbox_config_by_type_async(sandbox_config.type, actor=actor)
         if db_sandbox:
             # Prepare the update data, excluding fields that should not be reset
-            update_data = sandbox_config.model_dump(exclude_unset=True, exclude_none=True)
-            update_data = {key: value for key, value in update_data.items() if getattr(db_sandbox, key) != value}
+            update_data = _changed_fields(db_sandbox, sandbox_config, _SANDBOX_CONFIG_COLUMNS)
 
             # If there are changes, update the sandbox configuration
             if update_data:
-                db_sandbox = await self.update_sandbox_config_async(db_sandbox.id, SandboxConfigUpdate(**update_data), actor)
+                # The row was just read by type, so update it in place instead of re-reading it in update_sandbox_config_async
+                async with db_registry.async_session() as session:
+                    result = await session.execute(self._update_sandbox_config_stmt(db_sandbox.id, update_data, actor))
+                    db_sandbox = result.scalar_one().to_pydantic()
+                    await session.commit()
+                _default_sandbox_config_cache.pop((actor.organization_id, db_sandbox.type))
             else:
                 printd(
                     f"`create_or_update_sandbox_config` was called with user_id={actor.id}, organization_id={actor.organization_id}, "
@@ -125,10 +247,62 @@ class SandboxConfigManager:
             async with db_registry.async_session() as session:
                 db_sandbox = SandboxConfigModel(**sandbox_config.model_dump(exclude_none=True))
                 await db_sandbox.create_async(session, actor=actor)
-                return db_sandbox.to_pydantic()
+                db_sandbox = db_sandbox.to_pydantic()
+            _default_sandbox_config_cache.pop((actor.organization_id, db_sandbox.type))
+            return db_sandbox
+
+    def _upsert_sandbox_config_stmt(self, sandbox_config: PydanticSandboxConfig, actor: PydanticUser) -> Insert:
+        """
+        Builds a Postgres INSERT ... ON CONFLICT DO UPDATE ... RETURNING on the (type, organization_id) unique constraint,
+        so create-or-update is one round-trip with no window between the existence check and the write.
+        """
+        stmt = pg_insert(SandboxConfigModel).values(
+            **sandbox_config.model_dump(exclude_none=True),
+            _created_by_id=actor.id,
+            _last_updated_by_id=actor.id,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uix_type_organization",
+            set_={"config": stmt.excluded.config, "_last_updated_by_id": actor.id, "updated_at": func.now()},
+        )
+        return stmt.returning(SandboxConfigModel).execution_options(populate_existing=True)
+
+    def _upsert_sandbox_env_var_stmt(self, env_var: PydanticEnvVar, actor: PydanticUser) -> Insert:
+        """
+        Builds a Postgres INSERT ... ON CONFLICT DO UPDATE ... RETURNING on the (key, sandbox_config_id) unique constraint.
+        Rows owned by another organization are left untouched and nothing is returned.
+        """
+        stmt = pg_insert(SandboxEnvVarModel).values(
+            **env_var.model_dump(to_orm=True, exclude_none=True),
+            _created_by_id=actor.id,
+            _last_updated_by_id=actor.id,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uix_key_sandbox_config",
+            set_={
+                "value": stmt.excluded.value,
+                # Like the update path, a missing description keeps the existing one
+                "description": func.coalesce(stmt.excluded.description, SandboxEnvVarModel.description),
+                "_last_updated_by_id": actor.id,
+                "updated_at": func.now(),
+            },
+            where=SandboxEnvVarModel.organization_id == actor.organization_id,
+        )
+        return stmt.returning(SandboxEnvVarModel).execution_options(populate_existing=True)
+
+    def _update_sandbox_config_stmt(self, sandbox_config_id: str, update_data: Dict[str, Any], actor: PydanticUser) -> Update:
+        """Builds an UPDATE ... RETURNING for a sandbox config row the caller has already read."""
+        return (
+            update(SandboxConfigModel)
+            .where(SandboxConfigModel.id == sandbox_config_id, SandboxConfigModel.organization_id == actor.organization_id)
+            .values(**update_data, _last_updated_by_id=actor.id, updated_at=func.now())
+            .returning(SandboxConfigModel)
+            .execution_options(synchronize_session=False)
+        )
 
     @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def update_sandbox_config(
         self, sandbox_config_id: str, sandbox_update: SandboxConfigUpdate, actor: PydanticUser
     ) -> PydanticSandboxConfig:
@@ -141,8 +315,7 @@ class SandboxConfigManager:
                     f"Mismatched type for sandbox config update: tried to update sandbox_config of type {sandbox.type} with config of type {sandbox_update.config.type}"
                 )
 
-            update_data = sandbox_update.model_dump(exclude_unset=True, exclude_none=True)
-            update_data = {key: value for key, value in update_data.items() if getattr(sandbox, key) != value}
+            update_data = _changed_fields(sandbox, sandbox_update, _SANDBOX_CONFIG_COLUMNS)
 
             if update_data:
                 for key, value in update_data.items():
@@ -153,7 +326,9 @@ class SandboxConfigManager:
                     f"`update_sandbox_config` called with user_id={actor.id}, organization_id={actor.organization_id}, "
                     f"name={sandbox.type}, but nothing to update."
                 )
-            return sandbox.to_pydantic()
+            sandbox_config = sandbox.to_pydantic()
+        _default_sandbox_config_cache.pop((actor.organization_id, sandbox_config.type))
+        return sandbox_config
 
     @enforce_types
     @trace_method
@@ -169,8 +344,7 @@ class SandboxConfigManager:
                     f"Mismatched type for sandbox config update: tried to update sandbox_config of type {sandbox.type} with config of type {sandbox_update.config.type}"
                 )
 
-            update_data = sandbox_update.model_dump(exclude_unset=True, exclude_none=True)
-            update_data = {key: value for key, value in update_data.items() if getattr(sandbox, key) != value}
+            update_data = _changed_fields(sandbox, sandbox_update, _SANDBOX_CONFIG_COLUMNS)
 
             if update_data:
                 for key, value in update_data.items():
@@ -181,16 +355,22 @@ class SandboxConfigManager:
                     f"`update_sandbox_config` called with user_id={actor.id}, organization_id={actor.organization_id}, "
                     f"name={sandbox.type}, but nothing to update."
                 )
-            return sandbox.to_pydantic()
+            sandbox_config = sandbox.to_pydantic()
+        _default_sandbox_config_cache.pop((actor.organization_id, sandbox_config.type))
+        return sandbox_config
 
     @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def delete_sandbox_config(self, sandbox_config_id: str, actor: PydanticUser) -> PydanticSandboxConfig:
         """Delete a sandbox configuration by its ID."""
         with db_registry.session() as session:
             sandbox = SandboxConfigModel.read(db_session=session, identifier=sandbox_config_id, actor=actor)
             sandbox.hard_delete(db_session=session, actor=actor)
-            return sandbox.to_pydantic()
+            sandbox_config = sandbox.to_pydantic()
+        _default_sandbox_config_cache.pop((actor.organization_id, sandbox_config.type))
+        _sandbox_env_vars_cache.pop((sandbox_config.id, actor.organization_id))
+        return sandbox_config
 
     @enforce_types
     @trace_method
@@ -199,10 +379,14 @@ class SandboxConfigManager:
         async with db_registry.async_session() as session:
             sandbox = await SandboxConfigModel.read_async(db_session=session, identifier=sandbox_config_id, actor=actor)
             await sandbox.hard_delete_async(db_session=session, actor=actor)
-            return sandbox.to_pydantic()
+            sandbox_config = sandbox.to_pydantic()
+        _default_sandbox_config_cache.pop((actor.organization_id, sandbox_config.type))
+        _sandbox_env_vars_cache.pop((sandbox_config.id, actor.organization_id))
+        return sandbox_config
 
     @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def list_sandbox_configs(
         self,
         actor: PydanticUser,
@@ -217,7 +401,7 @@ class SandboxConfigManager:
 
         with db_registry.session() as session:
             sandboxes = SandboxConfigModel.list(db_session=session, after=after, limit=limit, **kwargs)
-            return [sandbox.to_pydantic() for sandbox in sandboxes]
+            return _SANDBOX_CONFIG_LIST_ADAPTER.validate_python(sandboxes, from_attributes=True)
 
     @enforce_types
     @trace_method
@@ -235,10 +419,10 @@ class SandboxConfigManager:
 
         async with db_registry.async_session() as session:
             sandboxes = await SandboxConfigModel.list_async(db_session=session, after=after, limit=limit, **kwargs)
-            return [sandbox.to_pydantic() for sandbox in sandboxes]
+            return _SANDBOX_CONFIG_LIST_ADAPTER.validate_python(sandboxes, from_attributes=True)
 
-    @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def get_sandbox_config_by_id(self, sandbox_config_id: str, actor: Optional[PydanticUser] = None) -> Optional[PydanticSandboxConfig]:
         """Retrieve a sandbox configuration by its ID."""
         with db_registry.session() as session:
@@ -248,56 +432,66 @@ class SandboxConfigManager:
             except NoResultFound:
                 return None
 
-    @enforce_types
     @trace_method
-    def get_sandbox_config_by_type(self, type: SandboxType, actor: Optional[PydanticUser] = None) -> Optional[PydanticSandboxConfig]:
-        """Retrieve a sandbox config by its type."""
-        with db_registry.session() as session:
+    async def get_sandbox_config_by_id_async(
+        self, sandbox_config_id: str, actor: Optional[PydanticUser] = None
+    ) -> Optional[PydanticSandboxConfig]:
+        """Retrieve a sandbox configuration by its ID."""
+        async with db_registry.async_session() as session:
             try:
-                sandboxes = SandboxConfigModel.list(
-                    db_session=session,
-                    type=type,
-                    organization_id=actor.organization_id,
-                    limit=1,
-                )
-                if sandboxes:
-                    return sandboxes[0].to_pydantic()
-                return None
+                sandbox = await SandboxConfigModel.read_async(db_session=session, identifier=sandbox_config_id, actor=actor)
+                return sandbox.to_pydantic()
             except NoResultFound:
                 return None
 
-    @enforce_types
+    @trace_method
+    @_warn_if_blocking_event_loop
+    def get_sandbox_config_by_type(self, type: SandboxType, actor: Optional[PydanticUser] = None) -> Optional[PydanticSandboxConfig]:
+        """Retrieve a sandbox config by its type."""
+        with db_registry.session() as session:
+            result = session.execute(_SANDBOX_CONFIG_BY_TYPE_QUERY, {"type": type, "organization_id": actor.organization_id})
+            sandbox = result.scalar_one_or_none()
+            return sandbox.to_pydantic() if sandbox else None
+
     @trace_method
     async def get_sandbox_config_by_type_async(
         self, type: SandboxType, actor: Optional[PydanticUser] = None
     ) -> Optional[PydanticSandboxConfig]:
         """Retrieve a sandbox config by its type."""
         async with db_registry.async_session() as session:
-            try:
-                sandboxes = await SandboxConfigModel.list_async(
-                    db_session=session,
-                    type=type,
-                    organization_id=actor.organization_id,
-                    limit=1,
-                )
-                if sandboxes:
-                    return sandboxes[0].to_pydantic()
-                return None
-            except NoResultFound:
-                return None
+            result = await session.execute(_SANDBOX_CONFIG_BY_TYPE_QUERY, {"type": type, "organization_id": actor.organization_id})
+            sandbox = result.scalar_one_or_none()
+            return sandbox.to_pydantic() if sandbox else None
 
     @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def create_sandbox_env_var(
         self, env_var_create: SandboxEnvironmentVariableCreate, sandbox_config_id: str, actor: PydanticUser
     ) -> PydanticEnvVar:
         """Create a new sandbox environment variable."""
         env_var = PydanticEnvVar(**env_var_create.model_dump(), sandbox_config_id=sandbox_config_id, organization_id=actor.organization_id)
 
+        if settings.letta_pg_uri_no_default:
+            with db_registry.session() as session:
+                try:
+                    result = session.execute(self._upsert_sandbox_env_var_stmt(env_var, actor))
+                except (DBAPIError, IntegrityError) as e:
+                    SandboxEnvVarModel._handle_dbapi_error(e)
+                db_env_var = result.scalar_one_or_none()
+                if db_env_var is None:
+                    # The key already exists on a sandbox config outside the actor's organization
+                    raise UniqueConstraintViolationError(
+                        f"Environment variable {env_var.key} already exists for sandbox config {sandbox_config_id}"
+                    )
+                db_env_var = db_env_var.to_pydantic()
+                session.commit()
+            _sandbox_env_vars_cache.pop((sandbox_config_id, actor.organization_id))
+            return db_env_var
+
         db_env_var = self.get_sandbox_env_var_by_key_and_sandbox_config_id(env_var.key, env_var.sandbox_config_id, actor=actor)
         if db_env_var:
-            update_data = env_var.model_dump(exclude_unset=True, exclude_none=True)
-            update_data = {key: value for key, value in update_data.items() if getattr(db_env_var, key) != value}
+            update_data = _changed_fields(db_env_var, env_var, _SANDBOX_ENV_VAR_COLUMNS)
             # If there are changes, update the environment variable
             if update_data:
                 db_env_var = self.update_sandbox_env_var(db_env_var.id, SandboxEnvironmentVariableUpdate(**update_data), actor)
@@ -312,6 +506,7 @@ class SandboxConfigManager:
             with db_registry.session() as session:
                 env_var = SandboxEnvVarModel(**env_var.model_dump(to_orm=True, exclude_none=True))
                 env_var.create(session, actor=actor)
+            _sandbox_env_vars_cache.pop((sandbox_config_id, actor.organization_id))
             return env_var.to_pydantic()
 
     @enforce_types
@@ -322,10 +517,26 @@ class SandboxConfigManager:
         """Create a new sandbox environment variable."""
         env_var = PydanticEnvVar(**env_var_create.model_dump(), sandbox_config_id=sandbox_config_id, organization_id=actor.organization_id)
 
+        if settings.letta_pg_uri_no_default:
+            async with db_registry.async_session() as session:
+                try:
+                    result = await session.execute(self._upsert_sandbox_env_var_stmt(env_var, actor))
+                except (DBAPIError, IntegrityError) as e:
+                    SandboxEnvVarModel._handle_dbapi_error(e)
+                db_env_var = result.scalar_one_or_none()
+                if db_env_var is None:
+                    # The key already exists on a sandbox config outside the actor's organization
+                    raise UniqueConstraintViolationError(
+                        f"Environment variable {env_var.key} already exists for sandbox config {sandbox_config_id}"
+                    )
+                db_env_var = db_env_var.to_pydantic()
+                await session.commit()
+            _sandbox_env_vars_cache.pop((sandbox_config_id, actor.organization_id))
+            return db_env_var
+
         db_env_var = await self.get_sandbox_env_var_by_key_and_sandbox_config_id_async(env_var.key, env_var.sandbox_config_id, actor=actor)
         if db_env_var:
-            update_data = env_var.model_dump(exclude_unset=True, exclude_none=True)
-            update_data = {key: value for key, value in update_data.items() if getattr(db_env_var, key) != value}
+            update_data = _changed_fields(db_env_var, env_var, _SANDBOX_ENV_VAR_COLUMNS)
             # If there are changes, update the environment variable
             if update_data:
                 db_env_var = await self.update_sandbox_env_var_async(db_env_var.id, SandboxEnvironmentVariableUpdate(**update_data), actor)
@@ -340,18 +551,20 @@ class SandboxConfigManager:
             async with db_registry.async_session() as session:
                 env_var = SandboxEnvVarModel(**env_var.model_dump(to_orm=True, exclude_none=True))
                 await env_var.create_async(session, actor=actor)
-                return env_var.to_pydantic()
+                env_var = env_var.to_pydantic()
+            _sandbox_env_vars_cache.pop((sandbox_config_id, actor.organization_id))
+            return env_var
 
     @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def update_sandbox_env_var(
         self, env_var_id: str, env_var_update: SandboxEnvironmentVariableUpdate, actor: PydanticUser
     ) -> PydanticEnvVar:
         """Update an existing sandbox environment variable."""
         with db_registry.session() as session:
             env_var = SandboxEnvVarModel.read(db_session=session, identifier=env_var_id, actor=actor)
-            update_data = env_var_update.model_dump(to_orm=True, exclude_unset=True, exclude_none=True)
-            update_data = {key: value for key, value in update_data.items() if getattr(env_var, key) != value}
+            update_data = _changed_fields(env_var, env_var_update, _SANDBOX_ENV_VAR_COLUMNS)
 
             if update_data:
                 for key, value in update_data.items():
@@ -362,7 +575,9 @@ class SandboxConfigManager:
                     f"`update_sandbox_env_var` called with user_id={actor.id}, organization_id={actor.organization_id}, "
                     f"key={env_var.key}, but nothing to update."
                 )
-            return env_var.to_pydantic()
+            env_var = env_var.to_pydantic()
+        _sandbox_env_vars_cache.pop((env_var.sandbox_config_id, actor.organization_id))
+        return env_var
 
     @enforce_types
     @trace_method
@@ -372,8 +587,7 @@ class SandboxConfigManager:
         """Update an existing sandbox environment variable."""
         async with db_registry.async_session() as session:
             env_var = await SandboxEnvVarModel.read_async(db_session=session, identifier=env_var_id, actor=actor)
-            update_data = env_var_update.model_dump(to_orm=True, exclude_unset=True, exclude_none=True)
-            update_data = {key: value for key, value in update_data.items() if getattr(env_var, key) != value}
+            update_data = _changed_fields(env_var, env_var_update, _SANDBOX_ENV_VAR_COLUMNS)
 
             if update_data:
                 for key, value in update_data.items():
@@ -384,16 +598,21 @@ class SandboxConfigManager:
                     f"`update_sandbox_env_var` called with user_id={actor.id}, organization_id={actor.organization_id}, "
                     f"key={env_var.key}, but nothing to update."
                 )
-            return env_var.to_pydantic()
+            env_var = env_var.to_pydantic()
+        _sandbox_env_vars_cache.pop((env_var.sandbox_config_id, actor.organization_id))
+        return env_var
 
     @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def delete_sandbox_env_var(self, env_var_id: str, actor: PydanticUser) -> PydanticEnvVar:
         """Delete a sandbox environment variable by its ID."""
         with db_registry.session() as session:
             env_var = SandboxEnvVarModel.read(db_session=session, identifier=env_var_id, actor=actor)
             env_var.hard_delete(db_session=session, actor=actor)
-            return env_var.to_pydantic()
+            env_var = env_var.to_pydantic()
+        _sandbox_env_vars_cache.pop((env_var.sandbox_config_id, actor.organization_id))
+        return env_var
 
     @enforce_types
     @trace_method
@@ -402,10 +621,13 @@ class SandboxConfigManager:
         async with db_registry.async_session() as session:
             env_var = await SandboxEnvVarModel.read_async(db_session=session, identifier=env_var_id, actor=actor)
             await env_var.hard_delete_async(db_session=session, actor=actor)
-            return env_var.to_pydantic()
+            env_var = env_var.to_pydantic()
+        _sandbox_env_vars_cache.pop((env_var.sandbox_config_id, actor.organization_id))
+        return env_var
 
     @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def list_sandbox_env_vars(
         self,
         sandbox_config_id: str,
@@ -422,7 +644,7 @@ class SandboxConfigManager:
                 organization_id=actor.organization_id,
                 sandbox_config_id=sandbox_config_id,
             )
-            return [env_var.to_pydantic() for env_var in env_vars]
+            return _SANDBOX_ENV_VAR_LIST_ADAPTER.validate_python(env_vars, from_attributes=True)
 
     @enforce_types
     @trace_method
@@ -442,10 +664,11 @@ class SandboxConfigManager:
                 organization_id=actor.organization_id,
                 sandbox_config_id=sandbox_config_id,
             )
-            return [env_var.to_pydantic() for env_var in env_vars]
+            return _SANDBOX_ENV_VAR_LIST_ADAPTER.validate_python(env_vars, from_attributes=True)
 
     @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def list_sandbox_env_vars_by_key(
         self, key: str, actor: PydanticUser, after: Optional[str] = None, limit: Optional[int] = 50
     ) -> List[PydanticEnvVar]:
@@ -458,7 +681,7 @@ class SandboxConfigManager:
                 organization_id=actor.organization_id,
                 key=key,
             )
-            return [env_var.to_pydantic() for env_var in env_vars]
+            return _SANDBOX_ENV_VAR_LIST_ADAPTER.validate_python(env_vars, from_attributes=True)
 
     @enforce_types
     @trace_method
@@ -474,68 +697,95 @@ class SandboxConfigManager:
                 organization_id=actor.organization_id,
                 key=key,
             )
-            return [env_var.to_pydantic() for env_var in env_vars]
+            return _SANDBOX_ENV_VAR_LIST_ADAPTER.validate_python(env_vars, from_attributes=True)
 
-    @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def get_sandbox_env_vars_as_dict(
         self, sandbox_config_id: str, actor: PydanticUser, after: Optional[str] = None, limit: Optional[int] = 50
     ) -> Dict[str, str]:
-        env_vars = self.list_sandbox_env_vars(sandbox_config_id, actor, after, limit)
-        result = {}
-        for env_var in env_vars:
-            result[env_var.key] = env_var.value
-        return result
+        if after:
+            # Cursor pagination goes through the generic list path, which validates the cursor
+            env_vars = self.list_sandbox_env_vars(sandbox_config_id, actor, after, limit)
+            return {env_var.key: env_var.value for env_var in env_vars}
+
+        cache_key = (sandbox_config_id, actor.organization_id)
+        pairs = _sandbox_env_vars_cache.get(cache_key)
+        if pairs is None:
+            params = {"sandbox_config_ids": [sandbox_config_id], "organization_id": actor.organization_id}
+            with db_registry.session() as session:
+                pairs = tuple((key, value) for _, key, value in session.execute(_SANDBOX_ENV_VARS_QUERY, params))
+            _sandbox_env_vars_cache.set(cache_key, pairs)
+        return dict(pairs[:limit] if limit else pairs)
 
-    @enforce_types
     @trace_method
     async def get_sandbox_env_vars_as_dict_async(
         self, sandbox_config_id: str, actor: PydanticUser, after: Optional[str] = None, limit: Optional[int] = 50
     ) -> Dict[str, str]:
-        env_vars = await self.list_sandbox_env_vars_async(sandbox_config_id, actor, after, limit)
-        result = {}
-        for env_var in env_vars:
-            result[env_var.key] = env_var.value
-        return result
+        if after:
+            # Cursor pagination goes through the generic list path, which validates the cursor
+            env_vars = await self.list_sandbox_env_vars_async(sandbox_config_id, actor, after, limit)
+            return {env_var.key: env_var.value for env_var in env_vars}
+
+        cache_key = (sandbox_config_id, actor.organization_id)
+        pairs = _sandbox_env_vars_cache.get(cache_key)
+        if pairs is None:
+            params = {"sandbox_config_ids": [sandbox_config_id], "organization_id": actor.organization_id}
+            async with db_registry.async_session() as session:
+                result = await session.execute(_SANDBOX_ENV_VARS_QUERY, params)
+                pairs = tuple((key, value) for _, key, value in result)
+            _sandbox_env_vars_cache.set(cache_key, pairs)
+        return dict(pairs[:limit] if limit else pairs)
+
+    @trace_method
+    async def get_sandbox_env_vars_for_configs_async(self, sandbox_config_ids: List[str], actor: PydanticUser) -> Dict[str, Dict[str, str]]:
+        """
+        Batched get_sandbox_env_vars_as_dict_async: returns {sandbox_config_id: {key: value}} for every requested config,
+        fetching all cache misses with a single IN (...) query.
+        """
+        pairs_by_config = {}
+        missing_ids = []
+        for sandbox_config_id in dict.fromkeys(sandbox_config_ids):
+            pairs = _sandbox_env_vars_cache.get((sandbox_config_id, actor.organization_id))
+            if pairs is None:
+                missing_ids.append(sandbox_config_id)
+            else:
+                pairs_by_config[sandbox_config_id] = pairs
+
+        if missing_ids:
+            fetched = {sandbox_config_id: [] for sandbox_config_id in missing_ids}
+            async with db_registry.async_session() as session:
+                result = await session.execute(
+                    _SANDBOX_ENV_VARS_QUERY, {"sandbox_config_ids": missing_ids, "organization_id": actor.organization_id}
+                )
+                for sandbox_config_id, key, value in result:
+                    fetched[sandbox_config_id].append((key, value))
+
+            for sandbox_config_id, pairs in fetched.items():
+                pairs = tuple(pairs)
+                _sandbox_env_vars_cache.set((sandbox_config_id, actor.organization_id), pairs)
+                pairs_by_config[sandbox_config_id] = pairs
+
+        return {sandbox_config_id: dict(pairs) for sandbox_config_id, pairs in pairs_by_config.items()}
 
-    @enforce_types
     @trace_method
+    @_warn_if_blocking_event_loop
     def get_sandbox_env_var_by_key_and_sandbox_config_id(
         self, key: str, sandbox_config_id: str, actor: Optional[PydanticUser] = None
     ) -> Optional[PydanticEnvVar]:
         """Retrieve a sandbox environment variable by its key and sandbox_config_id."""
         with db_registry.session() as session:
-            try:
-                env_var = SandboxEnvVarModel.list(
-                    db_session=session,
-                    key=key,
-                    sandbox_config_id=sandbox_config_id,
-                    organization_id=actor.organization_id,
-                    limit=1,
-                )
-                if env_var:
-                    return env_var[0].to_pydantic()
-                return None
-            except NoResultFound:
-                return None
+            params = {"key": key, "sandbox_config_id": sandbox_config_id, "organization_id": actor.organization_id}
+            env_var = session.execute(_SANDBOX_ENV_VAR_BY_KEY_QUERY, params).scalar_one_or_none()
+            return env_var.to_pydantic() if env_var else None
 
-    @enforce_types
     @trace_method
     async def get_sandbox_env_var_by_key_and_sandbox_config_id_async(
         self, key: str, sandbox_config_id: str, actor: Optional[PydanticUser] = None
     ) -> Optional[PydanticEnvVar]:
         """Retrieve a sandbox environment variable by its key and sandbox_config_id."""
         async with db_registry.async_session() as session:
-            try:
-                env_var = await SandboxEnvVarModel.list_async(
-                    db_session=session,
-                    key=key,
-                    sandbox_config_id=sandbox_config_id,
-                    organization_id=actor.organization_id,
-                    limit=1,
-                )
-                if env_var:
-                    return env_var[0].to_pydantic()
-                return None
-            except NoResultFound:
-                return None
+            params = {"key": key, "sandbox_config_id": sandbox_config_id, "organization_id": actor.organization_id}
+            result = await session.execute(_SANDBOX_ENV_VAR_BY_KEY_QUERY, params)
+            env_var = result.scalar_one_or_none()
+            return env_var.to_pydantic() if env_var else None
@@ -1,13 +1,23 @@
+import asyncio
+import threading
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from enum import Enum
-from typing import List, Literal, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Literal, Optional, Set, Tuple, Union
 
-from sqlalchemy import select
+from sqlalchemy import Insert, Select, Update, exists, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import DBAPIError, IntegrityError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 
 from letta.helpers.singleton import singleton
-from letta.orm.errors import NoResultFound
+from letta.log import get_logger
+from letta.orm.errors import DatabaseTimeoutError, NoResultFound, UniqueConstraintViolationError
 from letta.orm.job import Job as JobModel
 from letta.orm.sqlalchemy_base import AccessType
 from letta.orm.step import Step as StepModel
@@ -16,8 +26,96 @@ from letta.schemas.openai.chat_completion_response import UsageStatistics
 from letta.schemas.step import Step as PydanticStep
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.settings import settings
 from letta.utils import enforce_types
 
+logger = get_logger(__name__)
+
+STEP_LIST_BATCH_SIZE = 256
+STEP_WRITE_BEHIND_MAX_BATCH = 500
+STEP_WRITE_BEHIND_MAX_DELAY = 0.05  # seconds
+STEP_WRITE_BEHIND_MAX_QUEUE = 10_000  # oldest queued steps are dropped beyond this, e.g. while the database is down
+
+# errors that say nothing about the rows themselves, so a failed flush keeps its steps queued for the next one
+_TRANSIENT_DB_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError, DatabaseTimeoutError, TimeoutError, ConnectionError)
+
+# columns that are the same for every newly logged step; tags is a tuple so rows can share it safely
+_STEP_DATA_SKELETON = {"origin": None, "tags": (), "tid": None}
+
+# SQLite only allows a single writer, so step writes are serialized process-wide instead of letting pooled
+# connections queue up on the database lock; on Postgres the write guards are no-ops. Sync and async writers share
+# this one lock (async writers poll for it rather than block the event loop), and it isn't bound to any event loop.
+_sqlite_write_lock = threading.Lock()
+_SQLITE_WRITE_LOCK_POLL_MAX = 0.05  # seconds
+
+# step columns that map one-to-one onto fields of the pydantic Step, and so can be projected in list_steps_async
+_STEP_PROJECTABLE_COLUMNS = frozenset(StepModel.__table__.columns.keys()) & frozenset(PydanticStep.model_fields)
+
+# steps queued by log_step_deferred_async, waiting for the next batched insert. Shared by every StepManager in the
+# process (agents build their own), so the flush on server shutdown writes all of them.
+_pending_steps: List[Dict[str, Any]] = []
+_step_flush_task: Optional[asyncio.Task] = None
+
+# (actor id, job id) pairs whose write access was already verified during the current request; the REST app opens a
+# fresh set per request with job_access_cache_scope, and outside such a scope nothing is cached
+_verified_job_writes: ContextVar[Optional[Set[Tuple[str, str]]]] = ContextVar("verified_job_writes", default=None)
+
+
+@contextmanager
+def job_access_cache_scope() -> Iterator[None]:
+    """Remember job write-access checks made by step logging until the scope exits."""
+    token = _verified_job_writes.set(set())
+    try:
+        yield
+    finally:
+        _verified_job_writes.reset(token)
+
+
+def _unverified_job_ids(job_ids: Iterable[str], actor: PydanticUser) -> Set[str]:
+    verified = _verified_job_writes.get()
+    if verified is None:
+        return set(job_ids)
+    return {job_id for job_id in job_ids if (actor.id, job_id) not in verified}
+
+
+def _remember_verified_job_ids(job_ids: Set[str], actor: PydanticUser) -> None:
+    verified = _verified_job_writes.get()
+    if verified is not None:
+        verified.update((actor.id, job_id) for job_id in job_ids)
+
+
+def _insert_steps_stmt() -> Insert:
+    """INSERT for new step rows that skips ids which already exist, so retried step writes are idempotent."""
+    insert_fn = pg_insert if settings.letta_pg_uri_no_default else sqlite_insert
+    return insert_fn(StepModel).on_conflict_do_nothing(index_elements=["id"])
+
+
+def _is_transient_db_error(error: BaseException) -> bool:
+    if isinstance(error, (asyncio.CancelledError, *_TRANSIENT_DB_ERRORS)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+def _requeue_steps(rows: List[Dict[str, Any]]) -> None:
+    # Put unwritten steps back at the front of the queue, keeping it bounded by dropping the oldest
+    _pending_steps[:0] = rows
+    overflow = len(_pending_steps) - STEP_WRITE_BEHIND_MAX_QUEUE
+    if overflow > 0:
+        del _pending_steps[:overflow]
+        logger.error(f"Step write-behind queue is full, dropped the {overflow} oldest queued steps")
+
+
+def _logged_steps_query(step_ids: Set[str], actor: PydanticUser) -> Select:
+    return select(StepModel).where(StepModel.id.in_(step_ids), StepModel.organization_id == actor.organization_id)
+
+
+def _in_row_order(rows: List[Dict[str, Any]], steps: Dict[str, StepModel]) -> List[StepModel]:
+    missing = [row["id"] for row in rows if row["id"] not in steps]
+    if missing:
+        # the ids exist, but belong to another organization
+        raise UniqueConstraintViolationError(f"Steps with ids {missing} already exist")
+    return [steps[row["id"]] for row in rows]
+
 
 class FeedbackType(str, Enum):
     POSITIVE = "positive"
@@ -42,32 +140,58 @@ class StepManager:
         trace_ids: Optional[list[str]] = None,
         feedback: Optional[Literal["positive", "negative"]] = None,
         has_feedback: Optional[bool] = None,
+        columns: Optional[List[str]] = None,
+        session: Optional[AsyncSession] = None,
     ) -> List[PydanticStep]:
-        """List all jobs with optional pagination and status filter."""
-        async with db_registry.async_session() as session:
-            filter_kwargs = {"organization_id": actor.organization_id}
-            if model:
-                filter_kwargs["model"] = model
-            if agent_id:
-                filter_kwargs["agent_id"] = agent_id
-            if trace_ids:
-                filter_kwargs["trace_id"] = trace_ids
-            if feedback:
-                filter_kwargs["feedback"] = feedback
-            steps = await StepModel.list_async(
+        """List all jobs with optional pagination and status filter.
+
+        If `columns` is given, only those step columns (plus `id`) are selected and the remaining fields keep their defaults.
+        """
+        async with self._async_session(session) as session:
+            # unset filters are dropped rather than turned into IS NULL predicates; the organization filter leads so the
+            # (organization_id, created_at, id) index can serve the ordering
+            filter_kwargs = {
+                key: value
+                for key, value in (
+                    ("organization_id", actor.organization_id),
+                    ("agent_id", agent_id),
+                    ("model", model),
+                    ("trace_id", trace_ids),
+                    ("feedback", feedback),
+                )
+                if value
+            }
+            query = await StepModel.list_query_async(
                 db_session=session,
                 before=before,
                 after=after,
                 start_date=start_date,
                 end_date=end_date,
                 limit=limit,
-                ascending=True if order == "asc" else False,
+                ascending=order == "asc",
                 has_feedback=has_feedback,
                 **filter_kwargs,
             )
-            return [step.to_pydantic() for step in steps]
+            if columns is not None:
+                unknown = set(columns) - _STEP_PROJECTABLE_COLUMNS
+                if unknown:
+                    raise ValueError(f"Unknown step columns: {sorted(unknown)}")
+                selected = ["id", *(column for column in columns if column != "id")]
+                query = query.with_only_columns(*(StepModel.__table__.c[column] for column in selected))
+                # rows come straight from the steps table, so skip validation for the partial models
+                steps = [PydanticStep.model_construct(**row._mapping) for row in await session.execute(query)]
+                return StepModel._list_postprocess(before=before, after=after, limit=limit, results=steps)
+
+            # convert each batch as it arrives and drop the ORM rows, rather than holding every row twice;
+            # to_pydantic_fast only reads columns, and raiseload keeps a relationship access from turning into N+1 queries
+            query = query.options(raiseload("*"))
+            steps = []
+            result = await session.stream_scalars(query, execution_options={"yield_per": STEP_LIST_BATCH_SIZE})
+            async for step in result:
+                steps.append(step.to_pydantic_fast())
+                session.expunge(step)
+            return StepModel._list_postprocess(before=before, after=after, limit=limit, results=steps)
 
-    @enforce_types
     @trace_method
     def log_step(
         self,
@@ -82,35 +206,31 @@ class StepManager:
         provider_id: Optional[str] = None,
         job_id: Optional[str] = None,
         step_id: Optional[str] = None,
+        session: Optional[Session] = None,
     ) -> PydanticStep:
-        step_data = {
-            "origin": None,
-            "organization_id": actor.organization_id,
-            "agent_id": agent_id,
-            "provider_id": provider_id,
-            "provider_name": provider_name,
-            "provider_category": provider_category,
-            "model": model,
-            "model_endpoint": model_endpoint,
-            "context_window_limit": context_window_limit,
-            "completion_tokens": usage.completion_tokens,
-            "prompt_tokens": usage.prompt_tokens,
-            "total_tokens": usage.total_tokens,
-            "job_id": job_id,
-            "tags": [],
-            "tid": None,
-            "trace_id": get_trace_id(),  # Get the current trace ID
-        }
-        if step_id:
-            step_data["id"] = step_id
-        with db_registry.session() as session:
+        step_data = self._build_step_data(
+            actor=actor,
+            agent_id=agent_id,
+            provider_name=provider_name,
+            provider_category=provider_category,
+            model=model,
+            model_endpoint=model_endpoint,
+            context_window_limit=context_window_limit,
+            usage=usage,
+            provider_id=provider_id,
+            job_id=job_id,
+            step_id=step_id,
+        )
+        commit = session is None
+        with self._write_guard(session), self._session(session) as session:
             if job_id:
-                self._verify_job_access(session, job_id, actor, access=["write"])
-            new_step = StepModel(**step_data)
-            new_step.create(session)
-            return new_step.to_pydantic()
+                self._verify_job_write_access(session, [job_id], actor)
+            (new_step,) = self._insert_steps(session, [step_data], actor)
+            pydantic_step = new_step.to_pydantic()
+            if commit:
+                session.commit()
+            return pydantic_step
 
-    @enforce_types
     @trace_method
     async def log_step_async(
         self,
@@ -125,61 +245,253 @@ class StepManager:
         provider_id: Optional[str] = None,
         job_id: Optional[str] = None,
         step_id: Optional[str] = None,
+        session: Optional[AsyncSession] = None,
     ) -> PydanticStep:
-        step_data = {
-            "origin": None,
-            "organization_id": actor.organization_id,
-            "agent_id": agent_id,
-            "provider_id": provider_id,
-            "provider_name": provider_name,
-            "provider_category": provider_category,
-            "model": model,
-            "model_endpoint": model_endpoint,
-            "context_window_limit": context_window_limit,
-            "completion_tokens": usage.completion_tokens,
-            "prompt_tokens": usage.prompt_tokens,
-            "total_tokens": usage.total_tokens,
-            "job_id": job_id,
-            "tags": [],
-            "tid": None,
-            "trace_id": get_trace_id(),  # Get the current trace ID
-        }
-        if step_id:
-            step_data["id"] = step_id
-        async with db_registry.async_session() as session:
+        step_data = self._build_step_data(
+            actor=actor,
+            agent_id=agent_id,
+            provider_name=provider_name,
+            provider_category=provider_category,
+            model=model,
+            model_endpoint=model_endpoint,
+            context_window_limit=context_window_limit,
+            usage=usage,
+            provider_id=provider_id,
+            job_id=job_id,
+            step_id=step_id,
+        )
+        commit = session is None
+        async with self._async_write_guard(session), self._async_session(session) as session:
             if job_id:
-                await self._verify_job_access_async(session, job_id, actor, access=["write"])
-            new_step = StepModel(**step_data)
-            await new_step.create_async(session)
-            return new_step.to_pydantic()
+                await self._verify_job_write_access_async(session, [job_id], actor)
+            (new_step,) = await self._insert_steps_async(session, [step_data], actor)
+            pydantic_step = new_step.to_pydantic()
+            if commit:
+                await session.commit()
+            return pydantic_step
+
+    @trace_method
+    async def log_step_deferred_async(
+        self,
+        actor: PydanticUser,
+        agent_id: str,
+        provider_name: str,
+        provider_category: str,
+        model: str,
+        model_endpoint: Optional[str],
+        context_window_limit: int,
+        usage: UsageStatistics,
+        provider_id: Optional[str] = None,
+        job_id: Optional[str] = None,
+        step_id: Optional[str] = None,
+    ) -> PydanticStep:
+        """
+        Queue a step for a batched background insert and return it without waiting for the commit.
+
+        Queued steps are written together once STEP_WRITE_BEHIND_MAX_BATCH rows are pending or
+        STEP_WRITE_BEHIND_MAX_DELAY seconds have passed. Callers that need to read the step back
+        (or reference it from another row) must await `flush_async` first.
+
+        Raises:
+            NoResultFound: If the job does not exist or the user does not have write access to it
+        """
+        step_data = self._build_step_data(
+            actor=actor,
+            agent_id=agent_id,
+            provider_name=provider_name,
+            provider_category=provider_category,
+            model=model,
+            model_endpoint=model_endpoint,
+            context_window_limit=context_window_limit,
+            usage=usage,
+            provider_id=provider_id,
+            job_id=job_id,
+            step_id=step_id,
+        )
+        if job_id:
+            async with self._async_session() as session:
+                await self._verify_job_write_access_async(session, [job_id], actor)
+
+        global _step_flush_task
+        _pending_steps.append(step_data)
+        if len(_pending_steps) >= STEP_WRITE_BEHIND_MAX_BATCH:
+            await self.flush_async()
+        elif _step_flush_task is None or _step_flush_task.done() or _step_flush_task.get_loop() is not asyncio.get_running_loop():
+            _step_flush_task = asyncio.create_task(self._flush_after_delay())
+        return PydanticStep(**step_data)
+
+    @trace_method
+    async def flush_async(self) -> None:
+        """
+        Insert every step queued by `log_step_deferred_async` that has not been written yet.
+
+        If the insert fails for a transient reason (lost connection, timeout, cancellation) the steps are put back at
+        the front of the queue, so the next flush retries them, and the error is re-raised. If a row violates a
+        constraint (e.g. its agent was deleted meanwhile), the steps are inserted one by one and the rows that still
+        fail are logged and dropped, so one bad row can't block the queue. Any other error drops the batch and is
+        re-raised.
+        """
+        unwritten = _pending_steps[:]
+        if not unwritten:
+            return
+        _pending_steps.clear()
+        try:
+            async with self._async_write_guard(), self._async_session() as session:
+                try:
+                    await session.execute(_insert_steps_stmt(), unwritten)
+                    await session.commit()
+                    unwritten = []
+                except IntegrityError:
+                    await session.rollback()
+                    await self._insert_steps_one_by_one_async(session, unwritten)
+        except BaseException as e:
+            if _is_transient_db_error(e):
+                _requeue_steps(unwritten)
+            else:
+                logger.error(f"Dropping {len(unwritten)} queued steps after a failed flush: {e}")
+            raise
+
+    @staticmethod
+    async def _insert_steps_one_by_one_async(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        # Consumes `rows` as it goes, so on a transient error the caller requeues only the rows not tried yet
+        while rows:
+            row = rows[0]
+            try:
+                await session.execute(_insert_steps_stmt(), [row])
+                await session.commit()
+            except IntegrityError as e:
+                await session.rollback()
+                logger.error(f"Dropping queued step {row['id']} that can't be written: {e}")
+            rows.pop(0)
+
+    async def _flush_after_delay(self) -> None:
+        await asyncio.sleep(STEP_WRITE_BEHIND_MAX_DELAY)
+        try:
+            await self.flush_async()
+        except Exception as e:
+            logger.error(f"Failed to flush queued steps, keeping {len(_pending_steps)} queued for the next flush: {e}", exc_info=True)
+
+    @enforce_types
+    @trace_method
+    def log_steps_bulk(
+        self,
+        actor: PydanticUser,
+        entries: List[Dict[str, Any]],
+        return_pydantic: bool = True,
+        session: Optional[Session] = None,
+    ) -> Union[List[PydanticStep], List[str]]:
+        """
+        Log many steps with one bulk INSERT in a single transaction.
+
+        Args:
+            actor: The user logging the steps
+            entries: One dict per step, holding the keyword arguments of `log_step` (without `actor`)
+            return_pydantic: Whether to load the inserted rows back with RETURNING; if False only their ids are returned
+            session: An existing session to run in, left uncommitted for the caller; a new one is opened if not given
+
+        Returns:
+            The logged steps (or their ids), in the order of `entries`
+
+        Raises:
+            NoResultFound: If any referenced job does not exist or the user does not have write access to it
+        """
+        if not entries:
+            return []
+        trace_id = get_trace_id()
+        rows = [self._build_step_data(actor=actor, trace_id=trace_id, **entry) for entry in entries]
+        commit = session is None
+        with self._write_guard(session), self._session(session) as session:
+            self._verify_job_write_access(session, (row["job_id"] for row in rows if row["job_id"]), actor)
+            if not return_pydantic:
+                # plain executemany: no RETURNING and no ORM objects to hydrate
+                try:
+                    session.execute(_insert_steps_stmt(), rows)
+                except (DBAPIError, IntegrityError) as e:
+                    StepModel._handle_dbapi_error(e)
+                if commit:
+                    session.commit()
+                return [row["id"] for row in rows]
+            steps = [step.to_pydantic() for step in self._insert_steps(session, rows, actor)]
+            if commit:
+                session.commit()
+        return steps
 
     @enforce_types
     @trace_method
-    async def get_step_async(self, step_id: str, actor: PydanticUser) -> PydanticStep:
-        async with db_registry.async_session() as session:
+    async def log_steps_bulk_async(
+        self,
+        actor: PydanticUser,
+        entries: List[Dict[str, Any]],
+        return_pydantic: bool = True,
+        session: Optional[AsyncSession] = None,
+    ) -> Union[List[PydanticStep], List[str]]:
+        """
+        Log many steps with one bulk INSERT in a single transaction.
+
+        Args:
+            actor: The user logging the steps
+            entries: One dict per step, holding the keyword arguments of `log_step_async` (without `actor`)
+            return_pydantic: Whether to load the inserted rows back with RETURNING; if False only their ids are returned
+            session: An existing session to run in, left uncommitted for the caller; a new one is opened if not given
+
+        Returns:
+            The logged steps (or their ids), in the order of `entries`
+
+        Raises:
+            NoResultFound: If any referenced job does not exist or the user does not have write access to it
+        """
+        if not entries:
+            return []
+        trace_id = get_trace_id()
+        rows = [self._build_step_data(actor=actor, trace_id=trace_id, **entry) for entry in entries]
+        commit = session is None
+        async with self._async_write_guard(session), self._async_session(session) as session:
+            await self._verify_job_write_access_async(session, (row["job_id"] for row in rows if row["job_id"]), actor)
+            if not return_pydantic:
+                # plain executemany: no RETURNING and no ORM objects to hydrate
+                try:
+                    await session.execute(_insert_steps_stmt(), rows)
+                except (DBAPIError, IntegrityError) as e:
+                    StepModel._handle_dbapi_error(e)
+                if commit:
+                    await session.commit()
+                return [row["id"] for row in rows]
+            steps = [step.to_pydantic() for step in await self._insert_steps_async(session, rows, actor)]
+            if commit:
+                await session.commit()
+        return steps
+
+    @trace_method
+    async def get_step_async(self, step_id: str, actor: PydanticUser, session: Optional[AsyncSession] = None) -> PydanticStep:
+        async with self._async_session(session) as session:
             step = await StepModel.read_async(db_session=session, identifier=step_id, actor=actor)
             return step.to_pydantic()
 
     @enforce_types
     @trace_method
-    async def add_feedback_async(self, step_id: str, feedback: Optional[FeedbackType], actor: PydanticUser) -> PydanticStep:
-        async with db_registry.async_session() as session:
+    async def add_feedback_async(
+        self, step_id: str, feedback: Optional[FeedbackType], actor: PydanticUser, session: Optional[AsyncSession] = None
+    ) -> PydanticStep:
+        commit = session is None
+        async with self._async_write_guard(session), self._async_session(session) as session:
             step = await StepModel.read_async(db_session=session, identifier=step_id, actor=actor)
             if not step:
                 raise NoResultFound(f"Step with id {step_id} does not exist")
             step.feedback = feedback
-            step = await step.update_async(session)
+            step = await step.update_async(session, no_commit=not commit)
             return step.to_pydantic()
 
-    @enforce_types
     @trace_method
-    def update_step_transaction_id(self, actor: PydanticUser, step_id: str, transaction_id: str) -> PydanticStep:
+    def update_step_transaction_id(
+        self, actor: PydanticUser, step_id: str, transaction_id: str, session: Optional[Session] = None
+    ) -> PydanticStep:
         """Update the transaction ID for a step.
 
         Args:
             actor: The user making the request
             step_id: The ID of the step to update
             transaction_id: The new transaction ID to set
+            session: An existing session to run in, left uncommitted for the caller; a new one is opened if not given
 
         Returns:
             The updated step
@@ -187,16 +499,209 @@ class StepManager:
         Raises:
             NoResultFound: If the step does not exist
         """
-        with db_registry.session() as session:
-            step = session.get(StepModel, step_id)
+        stmt = self._update_step_transaction_id_stmt(actor, step_id, transaction_id)
+        commit = session is None
+        with self._write_guard(session), self._session(session) as session:
+            step = session.execute(stmt).scalar_one_or_none()
             if not step:
+                # only pay for the existence check when the update missed
+                if session.execute(select(exists().where(StepModel.id == step_id))).scalar():
+                    raise Exception("Unauthorized")
                 raise NoResultFound(f"Step with id {step_id} does not exist")
-            if step.organization_id != actor.organization_id:
-                raise Exception("Unauthorized")
 
-            step.tid = transaction_id
-            session.commit()
-            return step.to_pydantic()
+            pydantic_step = step.to_pydantic()
+            if commit:
+                session.commit()
+            return pydantic_step
+
+    @trace_method
+    async def update_step_transaction_id_async(
+        self, actor: PydanticUser, step_id: str, transaction_id: str, session: Optional[AsyncSession] = None
+    ) -> PydanticStep:
+        """Update the transaction ID for a step asynchronously.
+
+        Args:
+            actor: The user making the request
+            step_id: The ID of the step to update
+            transaction_id: The new transaction ID to set
+            session: An existing session to run in, left uncommitted for the caller; a new one is opened if not given
+
+        Returns:
+            The updated step
+
+        Raises:
+            NoResultFound: If the step does not exist
+        """
+        stmt = self._update_step_transaction_id_stmt(actor, step_id, transaction_id)
+        commit = session is None
+        async with self._async_write_guard(session), self._async_session(session) as session:
+            step = (await session.execute(stmt)).scalar_one_or_none()
+            if not step:
+                # only pay for the existence check when the update missed
+                if (await session.execute(select(exists().where(StepModel.id == step_id)))).scalar():
+                    raise Exception("Unauthorized")
+                raise NoResultFound(f"Step with id {step_id} does not exist")
+
+            pydantic_step = step.to_pydantic()
+            if commit:
+                await session.commit()
+            return pydantic_step
+
+    @staticmethod
+    def _update_step_transaction_id_stmt(actor: PydanticUser, step_id: str, transaction_id: str) -> Update:
+        """Build the UPDATE ... RETURNING that sets a step's transaction id, scoped to the actor's organization."""
+        return (
+            update(StepModel)
+            .where(StepModel.id == step_id, StepModel.organization_id == actor.organization_id)
+            .values(tid=transaction_id)
+            .returning(StepModel)
+        )
+
+    @contextmanager
+    def transaction(self) -> Iterator[Session]:
+        """
+        Open a session for a burst of step writes that commit together.
+
+        Pass the yielded session as `session=` to the write methods: they flush into it without committing, and
+        everything is committed once when the block exits (or rolled back if it raises). On SQLite the step write lock
+        is held for the whole block, so step writes inside it must go through the yielded session.
+        """
+        with self._write_guard(), db_registry.session() as session:
+            with session.begin():
+                yield session
+
+    @asynccontextmanager
+    async def transaction_async(self) -> AsyncIterator[AsyncSession]:
+        """Async version of `transaction`."""
+        async with self._async_write_guard(), db_registry.async_session() as session:
+            async with session.begin():
+                yield session
+
+    @contextmanager
+    def _session(self, session: Optional[Session] = None) -> Iterator[Session]:
+        """
+        Yield the caller's session if one was passed in, otherwise open (and close) a new one.
+        Methods only commit sessions they opened themselves; a caller's session is committed by the caller.
+        """
+        if session is not None:
+            yield session
+            return
+        with db_registry.session() as new_session:
+            yield new_session
+
+    @asynccontextmanager
+    async def _async_session(self, session: Optional[AsyncSession] = None) -> AsyncIterator[AsyncSession]:
+        """Yield the caller's async session if one was passed in, otherwise open (and close) a new one."""
+        if session is not None:
+            yield session
+            return
+        async with db_registry.async_session() as new_session:
+            yield new_session
+
+    @contextmanager
+    def _write_guard(self, session: Optional[Session] = None) -> Iterator[None]:
+        """
+        Hold the SQLite write lock for a write on a session this manager opens itself.
+
+        A caller's session is not guarded again: sessions from `transaction` already hold the lock for the whole
+        transaction, so a write can never wait on the lock while another session's transaction holds the database.
+        """
+        if settings.letta_pg_uri_no_default or session is not None:
+            yield
+            return
+        with _sqlite_write_lock:
+            yield
+
+    @asynccontextmanager
+    async def _async_write_guard(self, session: Optional[AsyncSession] = None) -> AsyncIterator[None]:
+        """Async version of `_write_guard`, sharing the same lock."""
+        if settings.letta_pg_uri_no_default or session is not None:
+            yield
+            return
+        delay = 0.001
+        while not _sqlite_write_lock.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _SQLITE_WRITE_LOCK_POLL_MAX)
+        try:
+            yield
+        finally:
+            _sqlite_write_lock.release()
+
+    def _build_step_data(
+        self,
+        actor: PydanticUser,
+        agent_id: str,
+        provider_name: str,
+        provider_category: str,
+        model: str,
+        model_endpoint: Optional[str],
+        context_window_limit: int,
+        usage: UsageStatistics,
+        provider_id: Optional[str] = None,
+        job_id: Optional[str] = None,
+        step_id: Optional[str] = None,
+        trace_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build the column values for a new step row."""
+        step_data = {
+            **_STEP_DATA_SKELETON,
+            "id": step_id or f"step-{uuid.uuid4()}",
+            "organization_id": actor.organization_id,
+            "agent_id": agent_id,
+            "provider_id": provider_id,
+            "provider_name": provider_name,
+            "provider_category": provider_category,
+            "model": model,
+            "model_endpoint": model_endpoint,
+            "context_window_limit": context_window_limit,
+            "completion_tokens": usage.completion_tokens,
+            "prompt_tokens": usage.prompt_tokens,
+            "total_tokens": usage.total_tokens,
+            "job_id": job_id,
+            "trace_id": trace_id or get_trace_id(),  # Get the current trace ID
+        }
+        return step_data
+
+    def _insert_steps(self, session: Session, rows: List[Dict[str, Any]], actor: PydanticUser) -> List[StepModel]:
+        """
+        Insert new step rows with one INSERT ... ON CONFLICT DO NOTHING RETURNING and return them in input order.
+        Rows whose id already exists (a retried write) are read back instead of inserted again.
+        """
+        try:
+            steps = {step.id: step for step in session.execute(_insert_steps_stmt().returning(StepModel), rows).scalars()}
+            already_logged = {row["id"] for row in rows} - steps.keys()
+            if already_logged:
+                steps.update((step.id, step) for step in session.execute(_logged_steps_query(already_logged, actor)).scalars())
+        except (DBAPIError, IntegrityError) as e:
+            StepModel._handle_dbapi_error(e)
+        return _in_row_order(rows, steps)
+
+    async def _insert_steps_async(self, session: AsyncSession, rows: List[Dict[str, Any]], actor: PydanticUser) -> List[StepModel]:
+        """Async version of `_insert_steps`."""
+        try:
+            result = await session.execute(_insert_steps_stmt().returning(StepModel), rows)
+            steps = {step.id: step for step in result.scalars()}
+            already_logged = {row["id"] for row in rows} - steps.keys()
+            if already_logged:
+                result = await session.execute(_logged_steps_query(already_logged, actor))
+                steps.update((step.id, step) for step in result.scalars())
+        except (DBAPIError, IntegrityError) as e:
+            StepModel._handle_dbapi_error(e)
+        return _in_row_order(rows, steps)
+
+    def _verify_job_write_access(self, session: Session, job_ids: Iterable[str], actor: PydanticUser) -> None:
+        """Check write access to the jobs steps are logged against, skipping jobs already verified in this request."""
+        pending = _unverified_job_ids(job_ids, actor)
+        if pending:
+            self._verify_job_access_many(session, pending, actor, access=["write"])
+            _remember_verified_job_ids(pending, actor)
+
+    async def _verify_job_write_access_async(self, session: AsyncSession, job_ids: Iterable[str], actor: PydanticUser) -> None:
+        """Async version of `_verify_job_write_access`."""
+        pending = _unverified_job_ids(job_ids, actor)
+        if pending:
+            await self._verify_job_access_many_async(session, pending, actor, access=["write"])
+            _remember_verified_job_ids(pending, actor)
 
     def _verify_job_access(
         self,
@@ -219,12 +724,37 @@ class StepManager:
         Raises:
             NoResultFound: If the job does not exist or user does not have access
         """
-        job_query = select(JobModel).where(JobModel.id == job_id)
+        return self._verify_job_access_many(session, [job_id], actor, access)[job_id]
+
+    def _verify_job_access_many(
+        self,
+        session: Session,
+        job_ids: Iterable[str],
+        actor: PydanticUser,
+        access: List[Literal["read", "write", "delete"]] = ["read"],
+    ) -> Dict[str, JobModel]:
+        """
+        Verify that several jobs exist and the user has the required access, using a single query.
+
+        Args:
+            session: The database session
+            job_ids: The IDs of the jobs to verify
+            actor: The user making the request
+
+        Returns:
+            A mapping of job ID to job for every requested job
+
+        Raises:
+            NoResultFound: If any job does not exist or user does not have access
+        """
+        job_ids = set(job_ids)
+        if not job_ids:
+            return {}
+        job_query = select(JobModel).where(JobModel.id.in_(job_ids))
         job_query = JobModel.apply_access_predicate(job_query, actor, access, AccessType.USER)
-        job = session.execute(job_query).scalar_one_or_none()
-        if not job:
-            raise NoResultFound(f"Job with id {job_id} does not exist or user does not have access")
-        return job
+        jobs = {job.id: job for job in session.execute(job_query).scalars()}
+        self._raise_for_missing_jobs(job_ids, jobs)
+        return jobs
 
     async def _verify_job_access_async(
         self,
@@ -247,13 +777,46 @@ class StepManager:
         Raises:
             NoResultFound: If the job does not exist or user does not have access
         """
-        job_query = select(JobModel).where(JobModel.id == job_id)
+        return (await self._verify_job_access_many_async(session, [job_id], actor, access))[job_id]
+
+    async def _verify_job_access_many_async(
+        self,
+        session: AsyncSession,
+        job_ids: Iterable[str],
+        actor: PydanticUser,
+        access: List[Literal["read", "write", "delete"]] = ["read"],
+    ) -> Dict[str, JobModel]:
+        """
+        Verify that several jobs exist and the user has the required access asynchronously, using a single query.
+
+        Args:
+            session: The async database session
+            job_ids: The IDs of the jobs to verify
+            actor: The user making the request
+
+        Returns:
+            A mapping of job ID to job for every requested job
+
+        Raises:
+            NoResultFound: If any job does not exist or user does not have access
+        """
+        job_ids = set(job_ids)
+        if not job_ids:
+            return {}
+        job_query = select(JobModel).where(JobModel.id.in_(job_ids))
         job_query = JobModel.apply_access_predicate(job_query, actor, access, AccessType.USER)
         result = await session.execute(job_query)
-        job = result.scalar_one_or_none()
-        if not job:
-            raise NoResultFound(f"Job with id {job_id} does not exist or user does not have access")
-        return job
+        jobs = {job.id: job for job in result.scalars()}
+        self._raise_for_missing_jobs(job_ids, jobs)
+        return jobs
+
+    @staticmethod
+    def _raise_for_missing_jobs(job_ids: Set[str], jobs: Dict[str, JobModel]) -> None:
+        missing = sorted(job_ids - jobs.keys())
+        if len(missing) == 1:
+            raise NoResultFound(f"Job with id {missing[0]} does not exist or user does not have access")
+        if missing:
+            raise NoResultFound(f"Jobs with ids {missing} do not exist or user does not have access")
 
 
 # noinspection PyTypeChecker
@@ -265,7 +828,6 @@ class NoopStepManager(StepManager):
     Will not allow for writes, but will still allow for reads.
     """
 
-    @enforce_types
     @trace_method
     def log_step(
         self,
@@ -280,10 +842,10 @@ class NoopStepManager(StepManager):
         provider_id: Optional[str] = None,
         job_id: Optional[str] = None,
         step_id: Optional[str] = None,
+        session: Optional[Session] = None,
     ) -> PydanticStep:
         return
 
-    @enforce_types
     @trace_method
     async def log_step_async(
         self,
@@ -298,5 +860,45 @@ class NoopStepManager(StepManager):
         provider_id: Optional[str] = None,
         job_id: Optional[str] = None,
         step_id: Optional[str] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> PydanticStep:
+        return
+
+    @enforce_types
+    @trace_method
+    def log_steps_bulk(
+        self,
+        actor: PydanticUser,
+        entries: List[Dict[str, Any]],
+        return_pydantic: bool = True,
+        session: Optional[Session] = None,
+    ) -> Union[List[PydanticStep], List[str]]:
+        return []
+
+    @enforce_types
+    @trace_method
+    async def log_steps_bulk_async(
+        self,
+        actor: PydanticUser,
+        entries: List[Dict[str, Any]],
+        return_pydantic: bool = True,
+        session: Optional[AsyncSession] = None,
+    ) -> Union[List[PydanticStep], List[str]]:
+        return []
+
+    @trace_method
+    async def log_step_deferred_async(
+        self,
+        actor: PydanticUser,
+        agent_id: str,
+        provider_name: str,
+        provider_category: str,
+        model: str,
+        model_endpoint: Optional[str],
+        context_window_limit: int,
+        usage: UsageStatistics,
+        provider_id: Optional[str] = None,
+        job_id: Optional[str] = None,
+        step_id: Optional[str] = None,
     ) -> PydanticStep:
         return
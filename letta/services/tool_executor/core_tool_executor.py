@@ -1,4 +1,3 @@
-import math
 from typing import Any, Dict, Optional
 
 from letta.constants import (
@@ -7,15 +6,12 @@ from letta.constants import (
     READ_ONLY_BLOCK_EDIT_ERROR,
     RETRIEVAL_QUERY_DEFAULT_PAGE_SIZE,
 )
-from letta.helpers.json_helpers import json_dumps
+from letta.helpers.json_helpers import json_dumps_str_list
 from letta.schemas.agent import AgentState
 from letta.schemas.sandbox_config import SandboxConfig
 from letta.schemas.tool import Tool
 from letta.schemas.tool_execution_result import ToolExecutionResult
 from letta.schemas.user import User
-from letta.services.agent_manager import AgentManager
-from letta.services.message_manager import MessageManager
-from letta.services.passage_manager import PassageManager
 from letta.services.tool_executor.tool_executor_base import ToolExecutor
 from letta.utils import get_friendly_error_msg
 
@@ -23,6 +19,22 @@ from letta.utils import get_friendly_error_msg
 class LettaCoreToolExecutor(ToolExecutor):
     """Executor for LETTA core tools with direct implementation of functions."""
 
+    # Core tools are dispatched to the method of the same name
+    CORE_TOOL_FUNCTIONS = frozenset(
+        {
+            "send_message",
+            "conversation_search",
+            "archival_memory_search",
+            "archival_memory_insert",
+            "core_memory_append",
+            "core_memory_replace",
+            "memory_replace",
+            "memory_insert",
+            "memory_rethink",
+            "memory_finish_edits",
+        }
+    )
+
     async def execute(
         self,
         function_name: str,
@@ -33,28 +45,13 @@ class LettaCoreToolExecutor(ToolExecutor):
         sandbox_config: Optional[SandboxConfig] = None,
         sandbox_env_vars: Optional[Dict[str, Any]] = None,
     ) -> ToolExecutionResult:
-        # Map function names to method calls
         assert agent_state is not None, "Agent state is required for core tools"
-        function_map = {
-            "send_message": self.send_message,
-            "conversation_search": self.conversation_search,
-            "archival_memory_search": self.archival_memory_search,
-            "archival_memory_insert": self.archival_memory_insert,
-            "core_memory_append": self.core_memory_append,
-            "core_memory_replace": self.core_memory_replace,
-            "memory_replace": self.memory_replace,
-            "memory_insert": self.memory_insert,
-            "memory_rethink": self.memory_rethink,
-            "memory_finish_edits": self.memory_finish_edits,
-        }
-
-        if function_name not in function_map:
+        if function_name not in self.CORE_TOOL_FUNCTIONS:
             raise ValueError(f"Unknown function: {function_name}")
 
-        # Execute the appropriate function
-        function_args_copy = function_args.copy()  # Make a copy to avoid modifying the original
+        # Execute the appropriate function (unpacking the kwargs already leaves the original args untouched)
         try:
-            function_response = await function_map[function_name](agent_state, actor, **function_args_copy)
+            function_response = await getattr(self, function_name)(agent_state, actor, **function_args)
             return ToolExecutionResult(
                 status="success",
                 func_return=function_response,
@@ -99,22 +96,23 @@ class LettaCoreToolExecutor(ToolExecutor):
             raise ValueError(f"'page' argument must be an integer")
 
         count = RETRIEVAL_QUERY_DEFAULT_PAGE_SIZE
-        messages = await MessageManager().list_user_messages_for_agent_async(
+        # Fetch one extra match to learn whether another page exists without counting every match
+        message_texts = await self.message_manager.list_user_message_texts_for_agent_async(
             agent_id=agent_state.id,
             actor=actor,
             query_text=query,
-            limit=count,
+            limit=count + 1,
+            offset=page * count,
         )
+        has_next = len(message_texts) > count
+        message_texts = message_texts[:count]
 
-        total = len(messages)
-        num_pages = math.ceil(total / count) - 1  # 0 index
-
-        if len(messages) == 0:
+        if len(message_texts) == 0:
             results_str = f"No results found."
         else:
-            results_pref = f"Showing {len(messages)} of {total} results (page {page}/{num_pages}):"
-            results_formatted = [message.content[0].text for message in messages]
-            results_str = f"{results_pref} {json_dumps(results_formatted)}"
+            more = f", more results on page {page + 1}" if has_next else ""
+            results_pref = f"Showing {len(message_texts)} results (page {page}{more}):"
+            results_str = f"{results_pref} {json_dumps_str_list(message_texts)}"
 
         return results_str
 
@@ -142,20 +140,17 @@ class LettaCoreToolExecutor(ToolExecutor):
         count = RETRIEVAL_QUERY_DEFAULT_PAGE_SIZE
 
         try:
-            # Get results using passage manager
-            all_results = await AgentManager().list_agent_passages_async(
+            # Get results using passage manager, skipping the first `start` matches in the query itself.
+            # Concurrent searches from other agents are coalesced into one batch.
+            paged_results = await self.agent_manager.search_agent_passages_batched_async(
                 actor=actor,
                 agent_id=agent_state.id,
                 query_text=query,
-                limit=count + start,  # Request enough results to handle offset
                 embedding_config=agent_state.embedding_config,
-                embed_query=True,
+                limit=count,
+                offset=start,
             )
 
-            # Apply pagination
-            end = min(count + start, len(all_results))
-            paged_results = all_results[start:end]
-
             # Format results to match previous implementation
             formatted_results = [{"timestamp": str(result.created_at), "content": result.text} for result in paged_results]
 
@@ -174,13 +169,13 @@ class LettaCoreToolExecutor(ToolExecutor):
         Returns:
             Optional[str]: None is always returned as this function does not produce a response.
         """
-        await PassageManager().insert_passage_async(
+        await self.passage_manager.insert_passage_async(
             agent_state=agent_state,
             agent_id=agent_state.id,
             text=content,
             actor=actor,
         )
-        await AgentManager().rebuild_system_prompt_async(agent_id=agent_state.id, actor=actor, force=True)
+        await self.agent_manager.rebuild_system_prompt_async(agent_id=agent_state.id, actor=actor, force=True)
         return None
 
     async def core_memory_append(self, agent_state: AgentState, actor: User, label: str, content: str) -> Optional[str]:
@@ -199,7 +194,10 @@ class LettaCoreToolExecutor(ToolExecutor):
         current_value = str(agent_state.memory.get_block(label).value)
         new_value = current_value + "\n" + str(content)
         agent_state.memory.update_block_value(label=label, value=new_value)
-        await AgentManager().update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+        patched = await self._patch_block(agent_state, actor, label, current_value, len(current_value), "", "\n" + str(content))
+        await self.agent_manager.update_memory_if_changed_async(
+            agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor, changed_labels=[] if patched else [label]
+        )
         return None
 
     async def core_memory_replace(
@@ -228,7 +226,14 @@ class LettaCoreToolExecutor(ToolExecutor):
             raise ValueError(f"Old content '{old_content}' not found in memory block '{label}'")
         new_value = current_value.replace(str(old_content), str(new_content))
         agent_state.memory.update_block_value(label=label, value=new_value)
-        await AgentManager().update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+        match_idx = current_value.find(old_content)
+        patched = False
+        if current_value.find(old_content, match_idx + max(len(old_content), 1)) == -1:
+            # Every occurrence is replaced, so only a single one can be sent as one span
+            patched = await self._patch_block(agent_state, actor, label, current_value, match_idx, old_content, new_content)
+        await self.agent_manager.update_memory_if_changed_async(
+            agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor, changed_labels=[] if patched else [label]
+        )
         return None
 
     async def memory_replace(
@@ -280,13 +285,13 @@ class LettaCoreToolExecutor(ToolExecutor):
         new_str = str(new_str).expandtabs()
         current_value = str(agent_state.memory.get_block(label).value).expandtabs()
 
-        # Check if old_str is unique in the block
-        occurences = current_value.count(old_str)
-        if occurences == 0:
+        # Check if old_str is unique in the block, stopping at the second match
+        match_idx = current_value.find(old_str)
+        if match_idx == -1:
             raise ValueError(
                 f"No replacement was performed, old_str `{old_str}` did not appear " f"verbatim in memory block with label `{label}`."
             )
-        elif occurences > 1:
+        elif current_value.find(old_str, match_idx + max(len(old_str), 1)) != -1:
             content_value_lines = current_value.split("\n")
             lines = [idx + 1 for idx, line in enumerate(content_value_lines) if old_str in line]
             raise ValueError(
@@ -294,17 +299,20 @@ class LettaCoreToolExecutor(ToolExecutor):
                 f"old_str `{old_str}` in lines {lines}. Please ensure it is unique."
             )
 
-        # Replace old_str with new_str
-        new_value = current_value.replace(str(old_str), str(new_str))
+        # Replace old_str with new_str at the (unique) match
+        new_value = current_value[:match_idx] + new_str + current_value[match_idx + len(old_str) :]
 
         # Write the new content to the block
         agent_state.memory.update_block_value(label=label, value=new_value)
+        patched = await self._patch_block(agent_state, actor, label, current_value, match_idx, old_str, new_str)
 
-        await AgentManager().update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+        await self.agent_manager.update_memory_if_changed_async(
+            agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor, changed_labels=[] if patched else [label]
+        )
 
         # Create a snippet of the edited section
         SNIPPET_LINES = 3
-        replacement_line = current_value.split(old_str)[0].count("\n")
+        replacement_line = current_value.count("\n", 0, match_idx)
         start_line = max(0, replacement_line - SNIPPET_LINES)
         end_line = replacement_line + SNIPPET_LINES + new_str.count("\n")
         snippet = "\n".join(new_value.split("\n")[start_line : end_line + 1])
@@ -363,8 +371,7 @@ class LettaCoreToolExecutor(ToolExecutor):
 
         current_value = str(agent_state.memory.get_block(label).value).expandtabs()
         new_str = str(new_str).expandtabs()
-        current_value_lines = current_value.split("\n")
-        n_lines = len(current_value_lines)
+        n_lines = current_value.count("\n") + 1
 
         # Check if we're in range, from 0 (pre-line), to 1 (first line), to n_lines (last line)
         if insert_line == -1:
@@ -376,24 +383,30 @@ class LettaCoreToolExecutor(ToolExecutor):
                 f"append to the end of the memory block."
             )
 
-        # Insert the new string as a line
+        # Insert the new string as a line, splicing at the offset where line `insert_line` starts
+        # instead of splitting the whole block into lines and joining it back together
         SNIPPET_LINES = 3
-        new_str_lines = new_str.split("\n")
-        new_value_lines = current_value_lines[:insert_line] + new_str_lines + current_value_lines[insert_line:]
-        snippet_lines = (
-            current_value_lines[max(0, insert_line - SNIPPET_LINES) : insert_line]
-            + new_str_lines
-            + current_value_lines[insert_line : insert_line + SNIPPET_LINES]
-        )
-
-        # Collate into the new value to update
-        new_value = "\n".join(new_value_lines)
-        snippet = "\n".join(snippet_lines)
+        if insert_line < n_lines:
+            # Splitting at most `insert_line` times leaves that line and everything after it in one piece
+            cut = len(current_value) - len(current_value.split("\n", insert_line)[-1])
+            inserted = new_str + "\n"
+            lines_after = current_value[cut:].split("\n", SNIPPET_LINES)[:SNIPPET_LINES]
+        else:
+            cut = len(current_value) + 1  # one past the end, as if the block ended with a newline
+            inserted = "\n" + new_str
+            lines_after = []
+        lines_before = current_value[: cut - 1].rsplit("\n", SNIPPET_LINES)[-SNIPPET_LINES:] if insert_line else []
+        offset = min(cut, len(current_value))
+        new_value = current_value[:offset] + inserted + current_value[offset:]
+        snippet = "\n".join(lines_before + new_str.split("\n") + lines_after)
 
         # Write into the block
         agent_state.memory.update_block_value(label=label, value=new_value)
+        patched = await self._patch_block(agent_state, actor, label, current_value, offset, "", inserted)
 
-        await AgentManager().update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+        await self.agent_manager.update_memory_if_changed_async(
+            agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor, changed_labels=[] if patched else [label]
+        )
 
         # Prepare the success message
         success_msg = f"The core memory block with label `{label}` has been edited. "
@@ -446,7 +459,9 @@ class LettaCoreToolExecutor(ToolExecutor):
 
         agent_state.memory.update_block_value(label=label, value=new_memory)
 
-        await AgentManager().update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+        await self.agent_manager.update_memory_if_changed_async(
+            agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor, changed_labels=[label]
+        )
 
         # Prepare the success message
         success_msg = f"The core memory block with label `{label}` has been edited. "
@@ -472,3 +487,28 @@ class LettaCoreToolExecutor(ToolExecutor):
             Optional[str]: None is always returned as this function does not produce a response.
         """
         return None
+
+    async def _patch_block(
+        self,
+        agent_state: AgentState,
+        actor: User,
+        label: str,
+        current_value: str,
+        offset: int,
+        old_text: str,
+        new_text: str,
+    ) -> bool:
+        """Write a single-span edit straight to the block row.
+
+        Returns whether the patch was applied. Callers then leave the label out of update_memory_if_changed_async's
+        block writes, so the patch is the only write; if its guards failed (the row no longer matches
+        current_value), the whole value is written by update_memory_if_changed_async instead.
+        """
+        return await self.block_manager.patch_block_value_async(
+            block_id=agent_state.memory.get_block(label).id,
+            offset=offset,
+            old_text=old_text,
+            new_text=new_text,
+            expected_length=len(current_value),
+            actor=actor,
+        )
@@ -1,4 +1,5 @@
 import traceback
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 from letta.functions.ast_parsers import coerce_dict_args_by_annotations, get_function_annotations_from_source
@@ -9,7 +10,6 @@ from letta.schemas.sandbox_config import SandboxConfig
 from letta.schemas.tool import Tool
 from letta.schemas.tool_execution_result import ToolExecutionResult
 from letta.schemas.user import User
-from letta.services.agent_manager import AgentManager
 from letta.services.tool_executor.tool_executor_base import ToolExecutor
 from letta.services.tool_sandbox.e2b_sandbox import AsyncToolSandboxE2B
 from letta.services.tool_sandbox.local_sandbox import AsyncToolSandboxLocal
@@ -20,6 +20,13 @@ from letta.utils import get_friendly_error_msg
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=512)
+def _get_function_annotations(source_code: str, function_name: str) -> Dict[str, str]:
+    # Annotations depend only on the source, so a tool is parsed once rather than on every call.
+    # Callers must treat the returned dict as read-only since it is shared between calls.
+    return get_function_annotations_from_source(source_code, function_name)
+
+
 class SandboxToolExecutor(ToolExecutor):
     """Executor for sandboxed tools."""
 
@@ -36,7 +43,7 @@ class SandboxToolExecutor(ToolExecutor):
     ) -> ToolExecutionResult:
 
         # Store original memory state
-        orig_memory_str = agent_state.memory.compile() if agent_state else None
+        orig_memory_signature = self._memory_signature(agent_state) if agent_state else None
 
         try:
             # Prepare function arguments
@@ -47,7 +54,13 @@ class SandboxToolExecutor(ToolExecutor):
             # Execute in sandbox depending on API key
             if tool_settings.e2b_api_key:
                 sandbox = AsyncToolSandboxE2B(
-                    function_name, function_args, actor, tool_object=tool, sandbox_config=sandbox_config, sandbox_env_vars=sandbox_env_vars
+                    function_name,
+                    function_args,
+                    actor,
+                    force_recreate=not tool_settings.e2b_sandbox_reuse,
+                    tool_object=tool,
+                    sandbox_config=sandbox_config,
+                    sandbox_env_vars=sandbox_env_vars,
                 )
             else:
                 sandbox = AsyncToolSandboxLocal(
@@ -58,11 +71,11 @@ class SandboxToolExecutor(ToolExecutor):
 
             # Verify memory integrity
             if agent_state:
-                assert orig_memory_str == agent_state.memory.compile(), "Memory should not be modified in a sandbox tool"
+                assert orig_memory_signature == self._memory_signature(agent_state), "Memory should not be modified in a sandbox tool"
 
             # Update agent memory if needed
             if tool_execution_result.agent_state is not None:
-                await AgentManager().update_memory_if_changed_async(agent_state.id, tool_execution_result.agent_state.memory, actor)
+                await self.agent_manager.update_memory_if_changed_async(agent_state.id, tool_execution_result.agent_state.memory, actor)
 
             return tool_execution_result
 
@@ -74,7 +87,7 @@ class SandboxToolExecutor(ToolExecutor):
         """Prepare function arguments with proper type coercion."""
         try:
             # Parse the source code to extract function annotations
-            annotations = get_function_annotations_from_source(tool.source_code, function_name)
+            annotations = _get_function_annotations(tool.source_code, function_name)
             # Coerce the function arguments to the correct types based on the annotations
             return coerce_dict_args_by_annotations(function_args, annotations)
         except ValueError:
@@ -82,14 +95,17 @@ class SandboxToolExecutor(ToolExecutor):
             # This is defensive programming - we try to coerce but fall back if it fails
             return function_args
 
+    @staticmethod
+    def _memory_signature(agent_state: AgentState) -> tuple:
+        """Cheap snapshot of the memory block contents, used instead of compiling the whole memory."""
+        return tuple((block.label, block.value) for block in agent_state.memory.blocks)
+
     @staticmethod
     def _create_agent_state_copy(agent_state: AgentState):
         """Create a copy of agent state for sandbox execution."""
-        agent_state_copy = agent_state.__deepcopy__()
+        # The sandboxes only pickle or read the state, so a shallow copy is enough.
         # Remove tools from copy to prevent nested tool execution
-        agent_state_copy.tools = []
-        agent_state_copy.tool_rules = []
-        return agent_state_copy
+        return agent_state.model_copy(update={"tools": [], "tool_rules": []})
 
     @staticmethod
     def _handle_execution_error(
@@ -1,7 +1,10 @@
 import asyncio
 import importlib
 import warnings
-from typing import List, Optional, Set, Union
+from datetime import datetime
+from typing import List, Optional, Set, Tuple, Union
+
+from sqlalchemy import select
 
 from letta.constants import (
     BASE_FUNCTION_RETURN_CHAR_LIMIT,
@@ -104,9 +107,7 @@ class ToolManager:
     def create_or_update_mcp_tool(self, tool_create: ToolCreate, mcp_server_name: str, actor: PydanticUser) -> PydanticTool:
         metadata = {MCP_TOOL_TAG_NAME_PREFIX: {"server_name": mcp_server_name}}
         return self.create_or_update_tool(
-            PydanticTool(
-                tool_type=ToolType.EXTERNAL_MCP, name=tool_create.json_schema["name"], metadata_=metadata, **tool_create.model_dump()
-            ),
+            tool_create.to_tool(tool_type=ToolType.EXTERNAL_MCP, name=tool_create.json_schema["name"], metadata_=metadata),
             actor,
         )
 
@@ -114,9 +115,7 @@ class ToolManager:
     async def create_mcp_tool_async(self, tool_create: ToolCreate, mcp_server_name: str, actor: PydanticUser) -> PydanticTool:
         metadata = {MCP_TOOL_TAG_NAME_PREFIX: {"server_name": mcp_server_name}}
         return await self.create_or_update_tool_async(
-            PydanticTool(
-                tool_type=ToolType.EXTERNAL_MCP, name=tool_create.json_schema["name"], metadata_=metadata, **tool_create.model_dump()
-            ),
+            tool_create.to_tool(tool_type=ToolType.EXTERNAL_MCP, name=tool_create.json_schema["name"], metadata_=metadata),
             actor,
         )
 
@@ -124,21 +123,21 @@ class ToolManager:
     @trace_method
     def create_or_update_composio_tool(self, tool_create: ToolCreate, actor: PydanticUser) -> PydanticTool:
         return self.create_or_update_tool(
-            PydanticTool(tool_type=ToolType.EXTERNAL_COMPOSIO, name=tool_create.json_schema["name"], **tool_create.model_dump()), actor
+            tool_create.to_tool(tool_type=ToolType.EXTERNAL_COMPOSIO, name=tool_create.json_schema["name"]), actor
         )
 
     @enforce_types
     @trace_method
     async def create_or_update_composio_tool_async(self, tool_create: ToolCreate, actor: PydanticUser) -> PydanticTool:
         return await self.create_or_update_tool_async(
-            PydanticTool(tool_type=ToolType.EXTERNAL_COMPOSIO, name=tool_create.json_schema["name"], **tool_create.model_dump()), actor
+            tool_create.to_tool(tool_type=ToolType.EXTERNAL_COMPOSIO, name=tool_create.json_schema["name"]), actor
         )
 
     @enforce_types
     @trace_method
     def create_or_update_langchain_tool(self, tool_create: ToolCreate, actor: PydanticUser) -> PydanticTool:
         return self.create_or_update_tool(
-            PydanticTool(tool_type=ToolType.EXTERNAL_LANGCHAIN, name=tool_create.json_schema["name"], **tool_create.model_dump()), actor
+            tool_create.to_tool(tool_type=ToolType.EXTERNAL_LANGCHAIN, name=tool_create.json_schema["name"]), actor
         )
 
     @enforce_types
@@ -193,6 +192,27 @@ class ToolManager:
             # Convert the SQLAlchemy Tool object to PydanticTool
             return tool.to_pydantic()
 
+    @enforce_types
+    @trace_method
+    async def get_tool_by_id_with_updated_at_async(self, tool_id: str, actor: PydanticUser) -> Tuple[PydanticTool, Optional[datetime]]:
+        """Fetch a tool by its ID, along with its last-modified timestamp (which the pydantic tool doesn't carry)."""
+        async with db_registry.async_session() as session:
+            tool = await ToolModel.read_async(db_session=session, identifier=tool_id, actor=actor)
+            return tool.to_pydantic(), tool.updated_at
+
+    @enforce_types
+    @trace_method
+    async def get_tool_updated_at_async(self, tool_id: str, actor: PydanticUser) -> Optional[datetime]:
+        """Fetch only the last-modified timestamp of a tool, without loading or validating the tool itself."""
+        async with db_registry.async_session() as session:
+            query = select(ToolModel.updated_at).where(
+                ToolModel.id == tool_id,
+                ToolModel.organization_id == actor.organization_id,
+                ToolModel.is_deleted == False,
+            )
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
+
     @enforce_types
     @trace_method
     def get_tool_by_name(self, tool_name: str, actor: PydanticUser) -> Optional[PydanticTool]:
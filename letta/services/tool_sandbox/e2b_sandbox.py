@@ -1,8 +1,10 @@
+import asyncio
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from e2b.sandbox.commands.command_handle import CommandExitException
 from e2b_code_interpreter import AsyncSandbox
 
+from letta.helpers.ttl_cache import TTLCache
 from letta.log import get_logger
 from letta.otel.tracing import log_event, trace_method
 from letta.schemas.agent import AgentState
@@ -19,6 +21,37 @@ logger = get_logger(__name__)
 if TYPE_CHECKING:
     from e2b_code_interpreter import Execution
 
+E2B_SANDBOX_POOL_TTL = 60.0  # seconds
+
+# Keeps background kill tasks referenced until they finish
+_sandbox_kill_tasks: set = set()
+
+
+async def _kill_sandbox(sbx: "AsyncSandbox") -> None:
+    try:
+        await sbx.kill()
+    except Exception as e:
+        logger.warning(f"Failed to kill e2b sandbox {sbx.sandbox_id}: {e}")
+
+
+def _kill_evicted_sandbox(sbx: "AsyncSandbox") -> None:
+    # Evictions happen inside pool get/set calls made from the event loop, so the kill can run in the background
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning(f"Dropping e2b sandbox {sbx.sandbox_id} from the pool outside an event loop; it will run until its timeout")
+        return
+    task = loop.create_task(_kill_sandbox(sbx))
+    _sandbox_kill_tasks.add(task)
+    task.add_done_callback(_sandbox_kill_tasks.discard)
+
+
+# Idle sandboxes kept warm for reuse, keyed on (tool id, user id, agent id, sandbox config fingerprint, tool pip requirements).
+# Keying on the agent keeps one agent's kernel state from leaking into another's tool calls.
+# A sandbox is taken out of the pool while it runs, so concurrent calls never share one.
+# Sandboxes that expire or are evicted from the pool are killed rather than left to run out their timeout.
+_warm_sandboxes: TTLCache["AsyncSandbox"] = TTLCache(maxsize=256, ttl=E2B_SANDBOX_POOL_TTL, on_evict=_kill_evicted_sandbox)
+
 
 class AsyncToolSandboxE2B(AsyncToolSandboxBase):
     METADATA_CONFIG_STATE_KEY = "config_state"
@@ -64,78 +97,92 @@ class AsyncToolSandboxE2B(AsyncToolSandboxBase):
             sbx_config = await self.sandbox_config_manager.get_or_create_default_sandbox_config_async(
                 sandbox_type=SandboxType.E2B, actor=self.user
             )
-        # TODO: So this defaults to force recreating always
-        # TODO: Eventually, provision one sandbox PER agent, and that agent re-uses that one specifically
-        e2b_sandbox = await self.create_e2b_sandbox_with_metadata_hash(sandbox_config=sbx_config)
+        if self.force_recreate:
+            pool_key = None
+            e2b_sandbox = await self.create_e2b_sandbox_with_metadata_hash(sandbox_config=sbx_config)
+        else:
+            pool_key = (
+                self.tool.id,
+                self.user.id,
+                agent_state.id if agent_state else None,
+                sbx_config.fingerprint(),
+                tuple(str(requirement) for requirement in self.tool.pip_requirements or ()),
+            )
+            e2b_sandbox = await self._checkout_warm_sandbox(pool_key, sbx_config)
 
         logger.info(f"E2B Sandbox configurations: {sbx_config}")
         logger.info(f"E2B Sandbox ID: {e2b_sandbox.sandbox_id}")
 
-        # TODO: This only makes sense if we re-use sandboxes
-        # # Since this sandbox was used, we extend its lifecycle by the timeout
-        # await sbx.set_timeout(sbx_config.get_e2b_config().timeout)
-
-        # Get environment variables for the sandbox
-        # TODO: We set limit to 100 here, but maybe we want it uncapped? Realistically this should be fine.
-        env_vars = {}
-        if self.provided_sandbox_env_vars:
-            env_vars.update(self.provided_sandbox_env_vars)
-        else:
-            db_env_vars = await self.sandbox_config_manager.get_sandbox_env_vars_as_dict_async(
-                sandbox_config_id=sbx_config.id, actor=self.user, limit=100
-            )
-            env_vars.update(db_env_vars)
-        # Get environment variables for this agent specifically
-        if agent_state:
-            env_vars.update(agent_state.get_agent_env_vars_as_dict())
+        try:
+            # Get environment variables for the sandbox
+            # TODO: We set limit to 100 here, but maybe we want it uncapped? Realistically this should be fine.
+            env_vars = {}
+            if self.provided_sandbox_env_vars:
+                env_vars.update(self.provided_sandbox_env_vars)
+            else:
+                db_env_vars = await self.sandbox_config_manager.get_sandbox_env_vars_as_dict_async(
+                    sandbox_config_id=sbx_config.id, actor=self.user, limit=100
+                )
+                env_vars.update(db_env_vars)
+            # Get environment variables for this agent specifically
+            if agent_state:
+                env_vars.update(agent_state.get_agent_env_vars_as_dict())
 
-        # Finally, get any that are passed explicitly into the `run` function call
-        if additional_env_vars:
-            env_vars.update(additional_env_vars)
-        code = self.generate_execution_script(agent_state=agent_state)
+            # Finally, get any that are passed explicitly into the `run` function call
+            if additional_env_vars:
+                env_vars.update(additional_env_vars)
+            code = self.generate_execution_script(agent_state=agent_state)
 
-        log_event(
-            "e2b_execution_started",
-            {"tool": self.tool_name, "sandbox_id": e2b_sandbox.sandbox_id, "code": code, "env_vars": env_vars},
-        )
-        execution = await e2b_sandbox.run_code(code, envs=env_vars)
-        if execution.results:
-            func_return, agent_state = parse_stdout_best_effort(execution.results[0].text)
-            log_event(
-                "e2b_execution_succeeded",
-                {
-                    "tool": self.tool_name,
-                    "sandbox_id": e2b_sandbox.sandbox_id,
-                    "func_return": func_return,
-                },
-            )
-        elif execution.error:
-            logger.error(f"Executing tool {self.tool_name} raised a {execution.error.name} with message: \n{execution.error.value}")
-            logger.error(f"Traceback from e2b sandbox: \n{execution.error.traceback}")
-            func_return = get_friendly_error_msg(
-                function_name=self.tool_name, exception_name=execution.error.name, exception_message=execution.error.value
-            )
-            execution.logs.stderr.append(execution.error.traceback)
             log_event(
-                "e2b_execution_failed",
-                {
-                    "tool": self.tool_name,
-                    "sandbox_id": e2b_sandbox.sandbox_id,
-                    "error_type": execution.error.name,
-                    "error_message": execution.error.value,
-                    "func_return": func_return,
-                },
+                "e2b_execution_started",
+                {"tool": self.tool_name, "sandbox_id": e2b_sandbox.sandbox_id, "code": code, "env_vars": env_vars},
             )
-        else:
-            log_event(
-                "e2b_execution_empty",
-                {
-                    "tool": self.tool_name,
-                    "sandbox_id": e2b_sandbox.sandbox_id,
-                    "status": "no_results_no_error",
-                },
-            )
-            raise ValueError(f"Tool {self.tool_name} returned execution with None")
+            execution = await e2b_sandbox.run_code(code, envs=env_vars)
+            if execution.results:
+                func_return, agent_state = parse_stdout_best_effort(execution.results[0].text)
+                log_event(
+                    "e2b_execution_succeeded",
+                    {
+                        "tool": self.tool_name,
+                        "sandbox_id": e2b_sandbox.sandbox_id,
+                        "func_return": func_return,
+                    },
+                )
+            elif execution.error:
+                logger.error(f"Executing tool {self.tool_name} raised a {execution.error.name} with message: \n{execution.error.value}")
+                logger.error(f"Traceback from e2b sandbox: \n{execution.error.traceback}")
+                func_return = get_friendly_error_msg(
+                    function_name=self.tool_name, exception_name=execution.error.name, exception_message=execution.error.value
+                )
+                execution.logs.stderr.append(execution.error.traceback)
+                log_event(
+                    "e2b_execution_failed",
+                    {
+                        "tool": self.tool_name,
+                        "sandbox_id": e2b_sandbox.sandbox_id,
+                        "error_type": execution.error.name,
+                        "error_message": execution.error.value,
+                        "func_return": func_return,
+                    },
+                )
+            else:
+                log_event(
+                    "e2b_execution_empty",
+                    {
+                        "tool": self.tool_name,
+                        "sandbox_id": e2b_sandbox.sandbox_id,
+                        "status": "no_results_no_error",
+                    },
+                )
+                raise ValueError(f"Tool {self.tool_name} returned execution with None")
+        except BaseException:
+            # Never leave a sandbox running after a failed call, pooled or not
+            await _kill_sandbox(e2b_sandbox)
+            raise
+
+        if pool_key is not None:
+            # The sandbox ran to completion (even if the tool itself errored), so keep it warm for the next call
+            _warm_sandboxes.set(pool_key, e2b_sandbox)
 
         return ToolExecutionResult(
             func_return=func_return,
@@ -146,6 +193,21 @@ class AsyncToolSandboxE2B(AsyncToolSandboxBase):
             sandbox_config_fingerprint=sbx_config.fingerprint(),
         )
 
+    async def _checkout_warm_sandbox(self, pool_key: tuple, sandbox_config: SandboxConfig) -> "AsyncSandbox":
+        """Take an idle sandbox for this tool and user out of the pool, or create one if there is none."""
+        sbx = _warm_sandboxes.get(pool_key)
+        if sbx is not None:
+            _warm_sandboxes.pop(pool_key)
+            try:
+                # Since this sandbox is being reused, we extend its lifecycle by the timeout.
+                # This also fails fast if E2B has already shut the sandbox down.
+                await sbx.set_timeout(sandbox_config.get_e2b_config().timeout)
+                return sbx
+            except Exception as e:
+                logger.info(f"Discarding warm e2b sandbox {sbx.sandbox_id}: {e}")
+                await _kill_sandbox(sbx)
+        return await self.create_e2b_sandbox_with_metadata_hash(sandbox_config=sandbox_config)
+
     @staticmethod
     def parse_exception_from_e2b_execution(e2b_execution: "Execution") -> Exception:
         builtins_dict = __builtins__ if isinstance(__builtins__, dict) else vars(__builtins__)
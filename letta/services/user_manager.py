@@ -1,10 +1,13 @@
 from typing import List, Optional
 
-from sqlalchemy import select, text
+from sqlalchemy import Insert, literal, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from letta.constants import DEFAULT_ORG_ID
 from letta.data_sources.redis_client import get_redis_client
 from letta.helpers.decorators import async_redis_cache
+from letta.helpers.ttl_cache import TTLCache
 from letta.log import get_logger
 from letta.orm.errors import NoResultFound
 from letta.orm.organization import Organization as OrganizationModel
@@ -19,6 +22,26 @@ from letta.utils import enforce_types
 
 logger = get_logger(__name__)
 
+# Process-wide cache of the default user, shared by every UserManager instance. Invalidated by the user and
+# organization update/delete paths; the TTL bounds staleness from writes made by other server processes.
+_default_user_cache: TTLCache[PydanticUser] = TTLCache(maxsize=1, ttl=60.0)
+
+
+def invalidate_default_user_cache() -> None:
+    """Drop the cached default user, e.g. after its organization is deleted."""
+    _default_user_cache.clear()
+
+
+def _insert_user_if_org_exists_stmt(user_id: str, name: str, org_id: str) -> Insert:
+    """INSERT for a fixed-id user that only fires if the organization exists and skips the row if the id is already taken.
+
+    Folding the organization check into the INSERT keeps the missing-org error without relying on FK enforcement,
+    which SQLite leaves off by default.
+    """
+    insert_fn = pg_insert if settings.letta_pg_uri_no_default else sqlite_insert
+    org_row = select(literal(user_id), literal(name), OrganizationModel.id).where(OrganizationModel.id == org_id)
+    return insert_fn(UserModel).from_select(["id", "name", "organization_id"], org_row).on_conflict_do_nothing(index_elements=["id"])
+
 
 class UserManager:
     """Manager class to handle business logic related to Users."""
@@ -30,41 +53,35 @@ class UserManager:
     @trace_method
     def create_default_user(self, org_id: str = DEFAULT_ORG_ID) -> PydanticUser:
         """Create the default user."""
+        query = select(UserModel).where(UserModel.id == self.DEFAULT_USER_ID)
         with db_registry.session() as session:
-            # Make sure the org id exists
-            try:
-                OrganizationModel.read(db_session=session, identifier=org_id)
-            except NoResultFound:
-                raise ValueError(f"No organization with {org_id} exists in the organization table.")
-
-            # Try to retrieve the user
-            try:
-                user = UserModel.read(db_session=session, identifier=self.DEFAULT_USER_ID)
-            except NoResultFound:
-                # If it doesn't exist, make it
-                user = UserModel(id=self.DEFAULT_USER_ID, name=self.DEFAULT_USER_NAME, organization_id=org_id)
-                user.create(session)
-
-            return user.to_pydantic()
+            user = session.execute(query).scalar_one_or_none()
+            if user is None:
+                # If it doesn't exist, make it, provided the org exists
+                session.execute(_insert_user_if_org_exists_stmt(self.DEFAULT_USER_ID, self.DEFAULT_USER_NAME, org_id))
+                session.commit()
+                user = session.execute(query).scalar_one_or_none()
+                if user is None:
+                    raise ValueError(f"No organization with {org_id} exists in the organization table.")
+
+            pydantic_user = user.to_pydantic()
+        _default_user_cache.set(self.DEFAULT_USER_ID, pydantic_user.model_copy())
+        return pydantic_user
 
     @enforce_types
     @trace_method
     async def create_default_actor_async(self, org_id: str = DEFAULT_ORG_ID) -> PydanticUser:
         """Create the default user."""
+        query = select(UserModel).where(UserModel.id == self.DEFAULT_USER_ID)
         async with db_registry.async_session() as session:
-            # Make sure the org id exists
-            try:
-                await OrganizationModel.read_async(db_session=session, identifier=org_id)
-            except NoResultFound:
-                raise ValueError(f"No organization with {org_id} exists in the organization table.")
-
-            # Try to retrieve the user
-            try:
-                actor = await UserModel.read_async(db_session=session, identifier=self.DEFAULT_USER_ID)
-            except NoResultFound:
-                # If it doesn't exist, make it
-                actor = UserModel(id=self.DEFAULT_USER_ID, name=self.DEFAULT_USER_NAME, organization_id=org_id)
-                await actor.create_async(session)
+            actor = (await session.execute(query)).scalar_one_or_none()
+            if actor is None:
+                # If it doesn't exist, make it, provided the org exists
+                await session.execute(_insert_user_if_org_exists_stmt(self.DEFAULT_USER_ID, self.DEFAULT_USER_NAME, org_id))
+                await session.commit()
+                actor = (await session.execute(query)).scalar_one_or_none()
+                if actor is None:
+                    raise ValueError(f"No organization with {org_id} exists in the organization table.")
                 await self._invalidate_actor_cache(self.DEFAULT_USER_ID)
 
             return actor.to_pydantic()
@@ -103,6 +120,7 @@ class UserManager:
 
             # Commit the updated user
             existing_user.update(session)
+            self._invalidate_default_user_cache(user_update.id)
             return existing_user.to_pydantic()
 
     @enforce_types
@@ -121,6 +139,7 @@ class UserManager:
             # Commit the updated user
             await existing_user.update_async(session)
             await self._invalidate_actor_cache(user_update.id)
+            self._invalidate_default_user_cache(user_update.id)
             return existing_user.to_pydantic()
 
     @enforce_types
@@ -133,6 +152,7 @@ class UserManager:
             user.hard_delete(session)
 
             session.commit()
+            self._invalidate_default_user_cache(user_id)
 
     @enforce_types
     @trace_method
@@ -143,6 +163,7 @@ class UserManager:
             user = await UserModel.read_async(db_session=session, identifier=user_id)
             await user.hard_delete_async(session)
             await self._invalidate_actor_cache(user_id)
+            self._invalidate_default_user_cache(user_id)
 
     @enforce_types
     @trace_method
@@ -150,7 +171,7 @@ class UserManager:
         """Fetch a user by ID."""
         with db_registry.session() as session:
             user = UserModel.read(db_session=session, identifier=user_id)
-            return user.to_pydantic()
+            return user.to_pydantic_fast()
 
     @enforce_types
     @trace_method
@@ -172,16 +193,22 @@ class UserManager:
             if not user:
                 raise NoResultFound(f"User not found with id={actor_id}")
 
-            return user.to_pydantic()
+            return user.to_pydantic_fast()
 
     @enforce_types
     @trace_method
     def get_default_user(self) -> PydanticUser:
         """Fetch the default user. If it doesn't exist, create it."""
+        cached = _default_user_cache.get(self.DEFAULT_USER_ID)
+        if cached is not None:
+            return cached.model_copy()
+
         try:
-            return self.get_user_by_id(self.DEFAULT_USER_ID)
+            user = self.get_user_by_id(self.DEFAULT_USER_ID)
         except NoResultFound:
             return self.create_default_user()
+        _default_user_cache.set(self.DEFAULT_USER_ID, user.model_copy())
+        return user
 
     @enforce_types
     @trace_method
@@ -226,7 +253,7 @@ class UserManager:
                 after=after,
                 limit=limit,
             )
-            return [user.to_pydantic() for user in users]
+            return [user.to_pydantic_fast() for user in users]
 
     @enforce_types
     @trace_method
@@ -238,7 +265,12 @@ class UserManager:
                 after=after,
                 limit=limit,
             )
-            return [user.to_pydantic() for user in users]
+            return [user.to_pydantic_fast() for user in users]
+
+    def _invalidate_default_user_cache(self, user_id: str) -> None:
+        """Drops the cached default user when that user is modified or deleted."""
+        if user_id == self.DEFAULT_USER_ID:
+            invalidate_default_user_cache()
 
     async def _invalidate_actor_cache(self, actor_id: str) -> bool:
         """Invalidates the actor cache on CRUD operations.
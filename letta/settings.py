@@ -14,6 +14,7 @@ class ToolSettings(BaseSettings):
     # E2B Sandbox configurations
     e2b_api_key: Optional[str] = None
     e2b_sandbox_template_id: Optional[str] = None  # Updated manually
+    e2b_sandbox_reuse: bool = False  # Keep idle E2B sandboxes warm per tool and agent instead of creating one per call
 
     # Tavily search
     tavily_api_key: Optional[str] = None
@@ -236,6 +237,7 @@ class Settings(BaseSettings):
     poll_lock_retry_interval_seconds: int = 5 * 60
     batch_job_polling_lookback_weeks: int = 2
     batch_job_polling_batch_size: Optional[int] = None
+    max_batch_bytes: int = 256 * 1024 * 1024  # Reject batch submissions larger than this (256MB)
 
     # for OCR
     mistral_api_key: Optional[str] = None
@@ -13,6 +13,7 @@ from letta.orm import Base
 from letta.schemas.agent import CreateAgent
 from letta.schemas.message import Message, MessageCreate
 from letta.server.server import SyncServer
+from letta.services.user_manager import invalidate_default_user_cache
 
 
 @pytest.fixture(autouse=True)
@@ -23,6 +24,7 @@ def truncate_database():
         for table in reversed(Base.metadata.sorted_tables):  # Reverse to avoid FK issues
             session.execute(table.delete())  # Truncate table
         session.commit()
+    invalidate_default_user_cache()
 
 
 @pytest.fixture(scope="module")
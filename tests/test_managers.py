@@ -17,8 +17,9 @@ from anthropic.types.beta import BetaMessage
 from anthropic.types.beta.messages import BetaMessageBatchIndividualResponse, BetaMessageBatchSucceededResult
 from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall as OpenAIToolCall
 from openai.types.chat.chat_completion_message_tool_call import Function as OpenAIFunction
-from sqlalchemy import func, select
-from sqlalchemy.exc import IntegrityError, InvalidRequestError
+from sqlalchemy import event, func, select
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.exc import IntegrityError, InvalidRequestError, OperationalError
 from sqlalchemy.orm.exc import StaleDataError
 
 from letta.config import LettaConfig
@@ -50,6 +51,9 @@ from letta.orm.enums import ToolType
 from letta.orm.errors import NoResultFound, UniqueConstraintViolationError
 from letta.orm.file import FileContent as FileContentModel
 from letta.orm.file import FileMetadata as FileMetadataModel
+from letta.orm.message import Message as MessageModel
+from letta.orm.step import Step as StepModel
+from letta.orm.user import User as UserModel
 from letta.schemas.agent import CreateAgent, UpdateAgent
 from letta.schemas.block import Block as PydanticBlock
 from letta.schemas.block import BlockUpdate, CreateBlock
@@ -57,13 +61,14 @@ from letta.schemas.embedding_config import EmbeddingConfig
 from letta.schemas.enums import ActorType, AgentStepStatus, FileProcessingStatus, JobStatus, JobType, MessageRole, ProviderType
 from letta.schemas.environment_variables import SandboxEnvironmentVariableCreate, SandboxEnvironmentVariableUpdate
 from letta.schemas.file import FileMetadata as PydanticFileMetadata
+from letta.schemas.group import GroupCreate
 from letta.schemas.identity import IdentityCreate, IdentityProperty, IdentityPropertyType, IdentityType, IdentityUpdate, IdentityUpsert
 from letta.schemas.job import BatchJob
 from letta.schemas.job import Job
 from letta.schemas.job import Job as PydanticJob
 from letta.schemas.job import JobUpdate, LettaRequestConfig
 from letta.schemas.letta_message import UpdateAssistantMessage, UpdateReasoningMessage, UpdateSystemMessage, UpdateUserMessage
-from letta.schemas.letta_message_content import TextContent
+from letta.schemas.letta_message_content import Base64Image, ImageContent, TextContent, UrlImage
 from letta.schemas.llm_batch_job import AgentStepState, LLMBatchItem
 from letta.schemas.llm_config import LLMConfig
 from letta.schemas.message import Message as PydanticMessage
@@ -85,8 +90,14 @@ from letta.schemas.user import User as PydanticUser
 from letta.schemas.user import UserUpdate
 from letta.server.db import db_registry
 from letta.server.server import SyncServer
+from letta.services import step_manager as step_manager_module
 from letta.services.block_manager import BlockManager
 from letta.services.helpers.agent_manager_helper import calculate_base_tools
+from letta.services.message_manager import invalidate_message_cache
+from letta.services.sandbox_config_manager import _default_sandbox_config_cache, _sandbox_env_vars_cache
+from letta.services.step_manager import job_access_cache_scope
+from letta.services.tool_executor.core_tool_executor import LettaCoreToolExecutor
+from letta.services.user_manager import _default_user_cache
 from letta.settings import tool_settings
 from tests.helpers.utils import comprehensive_agent_checks, validate_context_window_overview
 from tests.utils import random_string
@@ -125,6 +136,10 @@ async def _clear_tables(async_session):
             continue
         await async_session.execute(table.delete())  # Truncate table
     await async_session.commit()
+    _default_sandbox_config_cache.clear()
+    _sandbox_env_vars_cache.clear()
+    _default_user_cache.clear()
+    invalidate_message_cache()
 
 
 @pytest.fixture
@@ -2093,6 +2108,16 @@ async def test_agent_list_passages_basic(server, default_user, sarah_agent, agen
     assert len(agent_passages) == 2  # 3 source + 2 agent passages
 
 
+@pytest.mark.asyncio
+async def test_agent_list_agent_passages_offset(server, default_user, sarah_agent, agent_passages_setup, event_loop):
+    """Test that offset skips agent passages in the query"""
+    agent_passages = await server.agent_manager.list_agent_passages_async(actor=default_user, agent_id=sarah_agent.id)
+    assert len(agent_passages) == 2
+
+    page = await server.agent_manager.list_agent_passages_async(actor=default_user, agent_id=sarah_agent.id, limit=1, offset=1)
+    assert [p.id for p in page] == [agent_passages[1].id]
+
+
 @pytest.mark.asyncio
 async def test_agent_list_passages_ordering(server, default_user, sarah_agent, agent_passages_setup, event_loop):
     """Test ordering of agent passages"""
@@ -2274,6 +2299,102 @@ async def test_agent_list_passages_vector_search(server, default_user, sarah_age
     assert agent_only_results[1].text == "blue shoes"
 
 
+@pytest.mark.asyncio
+async def test_search_agent_passages_batched(server, default_user, sarah_agent, event_loop):
+    """Test that coalesced vector searches return the same results as unbatched ones"""
+    embed_model = embedding_model(DEFAULT_EMBEDDING_CONFIG)
+    for text in ["I like red", "random text", "blue shoes"]:
+        passage = PydanticPassage(
+            text=text,
+            organization_id=default_user.organization_id,
+            agent_id=sarah_agent.id,
+            embedding_config=DEFAULT_EMBEDDING_CONFIG,
+            embedding=embed_model.get_text_embedding(text),
+        )
+        await server.passage_manager.create_agent_passage_async(passage, default_user)
+
+    queries = ["What's my favorite color?", "What do I wear?"]
+    expected = [
+        await server.agent_manager.list_agent_passages_async(
+            actor=default_user,
+            agent_id=sarah_agent.id,
+            query_text=query,
+            limit=2,
+            embedding_config=DEFAULT_EMBEDDING_CONFIG,
+            embed_query=True,
+        )
+        for query in queries
+    ]
+
+    batched = await asyncio.gather(
+        *(
+            server.agent_manager.search_agent_passages_batched_async(
+                actor=default_user, agent_id=sarah_agent.id, query_text=query, embedding_config=DEFAULT_EMBEDDING_CONFIG, limit=2
+            )
+            for query in queries
+        )
+    )
+    assert [[p.id for p in results] for results in batched] == [[p.id for p in results] for results in expected]
+
+
+@pytest.mark.asyncio
+async def test_search_agent_passages_batched_dedupes_queries(server, default_user, sarah_agent, monkeypatch, event_loop):
+    """Test that identical searches in one batch are embedded and run once"""
+    import letta.services.agent_manager as agent_manager_module
+
+    embed_model = embedding_model(DEFAULT_EMBEDDING_CONFIG)
+    passage = PydanticPassage(
+        text="I like red",
+        organization_id=default_user.organization_id,
+        agent_id=sarah_agent.id,
+        embedding_config=DEFAULT_EMBEDDING_CONFIG,
+        embedding=embed_model.get_text_embedding("I like red"),
+    )
+    await server.passage_manager.create_agent_passage_async(passage, default_user)
+
+    embedded = []
+    original_embed = agent_manager_module.embed_passage_query
+
+    def counting_embed(query_text, embedding_config):
+        embedded.append(query_text)
+        return original_embed(query_text, embedding_config)
+
+    monkeypatch.setattr(agent_manager_module, "embed_passage_query", counting_embed)
+
+    results = await asyncio.gather(
+        *(
+            server.agent_manager.search_agent_passages_batched_async(
+                actor=default_user, agent_id=sarah_agent.id, query_text="favorite color", embedding_config=DEFAULT_EMBEDDING_CONFIG
+            )
+            for _ in range(3)
+        )
+    )
+    assert embedded == ["favorite color"]
+    assert all([p.id for p in r] == [p.id for p in results[0]] for r in results)
+    assert results[0] is not results[1]
+
+
+@pytest.mark.asyncio
+async def test_search_agent_passages_batched_propagates_batch_failure(server, default_user, sarah_agent, monkeypatch, event_loop):
+    """Test that a batch failing outside the per-search handling fails its callers instead of leaving them waiting"""
+    import letta.services.agent_manager as agent_manager_module
+
+    class FailingRegistry:
+        def async_session(self):
+            raise RuntimeError("no database")
+
+    monkeypatch.setattr(agent_manager_module, "embed_passage_query", lambda query_text, embedding_config: [0.0] * 1024)
+    monkeypatch.setattr(agent_manager_module, "db_registry", FailingRegistry())
+
+    with pytest.raises(RuntimeError, match="no database"):
+        await asyncio.wait_for(
+            server.agent_manager.search_agent_passages_batched_async(
+                actor=default_user, agent_id=sarah_agent.id, query_text="favorite color", embedding_config=DEFAULT_EMBEDDING_CONFIG
+            ),
+            timeout=5,
+        )
+
+
 @pytest.mark.asyncio
 async def test_list_source_passages_only(server: SyncServer, default_user, default_source, agent_passages_setup, event_loop):
     """Test listing passages from a source without specifying an agent."""
@@ -2880,6 +3001,16 @@ async def test_create_default_user(server: SyncServer, event_loop):
     assert retrieved.name == server.user_manager.DEFAULT_USER_NAME
 
 
+def test_create_default_user_is_idempotent(server: SyncServer, default_organization):
+    with pytest.raises(ValueError):
+        server.user_manager.create_default_user(org_id="org-00000000-0000-4000-8000-ffffffffffff")
+
+    user = server.user_manager.create_default_user(org_id=default_organization.id)
+    assert user.id == server.user_manager.DEFAULT_USER_ID
+    assert user.organization_id == default_organization.id
+    assert server.user_manager.create_default_user(org_id=default_organization.id) == user
+
+
 @pytest.mark.asyncio
 async def test_update_user(server: SyncServer, event_loop):
     # Create default organization
@@ -2904,6 +3035,30 @@ async def test_update_user(server: SyncServer, event_loop):
     assert user.organization_id == test_org.id
 
 
+def test_default_user_cache(server: SyncServer, default_user):
+    assert server.user_manager.get_default_user() == default_user
+    assert server.user_manager.get_user_or_default() == server.user_manager.get_default_user()
+
+    # Callers get their own copy, so mutating it never leaks into the cache
+    cached_user = server.user_manager.get_default_user()
+    cached_user.name = "mutated"
+    assert server.user_manager.get_default_user().name == default_user.name
+
+    # Updating the default user drops the cached copy
+    server.user_manager.update_user(UserUpdate(id=default_user.id, name="renamed"))
+    assert len(_default_user_cache) == 0
+    assert server.user_manager.get_default_user().name == "renamed"
+
+
+def test_user_to_pydantic_fast_matches_to_pydantic(server: SyncServer, default_user, other_user):
+    """Test that the model_construct-based conversion produces the same user as full validation"""
+    with db_registry.session() as session:
+        rows = session.execute(select(UserModel)).scalars().all()
+        assert len(rows) == 2
+        for row in rows:
+            assert row.to_pydantic_fast() == row.to_pydantic()
+
+
 @pytest.mark.asyncio
 async def test_user_caching(server: SyncServer, event_loop, default_user, performance_pct=0.4):
     if isinstance(await get_redis_client(), NoopAsyncRedisClient):
@@ -3430,6 +3585,28 @@ def test_message_update(server: SyncServer, hello_world_message_fixture, default
     assert retrieved.last_updated_by_id == other_user.id
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "source",
+    [UrlImage(url="https://example.com/image.png"), Base64Image(media_type="image/png", data="aGVsbG8=")],
+    ids=["url", "base64"],
+)
+async def test_message_update_with_image_content(server: SyncServer, hello_world_message_fixture, default_user, source, event_loop):
+    """Test updating a message with image content that isn't persisted by letta"""
+    content = [TextContent(text="look at this"), ImageContent(source=source)]
+    updated = server.message_manager.update_message_by_id(
+        hello_world_message_fixture.id, MessageUpdate(content=content), actor=default_user
+    )
+    assert updated.content == content
+
+    updated = await server.message_manager.update_message_by_id_async(
+        hello_world_message_fixture.id, MessageUpdate(content=list(reversed(content))), actor=default_user
+    )
+    assert updated.content == list(reversed(content))
+    retrieved = await server.message_manager.get_message_by_id_async(hello_world_message_fixture.id, actor=default_user)
+    assert retrieved.content == list(reversed(content))
+
+
 def test_message_delete(server: SyncServer, hello_world_message_fixture, default_user):
     """Test deleting a message"""
     server.message_manager.delete_message_by_id(hello_world_message_fixture.id, actor=default_user)
@@ -3437,6 +3614,30 @@ def test_message_delete(server: SyncServer, hello_world_message_fixture, default
     assert retrieved is None
 
 
+@pytest.mark.asyncio
+async def test_message_delete_async(server: SyncServer, hello_world_message_fixture, default_user, event_loop):
+    """Test deleting a message asynchronously"""
+    await server.message_manager.delete_message_by_id_async(hello_world_message_fixture.id, actor=default_user)
+    retrieved = await server.message_manager.get_message_by_id_async(hello_world_message_fixture.id, actor=default_user)
+    assert retrieved is None
+
+    with pytest.raises(ValueError):
+        await server.message_manager.delete_message_by_id_async(hello_world_message_fixture.id, actor=default_user)
+
+
+def test_group_reset_messages_invalidates_message_cache(server: SyncServer, sarah_agent, default_user):
+    """Test that messages deleted outside the message manager aren't served from its cache afterwards"""
+    group = server.group_manager.create_group(GroupCreate(agent_ids=[sarah_agent.id], description="test group"), actor=default_user)
+    message = server.message_manager.create_message(
+        PydanticMessage(agent_id=sarah_agent.id, group_id=group.id, role="user", content=[TextContent(text="Hello, group!")]),
+        actor=default_user,
+    )
+    assert server.message_manager.get_message_by_id(message.id, actor=default_user) is not None
+
+    server.group_manager.reset_messages(group.id, actor=default_user)
+    assert server.message_manager.get_message_by_id(message.id, actor=default_user) is None
+
+
 def test_message_size(server: SyncServer, hello_world_message_fixture, default_user):
     """Test counting messages with filters"""
     base_message = hello_world_message_fixture
@@ -3486,6 +3687,26 @@ def create_test_messages(server: SyncServer, base_message: PydanticMessage, defa
     return messages
 
 
+@pytest.mark.asyncio
+async def test_create_many_messages_without_tool_calls(server: SyncServer, default_user, sarah_agent, event_loop):
+    """Test that bulk-created plain messages come back converted, both sync and async"""
+    messages = [
+        PydanticMessage(
+            organization_id=default_user.organization_id,
+            agent_id=sarah_agent.id,
+            role="user",
+            content=[TextContent(text=f"Plain message {i}")],
+        )
+        for i in range(2)
+    ]
+    created = server.message_manager.create_many_messages(messages[:1], actor=default_user)
+    created += await server.message_manager.create_many_messages_async(messages[1:], actor=default_user)
+
+    assert [m.id for m in created] == [m.id for m in messages]
+    assert all(m.tool_calls is None for m in created)
+    assert [m.content[0].text for m in created] == ["Plain message 0", "Plain message 1"]
+
+
 def test_get_messages_by_ids(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent):
     """Test basic message listing with limit"""
     messages = create_test_messages(server, hello_world_message_fixture, default_user)
@@ -3495,6 +3716,26 @@ def test_get_messages_by_ids(server: SyncServer, hello_world_message_fixture, de
     assert sorted(message_ids) == sorted([r.id for r in results])
 
 
+def test_message_to_pydantic_fast_matches_to_pydantic(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent):
+    """Test that the model_construct-based conversion produces the same message as full validation"""
+    create_test_messages(server, hello_world_message_fixture, default_user)
+
+    with db_registry.session() as session:
+        rows = session.execute(select(MessageModel).where(MessageModel.agent_id == sarah_agent.id)).scalars().all()
+        assert rows
+        for row in rows:
+            assert row.to_pydantic_fast() == row.to_pydantic()
+
+
+def test_get_messages_by_ids_preserves_order_and_duplicates(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent):
+    """Test that messages come back in the requested order, including repeated ids"""
+    messages = create_test_messages(server, hello_world_message_fixture, default_user)
+    message_ids = [messages[2].id, messages[0].id, messages[2].id, "message-does-not-exist", messages[1].id]
+
+    results = server.message_manager.get_messages_by_ids(message_ids=message_ids, actor=default_user)
+    assert [r.id for r in results] == [messages[2].id, messages[0].id, messages[2].id, messages[1].id]
+
+
 def test_message_listing_basic(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent):
     """Test basic message listing with limit"""
     create_test_messages(server, hello_world_message_fixture, default_user)
@@ -3541,6 +3782,54 @@ def test_message_listing_cursor(server: SyncServer, hello_world_message_fixture,
     assert middle_page_desc[-1].id == first_page[1].id
 
 
+@pytest.mark.asyncio
+async def test_message_listing_offset(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent, event_loop):
+    """Test that offset skips matching messages in the query"""
+    create_test_messages(server, hello_world_message_fixture, default_user)
+
+    all_messages = await server.message_manager.list_user_messages_for_agent_async(agent_id=sarah_agent.id, actor=default_user, limit=10)
+    page = await server.message_manager.list_user_messages_for_agent_async(agent_id=sarah_agent.id, actor=default_user, limit=4, offset=4)
+    assert [m.id for m in page] == [m.id for m in all_messages[4:]]
+
+
+@pytest.mark.asyncio
+async def test_list_user_message_texts(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent, event_loop):
+    """Test that the projected text listing matches the text of the full messages"""
+    create_test_messages(server, hello_world_message_fixture, default_user)
+
+    messages = await server.message_manager.list_user_messages_for_agent_async(
+        agent_id=sarah_agent.id, actor=default_user, limit=4, offset=1
+    )
+    texts = await server.message_manager.list_user_message_texts_for_agent_async(
+        agent_id=sarah_agent.id, actor=default_user, limit=4, offset=1
+    )
+    assert texts == [m.content[0].text for m in messages]
+
+    # An unknown agent raises instead of returning an empty page
+    with pytest.raises(NoResultFound):
+        await server.message_manager.list_user_message_texts_for_agent_async(
+            agent_id="agent-00000000-0000-4000-8000-000000000000", actor=default_user
+        )
+
+
+def test_message_listing_missing_agent_or_cursor(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent):
+    """Test that an unknown agent or cursor still raises instead of returning an empty page"""
+    create_test_messages(server, hello_world_message_fixture, default_user)
+
+    with pytest.raises(NoResultFound):
+        server.message_manager.list_messages_for_agent(agent_id="agent-00000000-0000-4000-8000-000000000000", actor=default_user)
+
+    with pytest.raises(NoResultFound):
+        server.message_manager.list_messages_for_agent(agent_id=sarah_agent.id, actor=default_user, after="message-does-not-exist")
+
+    with pytest.raises(NoResultFound):
+        server.message_manager.list_messages_for_agent(agent_id=sarah_agent.id, actor=default_user, before="message-does-not-exist")
+
+    # The last message has nothing after it, which is an empty page rather than an error
+    last_message = server.message_manager.list_messages_for_agent(agent_id=sarah_agent.id, actor=default_user, ascending=False, limit=1)[0]
+    assert server.message_manager.list_messages_for_agent(agent_id=sarah_agent.id, actor=default_user, after=last_message.id) == []
+
+
 def test_message_listing_filtering(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent):
     """Test filtering messages by agent ID"""
     create_test_messages(server, hello_world_message_fixture, default_user)
@@ -3690,6 +3979,75 @@ def test_update_block(server: SyncServer, default_user):
     assert updated_block.description == "Updated description"
 
 
+@pytest.mark.asyncio
+async def test_patch_block_value(server: SyncServer, default_user, event_loop):
+    block_manager = BlockManager()
+    block = block_manager.create_or_update_block(PydanticBlock(label="persona", value="Hello world", limit=20), actor=default_user)
+
+    # Splice a span in place
+    assert await block_manager.patch_block_value_async(block.id, 6, "world", "there", len("Hello world"), actor=default_user)
+    patched = await block_manager.get_block_by_id_async(block.id, actor=default_user)
+    assert patched.value == "Hello there"
+
+    # Stale callers and edits past the limit leave the block untouched
+    assert not await block_manager.patch_block_value_async(block.id, 6, "world", "again", len("Hello world"), actor=default_user)
+    assert not await block_manager.patch_block_value_async(block.id, 11, "", "!" * 10, len("Hello there"), actor=default_user)
+    unchanged = await block_manager.get_block_by_id_async(block.id, actor=default_user)
+    assert unchanged.value == "Hello there"
+
+
+def _split_join_memory_insert(value: str, new_str: str, insert_line: int) -> str:
+    # The list-based splice memory_insert used before it switched to offset arithmetic
+    lines = value.split("\n")
+    if insert_line == -1:
+        insert_line = len(lines)
+    return "\n".join(lines[:insert_line] + new_str.split("\n") + lines[insert_line:])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "value, insert_line",
+    [
+        ("first\nsecond\nthird", 0),
+        ("first\nsecond\nthird", 2),
+        ("first\nsecond\nthird", 3),
+        ("first\nsecond\nthird", -1),
+        ("first\nsecond\n", 3),
+        ("", 0),
+        ("", 1),
+        ("", -1),
+    ],
+)
+async def test_memory_insert_matches_split_join(server: SyncServer, default_user, value, insert_line, event_loop):
+    """Test that memory_insert's offset-based splice gives the same block as splitting into lines and joining"""
+    agent_state = await server.agent_manager.create_agent_async(
+        agent_create=CreateAgent(
+            name="memory_insert_agent",
+            memory_blocks=[CreateBlock(label="notes", value=value)],
+            llm_config=LLMConfig.default_config("gpt-4o-mini"),
+            embedding_config=EmbeddingConfig.default_config(provider="openai"),
+            include_base_tools=False,
+        ),
+        actor=default_user,
+    )
+    executor = LettaCoreToolExecutor(
+        message_manager=server.message_manager,
+        agent_manager=server.agent_manager,
+        block_manager=server.block_manager,
+        job_manager=server.job_manager,
+        passage_manager=server.passage_manager,
+        actor=default_user,
+    )
+    new_str = "inserted one\ninserted two"
+
+    await executor.memory_insert(agent_state, default_user, label="notes", new_str=new_str, insert_line=insert_line)
+
+    expected = _split_join_memory_insert(value, new_str, insert_line)
+    block = agent_state.memory.get_block("notes")
+    assert block.value == expected
+    assert (await server.block_manager.get_block_by_id_async(block.id, actor=default_user)).value == expected
+
+
 def test_update_block_limit(server: SyncServer, default_user):
     block_manager = BlockManager()
     block = block_manager.create_or_update_block(PydanticBlock(label="persona", value="Original Content"), actor=default_user)
@@ -5259,6 +5617,26 @@ async def test_default_e2b_settings_sandbox_config(server: SyncServer, default_u
     assert e2b_config.template == tool_settings.e2b_sandbox_template_id
 
 
+@pytest.mark.asyncio
+async def test_default_sandbox_config_cache_invalidation(server: SyncServer, default_user, event_loop):
+    manager = server.sandbox_config_manager
+    created_config = await manager.get_or_create_default_sandbox_config_async(sandbox_type=SandboxType.E2B, actor=default_user)
+    cached_config = await manager.get_or_create_default_sandbox_config_async(sandbox_type=SandboxType.E2B, actor=default_user)
+    assert cached_config == created_config
+    assert cached_config is not created_config
+
+    # Updates are visible on the next lookup
+    update_data = SandboxConfigUpdate(config=E2BSandboxConfig(template="template_2", timeout=120))
+    await manager.update_sandbox_config_async(created_config.id, update_data, actor=default_user)
+    updated_config = await manager.get_or_create_default_sandbox_config_async(sandbox_type=SandboxType.E2B, actor=default_user)
+    assert updated_config.config["template"] == "template_2"
+
+    # Deleting drops the cached entry, so a fresh default is created
+    await manager.delete_sandbox_config_async(created_config.id, actor=default_user)
+    recreated_config = await manager.get_or_create_default_sandbox_config_async(sandbox_type=SandboxType.E2B, actor=default_user)
+    assert recreated_config.id != created_config.id
+
+
 @pytest.mark.asyncio
 async def test_update_existing_sandbox_config(server: SyncServer, sandbox_config_fixture, default_user, event_loop):
     update_data = SandboxConfigUpdate(config=E2BSandboxConfig(template="template_2", timeout=120))
@@ -5328,6 +5706,26 @@ async def test_list_sandbox_configs(server: SyncServer, default_user, event_loop
     assert configs[0].id == config_local.id
 
 
+def test_sandbox_config_lookups_reuse_compiled_statements(server: SyncServer, sandbox_config_fixture, default_user):
+    cache_stats = []
+
+    def record_cache_stats(conn, cursor, statement, parameters, context, executemany):
+        cache_stats.append(context.cache_hit)
+
+    engine = db_registry.get_engine()
+    event.listen(engine, "before_cursor_execute", record_cache_stats)
+    try:
+        for _ in range(50):
+            server.sandbox_config_manager.get_sandbox_config_by_type(sandbox_config_fixture.type, actor=default_user)
+            server.sandbox_config_manager.list_sandbox_env_vars(sandbox_config_fixture.id, actor=default_user)
+    finally:
+        event.remove(engine, "before_cursor_execute", record_cache_stats)
+
+    # Filter values are bound parameters, so only the first execution of each statement may compile
+    assert len(cache_stats) == 100
+    assert sum(stat != CacheStats.CACHE_HIT for stat in cache_stats) <= 2
+
+
 # ======================================================================================================================
 # SandboxConfigManager Tests - Environment Variables
 # ======================================================================================================================
@@ -5405,6 +5803,78 @@ async def test_list_sandbox_env_vars(server: SyncServer, sandbox_config_fixture,
     assert next_page[0].id != paginated_env_vars[0].id
 
 
+@pytest.mark.asyncio
+async def test_get_sandbox_env_vars_as_dict(server: SyncServer, sandbox_config_fixture, default_user, event_loop):
+    env_var_create_a = SandboxEnvironmentVariableCreate(key="VAR1", value="value1")
+    env_var_create_b = SandboxEnvironmentVariableCreate(key="VAR2", value="value2")
+    first = await server.sandbox_config_manager.create_sandbox_env_var_async(
+        env_var_create_a, sandbox_config_id=sandbox_config_fixture.id, actor=default_user
+    )
+    if USING_SQLITE:
+        time.sleep(CREATE_DELAY_SQLITE)
+    await server.sandbox_config_manager.create_sandbox_env_var_async(
+        env_var_create_b, sandbox_config_id=sandbox_config_fixture.id, actor=default_user
+    )
+
+    env = await server.sandbox_config_manager.get_sandbox_env_vars_as_dict_async(sandbox_config_fixture.id, actor=default_user)
+    assert env == {"VAR1": "value1", "VAR2": "value2"}
+    assert server.sandbox_config_manager.get_sandbox_env_vars_as_dict(sandbox_config_fixture.id, actor=default_user) == env
+
+    # Limits and cursors follow list_sandbox_env_vars ordering
+    assert await server.sandbox_config_manager.get_sandbox_env_vars_as_dict_async(
+        sandbox_config_fixture.id, actor=default_user, limit=1
+    ) == {"VAR1": "value1"}
+    assert await server.sandbox_config_manager.get_sandbox_env_vars_as_dict_async(
+        sandbox_config_fixture.id, actor=default_user, after=first.id
+    ) == {"VAR2": "value2"}
+
+
+@pytest.mark.asyncio
+async def test_sandbox_env_vars_as_dict_cache_invalidation(server: SyncServer, sandbox_env_var_fixture, default_user, event_loop):
+    manager = server.sandbox_config_manager
+    sandbox_config_id = sandbox_env_var_fixture.sandbox_config_id
+    env = await manager.get_sandbox_env_vars_as_dict_async(sandbox_config_id, actor=default_user)
+    assert env == {sandbox_env_var_fixture.key: sandbox_env_var_fixture.value}
+
+    await manager.update_sandbox_env_var_async(
+        sandbox_env_var_fixture.id, SandboxEnvironmentVariableUpdate(value="updated_value"), actor=default_user
+    )
+    env = await manager.get_sandbox_env_vars_as_dict_async(sandbox_config_id, actor=default_user)
+    assert env == {sandbox_env_var_fixture.key: "updated_value"}
+
+    await manager.create_sandbox_env_var_async(
+        SandboxEnvironmentVariableCreate(key="OTHER_VAR", value="other"), sandbox_config_id=sandbox_config_id, actor=default_user
+    )
+    env = await manager.get_sandbox_env_vars_as_dict_async(sandbox_config_id, actor=default_user)
+    assert env == {sandbox_env_var_fixture.key: "updated_value", "OTHER_VAR": "other"}
+
+    await manager.delete_sandbox_env_var_async(sandbox_env_var_fixture.id, actor=default_user)
+    env = await manager.get_sandbox_env_vars_as_dict_async(sandbox_config_id, actor=default_user)
+    assert env == {"OTHER_VAR": "other"}
+
+
+@pytest.mark.asyncio
+async def test_get_sandbox_env_vars_for_configs(server: SyncServer, sandbox_env_var_fixture, default_user, event_loop):
+    manager = server.sandbox_config_manager
+    local_config = await manager.create_or_update_sandbox_config_async(SandboxConfigCreate(config=LocalSandboxConfig()), actor=default_user)
+    await manager.create_sandbox_env_var_async(
+        SandboxEnvironmentVariableCreate(key="LOCAL_VAR", value="local"), sandbox_config_id=local_config.id, actor=default_user
+    )
+
+    env_by_config = await manager.get_sandbox_env_vars_for_configs_async(
+        [sandbox_env_var_fixture.sandbox_config_id, local_config.id, "sandbox-00000000-0000-0000-0000-000000000000"], actor=default_user
+    )
+    assert env_by_config == {
+        sandbox_env_var_fixture.sandbox_config_id: {sandbox_env_var_fixture.key: sandbox_env_var_fixture.value},
+        local_config.id: {"LOCAL_VAR": "local"},
+        "sandbox-00000000-0000-0000-0000-000000000000": {},
+    }
+
+    # Matches the single-config lookup, which is now served from the cache
+    env = await manager.get_sandbox_env_vars_as_dict_async(local_config.id, actor=default_user)
+    assert env == env_by_config[local_config.id]
+
+
 @pytest.mark.asyncio
 async def test_get_sandbox_env_var_by_key(server: SyncServer, sandbox_env_var_fixture, default_user, event_loop):
     retrieved_env_var = await server.sandbox_config_manager.get_sandbox_env_var_by_key_and_sandbox_config_id_async(
@@ -6214,6 +6684,171 @@ async def test_job_usage_stats_add_multiple(server: SyncServer, sarah_agent, def
     assert len(steps_without_feedback) == 2
 
 
+@pytest.mark.asyncio
+async def test_list_steps_pagination(server: SyncServer, sarah_agent, default_user, event_loop):
+    """Test cursor pagination and ordering when listing steps."""
+    step_manager = server.step_manager
+    logged = []
+    for i in range(5):
+        logged.append(
+            await step_manager.log_step_async(
+                actor=default_user,
+                agent_id=sarah_agent.id,
+                provider_name="openai",
+                provider_category="base",
+                model="gpt-4o-mini",
+                model_endpoint="https://api.openai.com/v1",
+                context_window_limit=8192,
+                usage=UsageStatistics(completion_tokens=i, prompt_tokens=i, total_tokens=2 * i),
+            )
+        )
+    # steps logged within the same clock tick are ordered by id, so take the listed order as the reference
+    steps = await step_manager.list_steps_async(agent_id=sarah_agent.id, order="asc", actor=default_user)
+    ids = [step.id for step in steps]
+    assert sorted(ids) == sorted(step.id for step in logged)
+
+    steps = await step_manager.list_steps_async(agent_id=sarah_agent.id, actor=default_user)
+    assert [step.id for step in steps] == ids[::-1]
+
+    steps = await step_manager.list_steps_async(agent_id=sarah_agent.id, order="asc", after=ids[1], limit=2, actor=default_user)
+    assert [step.id for step in steps] == ids[2:4]
+
+    steps = await step_manager.list_steps_async(agent_id=sarah_agent.id, order="asc", after=ids[0], before=ids[4], actor=default_user)
+    assert [step.id for step in steps] == ids[1:4]
+
+
+@pytest.mark.asyncio
+async def test_list_steps_column_projection(server: SyncServer, sarah_agent, default_user, event_loop):
+    """Test listing steps with only a subset of columns selected."""
+    step_manager = server.step_manager
+    step = await step_manager.log_step_async(
+        actor=default_user,
+        agent_id=sarah_agent.id,
+        provider_name="openai",
+        provider_category="base",
+        model="gpt-4o-mini",
+        model_endpoint="https://api.openai.com/v1",
+        context_window_limit=8192,
+        usage=UsageStatistics(completion_tokens=10, prompt_tokens=5, total_tokens=15),
+    )
+
+    steps = await step_manager.list_steps_async(agent_id=sarah_agent.id, columns=["model", "total_tokens"], actor=default_user)
+    assert len(steps) == 1
+    assert steps[0].id == step.id
+    assert steps[0].model == "gpt-4o-mini"
+    assert steps[0].total_tokens == 15
+    assert steps[0].provider_name is None
+    assert steps[0].tags == []
+
+    with pytest.raises(ValueError):
+        await step_manager.list_steps_async(agent_id=sarah_agent.id, columns=["not_a_column"], actor=default_user)
+
+
+@pytest.mark.asyncio
+async def test_log_step_deferred(server: SyncServer, sarah_agent, default_job, default_user, event_loop):
+    """Test that deferred steps are returned immediately and written on flush."""
+    step_manager = server.step_manager
+    kwargs = dict(
+        actor=default_user,
+        agent_id=sarah_agent.id,
+        provider_name="openai",
+        provider_category="base",
+        model="gpt-4o-mini",
+        model_endpoint="https://api.openai.com/v1",
+        context_window_limit=8192,
+        job_id=default_job.id,
+    )
+    queued = []
+    for i in range(1, 4):
+        usage = UsageStatistics(completion_tokens=i, prompt_tokens=i, total_tokens=2 * i)
+        queued.append(await step_manager.log_step_deferred_async(usage=usage, **kwargs))
+    assert all(step.id.startswith("step-") for step in queued)
+
+    await step_manager.flush_async()
+    for step in queued:
+        fetched = await step_manager.get_step_async(step_id=step.id, actor=default_user)
+        assert fetched.total_tokens == step.total_tokens
+        assert fetched.job_id == default_job.id
+
+    with pytest.raises(NoResultFound):
+        await step_manager.log_step_deferred_async(
+            usage=UsageStatistics(completion_tokens=1, prompt_tokens=1, total_tokens=2), **{**kwargs, "job_id": "nonexistent_job"}
+        )
+
+
+@pytest.mark.asyncio
+async def test_log_step_deferred_requeues_on_failed_flush(server: SyncServer, sarah_agent, default_user, monkeypatch, event_loop):
+    """Test that a failed flush keeps the queued steps for the next flush instead of dropping them."""
+    step_manager = server.step_manager
+    step = await step_manager.log_step_deferred_async(
+        actor=default_user,
+        agent_id=sarah_agent.id,
+        provider_name="openai",
+        provider_category="base",
+        model="gpt-4o-mini",
+        model_endpoint="https://api.openai.com/v1",
+        context_window_limit=8192,
+        usage=UsageStatistics(completion_tokens=10, prompt_tokens=5, total_tokens=15),
+    )
+
+    def failing_insert_stmt():
+        raise OperationalError("INSERT INTO steps", {}, Exception("database unavailable"))
+
+    with monkeypatch.context() as m:
+        m.setattr(step_manager_module, "_insert_steps_stmt", failing_insert_stmt)
+        with pytest.raises(OperationalError):
+            await step_manager.flush_async()
+
+    await step_manager.flush_async()
+    assert (await step_manager.get_step_async(step_id=step.id, actor=default_user)).id == step.id
+
+
+@pytest.mark.asyncio
+async def test_log_step_deferred_drops_rows_that_cannot_be_written(server: SyncServer, sarah_agent, default_user, event_loop):
+    """Test that a queued step violating a constraint is dropped without holding back the rest of the queue."""
+    step_manager = server.step_manager
+    step = await step_manager.log_step_deferred_async(
+        actor=default_user,
+        agent_id=sarah_agent.id,
+        provider_name="openai",
+        provider_category="base",
+        model="gpt-4o-mini",
+        model_endpoint="https://api.openai.com/v1",
+        context_window_limit=8192,
+        usage=UsageStatistics(completion_tokens=10, prompt_tokens=5, total_tokens=15),
+    )
+    bad_row = {**step_manager_module._pending_steps[-1], "id": f"{step.id}-unwritable", "prompt_tokens": None}
+    step_manager_module._pending_steps.insert(0, bad_row)
+
+    await step_manager.flush_async()
+    assert step_manager_module._pending_steps == []
+    assert (await step_manager.get_step_async(step_id=step.id, actor=default_user)).id == step.id
+    with pytest.raises(NoResultFound):
+        await step_manager.get_step_async(step_id=bad_row["id"], actor=default_user)
+
+
+@pytest.mark.asyncio
+async def test_step_to_pydantic_fast_matches_to_pydantic(server: SyncServer, sarah_agent, default_job, default_user, event_loop):
+    """Test that the model_construct-based conversion produces the same step as full validation"""
+    await server.step_manager.log_step_async(
+        actor=default_user,
+        agent_id=sarah_agent.id,
+        provider_name="openai",
+        provider_category="base",
+        model="gpt-4o-mini",
+        model_endpoint="https://api.openai.com/v1",
+        context_window_limit=8192,
+        job_id=default_job.id,
+        usage=UsageStatistics(completion_tokens=10, prompt_tokens=5, total_tokens=15),
+    )
+
+    with db_registry.session() as session:
+        rows = session.execute(select(StepModel).where(StepModel.agent_id == sarah_agent.id)).scalars().all()
+        assert rows
+        for row in rows:
+            assert row.to_pydantic_fast() == row.to_pydantic()
+
+
 def test_job_usage_stats_get_nonexistent_job(server: SyncServer, default_user):
     """Test getting usage statistics for a nonexistent job."""
     job_manager = server.job_manager
@@ -6245,6 +6880,236 @@ async def test_job_usage_stats_add_nonexistent_job(server: SyncServer, sarah_age
         )
 
 
+@pytest.mark.asyncio
+async def test_log_steps_bulk(server: SyncServer, sarah_agent, default_job, default_user, event_loop):
+    """Test logging several steps with one bulk insert."""
+    step_manager = server.step_manager
+
+    entries = [
+        dict(
+            agent_id=sarah_agent.id,
+            provider_name="openai",
+            provider_category="base",
+            model="gpt-4o-mini",
+            model_endpoint="https://api.openai.com/v1",
+            context_window_limit=8192,
+            job_id=default_job.id,
+            usage=UsageStatistics(completion_tokens=10 * i, prompt_tokens=5 * i, total_tokens=15 * i),
+        )
+        for i in range(1, 4)
+    ]
+    steps = await step_manager.log_steps_bulk_async(actor=default_user, entries=entries)
+
+    assert [step.total_tokens for step in steps] == [15, 30, 45]
+    assert len({step.id for step in steps}) == 3
+    for step in steps:
+        fetched = await step_manager.get_step_async(step_id=step.id, actor=default_user)
+        assert fetched.job_id == default_job.id
+        assert fetched.organization_id == default_user.organization_id
+
+    assert await step_manager.log_steps_bulk_async(actor=default_user, entries=[]) == []
+
+    step_ids = await step_manager.log_steps_bulk_async(actor=default_user, entries=entries, return_pydantic=False)
+    assert len(set(step_ids)) == 3
+    for step_id, entry in zip(step_ids, entries):
+        fetched = await step_manager.get_step_async(step_id=step_id, actor=default_user)
+        assert fetched.total_tokens == entry["usage"].total_tokens
+
+    with pytest.raises(NoResultFound):
+        await step_manager.log_steps_bulk_async(actor=default_user, entries=[{**entries[0], "job_id": "nonexistent_job"}])
+
+
+@pytest.mark.asyncio
+async def test_log_steps_bulk_multiple_jobs(server: SyncServer, sarah_agent, default_job, default_user, event_loop):
+    """Test that bulk logging verifies every referenced job."""
+    step_manager = server.step_manager
+    other_job = await server.job_manager.create_job_async(
+        pydantic_job=PydanticJob(user_id=default_user.id, status=JobStatus.pending), actor=default_user
+    )
+
+    entry = dict(
+        agent_id=sarah_agent.id,
+        provider_name="openai",
+        provider_category="base",
+        model="gpt-4o-mini",
+        model_endpoint="https://api.openai.com/v1",
+        context_window_limit=8192,
+        usage=UsageStatistics(completion_tokens=10, prompt_tokens=5, total_tokens=15),
+    )
+    steps = await step_manager.log_steps_bulk_async(
+        actor=default_user,
+        entries=[{**entry, "job_id": default_job.id}, {**entry, "job_id": other_job.id}, {**entry, "job_id": default_job.id}],
+    )
+    assert [step.job_id for step in steps] == [default_job.id, other_job.id, default_job.id]
+
+    with pytest.raises(NoResultFound):
+        await step_manager.log_steps_bulk_async(
+            actor=default_user,
+            entries=[{**entry, "job_id": default_job.id}, {**entry, "job_id": "nonexistent_job"}],
+        )
+
+
+@pytest.mark.asyncio
+async def test_step_manager_reuses_caller_session(server: SyncServer, sarah_agent, default_user, event_loop):
+    """Test that step manager calls can share a session passed in by the caller."""
+    step_manager = server.step_manager
+
+    async with db_registry.async_session() as session:
+        step = await step_manager.log_step_async(
+            actor=default_user,
+            agent_id=sarah_agent.id,
+            provider_name="openai",
+            provider_category="base",
+            model="gpt-4o-mini",
+            model_endpoint="https://api.openai.com/v1",
+            context_window_limit=8192,
+            usage=UsageStatistics(completion_tokens=10, prompt_tokens=5, total_tokens=15),
+            session=session,
+        )
+        fetched = await step_manager.get_step_async(step_id=step.id, actor=default_user, session=session)
+        assert fetched.id == step.id
+        assert session.is_active
+
+
+@pytest.mark.asyncio
+async def test_update_step_transaction_id(server: SyncServer, sarah_agent, default_user, other_user_different_org, event_loop):
+    """Test updating a step's transaction id, including the not-found and wrong-organization cases."""
+    step_manager = server.step_manager
+    step = await step_manager.log_step_async(
+        actor=default_user,
+        agent_id=sarah_agent.id,
+        provider_name="openai",
+        provider_category="base",
+        model="gpt-4o-mini",
+        model_endpoint="https://api.openai.com/v1",
+        context_window_limit=8192,
+        usage=UsageStatistics(completion_tokens=10, prompt_tokens=5, total_tokens=15),
+    )
+
+    updated = step_manager.update_step_transaction_id(actor=default_user, step_id=step.id, transaction_id="tid-123")
+    assert updated.id == step.id
+    assert updated.tid == "tid-123"
+    assert (await step_manager.get_step_async(step_id=step.id, actor=default_user)).tid == "tid-123"
+
+    with pytest.raises(NoResultFound):
+        step_manager.update_step_transaction_id(actor=default_user, step_id="step-nonexistent", transaction_id="tid-456")
+
+    with pytest.raises(Exception, match="Unauthorized"):
+        step_manager.update_step_transaction_id(actor=other_user_different_org, step_id=step.id, transaction_id="tid-456")
+    assert (await step_manager.get_step_async(step_id=step.id, actor=default_user)).tid == "tid-123"
+
+    updated = await step_manager.update_step_transaction_id_async(actor=default_user, step_id=step.id, transaction_id="tid-789")
+    assert updated.tid == "tid-789"
+
+    with pytest.raises(NoResultFound):
+        await step_manager.update_step_transaction_id_async(actor=default_user, step_id="step-nonexistent", transaction_id="tid-000")
+
+    with pytest.raises(Exception, match="Unauthorized"):
+        await step_manager.update_step_transaction_id_async(actor=other_user_different_org, step_id=step.id, transaction_id="tid-000")
+    assert (await step_manager.get_step_async(step_id=step.id, actor=default_user)).tid == "tid-789"
+
+
+@pytest.mark.asyncio
+async def test_step_manager_transaction(server: SyncServer, sarah_agent, default_user, event_loop):
+    """Test that steps logged inside a transaction commit together, or not at all."""
+    step_manager = server.step_manager
+    kwargs = dict(
+        actor=default_user,
+        agent_id=sarah_agent.id,
+        provider_name="openai",
+        provider_category="base",
+        model="gpt-4o-mini",
+        model_endpoint="https://api.openai.com/v1",
+        context_window_limit=8192,
+        usage=UsageStatistics(completion_tokens=10, prompt_tokens=5, total_tokens=15),
+    )
+
+    async with step_manager.transaction_async() as session:
+        committed = [await step_manager.log_step_async(session=session, **kwargs) for _ in range(3)]
+    for step in committed:
+        assert (await step_manager.get_step_async(step_id=step.id, actor=default_user)).id == step.id
+
+    rolled_back = []
+    with pytest.raises(RuntimeError):
+        async with step_manager.transaction_async() as session:
+            rolled_back.append(await step_manager.log_step_async(session=session, **kwargs))
+            raise RuntimeError("abort the burst")
+    with pytest.raises(NoResultFound):
+        await step_manager.get_step_async(step_id=rolled_back[0].id, actor=default_user)
+
+
+@pytest.mark.asyncio
+async def test_job_access_cache_scope(server: SyncServer, sarah_agent, default_job, default_user, monkeypatch, event_loop):
+    """Test that job write access is only verified once per scope."""
+    step_manager = server.step_manager
+    kwargs = dict(
+        actor=default_user,
+        agent_id=sarah_agent.id,
+        provider_name="openai",
+        provider_category="base",
+        model="gpt-4o-mini",
+        model_endpoint="https://api.openai.com/v1",
+        context_window_limit=8192,
+        job_id=default_job.id,
+        usage=UsageStatistics(completion_tokens=10, prompt_tokens=5, total_tokens=15),
+    )
+    verify = step_manager._verify_job_access_many_async
+    checked = []
+
+    async def counting_verify(session, job_ids, actor, access):
+        job_ids = set(job_ids)
+        checked.append(job_ids)
+        return await verify(session, job_ids, actor, access)
+
+    monkeypatch.setattr(step_manager, "_verify_job_access_many_async", counting_verify)
+
+    with job_access_cache_scope():
+        for _ in range(3):
+            await step_manager.log_step_async(**kwargs)
+    assert checked == [{default_job.id}]
+
+    # outside a scope nothing is remembered
+    await step_manager.log_step_async(**kwargs)
+    await step_manager.log_step_async(**kwargs)
+    assert len(checked) == 3
+
+
+@pytest.mark.asyncio
+async def test_log_step_is_idempotent(server: SyncServer, sarah_agent, default_user, other_user_different_org, event_loop):
+    """Test that retrying a step write with the same id returns the original step instead of inserting a duplicate."""
+    step_manager = server.step_manager
+    kwargs = dict(
+        agent_id=sarah_agent.id,
+        provider_name="openai",
+        provider_category="base",
+        model="gpt-4o-mini",
+        model_endpoint="https://api.openai.com/v1",
+        context_window_limit=8192,
+        step_id="step-00000000-0000-4000-8000-000000000001",
+    )
+    first = await step_manager.log_step_async(
+        actor=default_user, usage=UsageStatistics(completion_tokens=10, prompt_tokens=5, total_tokens=15), **kwargs
+    )
+    retried = await step_manager.log_step_async(
+        actor=default_user, usage=UsageStatistics(completion_tokens=20, prompt_tokens=10, total_tokens=30), **kwargs
+    )
+    assert retried.id == first.id
+    assert retried.total_tokens == 15
+
+    entry = dict(kwargs, usage=UsageStatistics(completion_tokens=1, prompt_tokens=1, total_tokens=2))
+    fresh = dict(entry, step_id=None)
+    steps = await step_manager.log_steps_bulk_async(actor=default_user, entries=[fresh, entry])
+    assert steps[1].id == first.id
+    assert steps[1].total_tokens == 15
+    assert steps[0].total_tokens == 2
+
+    steps = await step_manager.list_steps_async(agent_id=sarah_agent.id, actor=default_user)
+    assert len(steps) == 2
+
+    with pytest.raises(UniqueConstraintViolationError):
+        await step_manager.log_step_async(actor=other_user_different_org, usage=entry["usage"], **kwargs)
+
+
 def test_list_tags(server: SyncServer, default_user, default_organization):
     """Test listing tags functionality."""
     # Create multiple agents with different tags
@@ -1,6 +1,7 @@
 import pytest
 
 # Import the classes here, assuming the above definitions are in a module named memory_module
+from letta.schemas.block import Block
 from letta.schemas.memory import ChatMemory, Memory
 
 
@@ -16,6 +17,22 @@ def test_create_chat_memory():
     assert chat_memory.get_block("human").value == "User"
 
 
+def test_get_block_follows_block_changes(sample_memory: Memory):
+    """Test that label lookups stay correct as the blocks list is changed"""
+    assert sample_memory.get_block("human").value == "User"
+
+    sample_memory.set_block(Block(label="notes", value="first"))
+    assert sample_memory.get_block("notes").value == "first"
+
+    sample_memory.blocks = [Block(label="human", value="Someone else"), Block(label="persona", value="Chat Agent")]
+    assert sample_memory.get_block("human").value == "Someone else"
+    with pytest.raises(KeyError):
+        sample_memory.get_block("notes")
+
+    sample_memory.update_block_value(label="persona", value="Updated")
+    assert sample_memory.get_block("persona").value == "Updated"
+
+
 def test_memory_limit_validation(sample_memory: Memory):
     """Test exceeding memory limit"""
     with pytest.raises(ValueError):
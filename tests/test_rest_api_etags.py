@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from letta.schemas.tool import Tool
+from letta.server.rest_api.routers.v1 import tools
+from letta.server.rest_api.utils import get_letta_server
+
+
+class FakeToolManager:
+    def __init__(self, tool: Tool):
+        self.tool = tool
+        self.updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.timestamp_queries = 0
+        self.tool_queries = 0
+
+    async def get_tool_updated_at_async(self, tool_id, actor):
+        self.timestamp_queries += 1
+        return self.updated_at
+
+    async def get_tool_by_id_with_updated_at_async(self, tool_id, actor):
+        self.tool_queries += 1
+        return self.tool, self.updated_at
+
+
+@pytest.fixture
+def tool_manager():
+    return FakeToolManager(Tool(name="print_tool", source_code="def print_tool():\n    pass\n", json_schema={"name": "print_tool"}))
+
+
+@pytest.fixture
+def client(tool_manager):
+    async def get_actor_or_default_async(actor_id=None):
+        return None
+
+    server = SimpleNamespace(
+        tool_manager=tool_manager,
+        user_manager=SimpleNamespace(get_actor_or_default_async=get_actor_or_default_async),
+    )
+    app = FastAPI()
+    app.include_router(tools.router, prefix="/v1")
+    app.dependency_overrides[get_letta_server] = lambda: server
+    return TestClient(app)
+
+
+def test_retrieve_tool_etag(client, tool_manager):
+    tool_id = tool_manager.tool.id
+
+    # A plain GET loads the tool once and tags it, without a separate timestamp query
+    response = client.get(f"/v1/tools/{tool_id}")
+    assert response.status_code == 200
+    assert response.json()["id"] == tool_id
+    etag = response.headers["ETag"]
+    assert (tool_manager.timestamp_queries, tool_manager.tool_queries) == (0, 1)
+
+    # A matching conditional GET is answered from the timestamp alone
+    response = client.get(f"/v1/tools/{tool_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert (tool_manager.timestamp_queries, tool_manager.tool_queries) == (1, 1)
+
+    # Once the tool changes the old tag no longer matches
+    tool_manager.updated_at += timedelta(seconds=1)
+    response = client.get(f"/v1/tools/{tool_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert (tool_manager.timestamp_queries, tool_manager.tool_queries) == (2, 2)
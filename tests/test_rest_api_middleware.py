@@ -0,0 +1,55 @@
+import pytest
+from fastapi import Body, FastAPI
+from fastapi.testclient import TestClient
+
+from letta.server.rest_api.app import MaxBodySizeMiddleware
+from letta.settings import settings
+
+MAX_BYTES = 64
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "max_batch_bytes", MAX_BYTES)
+
+    app = FastAPI()
+
+    @app.post("/v1/messages/batches")
+    async def create_batch(payload: dict = Body(...)):
+        return payload
+
+    app.add_middleware(MaxBodySizeMiddleware)
+    return TestClient(app)
+
+
+def test_max_body_size_allows_small_body(client):
+    response = client.post("/v1/messages/batches", json={"a": 1})
+    assert response.status_code == 200
+    assert response.json() == {"a": 1}
+
+
+def test_max_body_size_rejects_declared_content_length(client):
+    response = client.post("/v1/messages/batches", json={"a": "x" * MAX_BYTES})
+    assert response.status_code == 413
+
+
+def test_max_body_size_rejects_chunked_body(client):
+    def chunks():
+        yield b'{"a": "'
+        for _ in range(MAX_BYTES):
+            yield b"x"
+        yield b'"}'
+
+    # A generator body is sent chunked, without a Content-Length header
+    response = client.post("/v1/messages/batches", content=chunks(), headers={"Content-Type": "application/json"})
+    assert response.status_code == 413
+
+
+def test_max_body_size_allows_small_chunked_body(client):
+    def chunks():
+        yield b'{"a": '
+        yield b"1}"
+
+    response = client.post("/v1/messages/batches", content=chunks(), headers={"Content-Type": "application/json"})
+    assert response.status_code == 200
+    assert response.json() == {"a": 1}
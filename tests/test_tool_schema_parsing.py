@@ -12,6 +12,7 @@ from pydantic import BaseModel
 from letta.functions.functions import derive_openai_json_schema
 from letta.functions.schema_generator import validate_google_style_docstring
 from letta.llm_api.helpers import convert_to_structured_output, make_post_request
+from letta.schemas.pip_requirement import PipRequirement
 from letta.schemas.tool import Tool, ToolCreate
 
 
@@ -583,3 +584,38 @@ def missing_param_doc(x: int, y: int) -> str:
 )
 def test_google_style_docstring_validation(fn, regex):
     _check(fn, regex)
+
+
+def test_tool_create_to_tool_matches_validated_tool():
+    """to_tool skips re-validation, so check it builds the same tool as full validation does"""
+    source_code = '''def greet(name: str) -> str:
+    """
+    Greet someone.
+
+    Args:
+        name (str): Who to greet.
+
+    Returns:
+        str: The greeting.
+    """
+    return f"Hello {name}"
+'''
+    request = ToolCreate(
+        source_code=source_code,
+        description="Greets someone",
+        tags=["greeting"],
+        pip_requirements=[PipRequirement(name="requests", version="2.32.3")],
+        args_json_schema={"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]},
+    )
+
+    tool = request.to_tool(metadata_={"origin": "test"})
+    expected = Tool(**request.model_dump(), metadata_={"origin": "test"})
+    assert tool.model_dump(exclude={"id"}) == expected.model_dump(exclude={"id"})
+
+    # The tool owns its list and dict fields, so changing them in place leaves the request untouched
+    tool.tags.append("changed")
+    tool.pip_requirements.clear()
+    tool.args_json_schema["required"] = []
+    assert request.tags == ["greeting"]
+    assert request.pip_requirements == [PipRequirement(name="requests", version="2.32.3")]
+    assert request.args_json_schema["required"] == ["name"]
@@ -2,6 +2,7 @@ import pytest
 
 from letta.constants import MAX_FILENAME_LENGTH
 from letta.functions.ast_parsers import coerce_dict_args_by_annotations, get_function_annotations_from_source
+from letta.helpers.ttl_cache import TTLCache
 from letta.services.helpers.agent_manager_helper import safe_format
 from letta.utils import sanitize_filename
 
@@ -395,3 +396,22 @@ def test_formatter():
     """
 
     assert UNUSED_AND_EMPRY_VAR_SOL == safe_format(UNUSED_AND_EMPRY_VAR, VARS_DICT)
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expired():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now the most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    cache.pop("a")
+    assert cache.get("a") is None
+
+    expiring = TTLCache(maxsize=2, ttl=0)
+    expiring.set("a", 1)
+    assert expiring.get("a") is None
+    assert len(expiring) == 0